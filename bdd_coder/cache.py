@@ -0,0 +1,131 @@
+"""Local disk cache of the results of cacheable steps, across sessions"""
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+import re
+import shutil
+import tempfile
+
+from typing import Any, Iterable
+
+from bdd_coder import exceptions
+from bdd_coder.fingerprints import get_source
+from bdd_coder import stock
+
+ADDRESS_REGEX = re.compile(r' at 0x[0-9a-fA-F]+>')  # As in the default object.__repr__
+
+
+class StepCache(stock.Repr):
+    """
+    Pickled step results - see `Gherkin.cacheable` -, one file per key, evicting
+    the least recently used ones once the files take more than `max_bytes`
+    """
+    env_var = 'BDD_STEP_CACHE'
+    default_path = '.bdd-step-cache'
+    suffix = '.pickle'
+
+    @classmethod
+    def from_env(cls) -> StepCache:
+        """On the `BDD_STEP_CACHE` directory, or the default one"""
+        return cls(os.environ.get(cls.env_var) or cls.default_path)
+
+    def __init__(self, path: str = default_path, max_bytes: int = 2**30):
+        self.path = path
+        self.max_bytes = max_bytes
+
+    def __str__(self) -> str:
+        return f'{self.path} max_bytes={self.max_bytes}'
+
+    @staticmethod
+    def make_key(method, *parts: Any) -> str:
+        """
+        SHA-256 hex digest of the source of step `method`, and the reprs of `parts`.
+        Raises `UnstableCacheKeyError` if some repr has a memory address
+        """
+        digest = hashlib.sha256(f'{method.__qualname__}\0{get_source(method)}'.encode())
+
+        for part in parts:
+            text = repr(part)
+
+            if ADDRESS_REGEX.search(text):
+                raise exceptions.UnstableCacheKeyError(part=text, qualname=method.__qualname__)
+
+            digest.update(f'\0{text}'.encode())
+
+        return digest.hexdigest()
+
+    def get_file_path(self, key: str) -> str:
+        return os.path.join(self.path, f'{key}{self.suffix}')
+
+    def get(self, key: str) -> Any:
+        """The cached value, marked as just used. Raises `KeyError` if missing or unreadable"""
+        file_path = self.get_file_path(key)
+
+        try:
+            with open(file_path, 'rb') as pickle_file:
+                value = pickle.load(pickle_file)
+        except FileNotFoundError:
+            raise KeyError(key)
+        except Exception:
+            self.remove(file_path)
+            raise KeyError(key)
+
+        os.utime(file_path)
+
+        return value
+
+    def set(self, key: str, value: Any) -> bool:
+        """Stores `value` - if picklable -, then evicts. Returns whether stored"""
+        try:
+            data = pickle.dumps(value)
+        except Exception:
+            return False
+
+        os.makedirs(self.path, exist_ok=True)
+        file_descriptor, tmp_path = tempfile.mkstemp(dir=self.path, suffix='.tmp')
+
+        with os.fdopen(file_descriptor, 'wb') as tmp_file:
+            tmp_file.write(data)
+
+        os.replace(tmp_path, self.get_file_path(key))
+        self.evict(keep=key)
+
+        return True
+
+    def iter_file_paths(self) -> Iterable[str]:
+        if os.path.isdir(self.path):
+            for name in os.listdir(self.path):
+                if name.endswith(self.suffix):
+                    yield os.path.join(self.path, name)
+
+    def evict(self, keep: str = ''):
+        """Removes the least recently used files - but `keep` - while above `max_bytes`"""
+        stats = []
+
+        for file_path in self.iter_file_paths():
+            try:
+                stats.append((os.stat(file_path), file_path))
+            except FileNotFoundError:
+                pass
+
+        total = sum(stat.st_size for stat, _ in stats)
+
+        for stat, file_path in sorted(stats, key=lambda it: it[0].st_mtime):
+            if total <= self.max_bytes:
+                break
+
+            if file_path != self.get_file_path(keep):
+                self.remove(file_path)
+                total -= stat.st_size
+
+    @staticmethod
+    def remove(file_path: str):
+        try:
+            os.remove(file_path)
+        except FileNotFoundError:
+            pass
+
+    def clear(self):
+        shutil.rmtree(self.path, ignore_errors=True)
@@ -39,7 +39,8 @@ class FeatureClassCoder:
     @property
     def step_method_defs(self):
         return self.make_step_method_defs_for([
-            s for s in self.spec.steps.values() if s.is_local and not s.is_scenario])
+            s for s in self.spec.steps.values() if s.is_local and not s.is_scenario],
+            self.spec.step_scopes)
 
     @property
     def class_body(self):
@@ -57,10 +58,14 @@ class FeatureClassCoder:
         ] if self.spec.bases else [f'base.{BASE_TESTER_NAME}']
 
     @staticmethod
-    def make_step_method_defs_for(steps_to_code):
+    def make_step_method_defs_for(steps_to_code, step_scopes=None):
+        step_scopes = step_scopes or {}
+
         return [make_method(
             s.name, body=FeatureClassCoder.make_method_body(s.param_names, s.output_names),
-            args_text='self' + ''.join([f', {n}' for n in s.param_names])
+            args_text='self' + ''.join([f', {n}' for n in s.param_names]),
+            decorators=(f"base.BddTester.gherkin.scoped('{step_scopes[s.name]}')",)
+            if s.name in step_scopes else ()
         ) for s in stock.list_drop_duplicates(steps_to_code, lambda s: s.name)]
 
     @staticmethod
@@ -145,7 +150,8 @@ class PackageCoder:
 
 
 class ModulePiece(stock.Repr):
-    scenario_delimiter = '@base.BddTester.gherkin'
+    # Indentation of scenario decorators, not of others like `gherkin.scoped(...)`
+    scenario_delimiter = re.compile(r'^    (?=@base\.BddTester\.gherkin\()', flags=re.MULTILINE)
 
     def __init__(self, text, *class_names):
         rtext = rstrip(text)
@@ -192,7 +198,7 @@ class ModulePiece(stock.Repr):
 
     @classmethod
     def split_class_body(cls, text):
-        pieces = iter(text.strip('\n').split(cls.scenario_delimiter))
+        pieces = iter(cls.scenario_delimiter.split(text.strip('\n')))
         body_head = next(pieces).rstrip()
         scenarios, tail_pieces = collections.OrderedDict(), []
 
@@ -207,9 +213,9 @@ class ModulePiece(stock.Repr):
 
     @classmethod
     def match_scenario_piece(cls, text):
-        scenario_code = f'    {cls.scenario_delimiter}{text}'
+        scenario_code = f'    {text}'
         match = re.match(
-            r'^(    @base\.BddTester\.gherkin\(.*\)\n    def (test_)?([^(]+)\(self\):\n'
+            r'^(    @base\.BddTester\.gherkin\(.*?\)\n    def (test_)?([^(]+)\(self\):\n'
             rf'{" "*8}"""\n.+?\n{" "*8}""")(.*)$',
             scenario_code, flags=re.DOTALL)
 
@@ -372,8 +378,8 @@ class PackagePatcher:
         old_steps = self.old_specs.features[class_name].steps
         pieces[class_name].tail.extend(map(
             indent, FeatureClassCoder.make_step_method_defs_for(
-                s for s in steps.values() if s.is_local and not s.is_scenario
-                and s.name not in old_steps)))
+                (s for s in steps.values() if s.is_local and not s.is_scenario
+                 and s.name not in old_steps), self.new_specs.features[class_name].step_scopes)))
 
     def patch(self, run_pytest=False):
         self.patch_module(
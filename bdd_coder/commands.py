@@ -1,10 +1,15 @@
+import os
+import sys
+
 from simple_cmd.decorators import ErrorsCommand
 
 from bdd_coder.exceptions import (
-    BaseTesterRetrievalError, FeaturesSpecError, InconsistentClassStructure,
-    OverwriteError, Flake8Error, ScenarioMismatchError)
+    BaseTesterRetrievalError, CollectionError, FeaturesSpecError, InconsistentClassStructure,
+    OverwriteError, Flake8Error, ScenarioMismatchError, TestsFailedError)
 
 from bdd_coder import coders
+from bdd_coder import history
+from bdd_coder import runner
 
 
 @ErrorsCommand(FileNotFoundError, FeaturesSpecError, OverwriteError)
@@ -36,3 +41,22 @@ def make_yaml_specs(test_module: 'Passed to `importlib.import_module`',
     base_tester, _ = coders.get_base_tester(test_module)
     features_spec = base_tester.features_spec(specs_path, overwrite)
     base_tester.validate_bases(features_spec)
+
+
+@ErrorsCommand(TestsFailedError, CollectionError)
+def run_scenarios(*paths: 'Passed to pytest',
+                  workers: 'Number of worker processes. Default: CPU count' = 0):
+    exit_code = runner.WorkStealingRunner(*paths, workers=workers).run()
+
+    if exit_code:
+        raise TestsFailedError(code=exit_code)
+
+
+@ErrorsCommand(FileNotFoundError)
+def show_history(history_path: 'SQLite run history file' = history.RunHistory.default_path,
+                 *, limit: 'Rows per query' = 10):
+    if not os.path.isfile(history_path):
+        raise FileNotFoundError(f'No run history at {history_path}')
+
+    sys.stdout.writelines(f'{message}\n' for message in history.RunHistory(
+        history_path).get_report_messages(limit))
@@ -2,22 +2,71 @@
 from __future__ import annotations
 
 from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
+import asyncio
+import contextlib
+import contextvars
 import datetime
 import itertools
 import functools
+import inspect
 import logging
+import os
+import sys
+import threading
+import time
 from logging.handlers import RotatingFileHandler
 
-from typing import Callable, Iterator, Optional, Union
+from typing import Any, Awaitable, Callable, Iterator, Optional, Union
 
 import pytest
 
+from bdd_coder.cache import StepCache
 from bdd_coder import exceptions
-from bdd_coder.features import StepSpec
+from bdd_coder.exporters import ChromeTraceExporter
+from bdd_coder.features import StepSpec, find_examples_path
+from bdd_coder.history import RunHistory
+from bdd_coder.memory import MemoryGrowth, MemoryTracker
+from bdd_coder.params import Factor, ParamSource, ParamStrategy, Rows, zip_rows
+from bdd_coder.profilers import SamplingProfiler, StepProfiler, root_run
+from bdd_coder.reports import RunsReport
 from bdd_coder import stock
-from bdd_coder.text_utils import (
-    OK, FAIL, PENDING, TO, COMPLETION_MSG, BOLD, Style, indent, ExcInfo)
+from bdd_coder.streams import stream_outputs, tee_outputs
+from bdd_coder.text_utils import OK, FAIL, PENDING, TO, BOLD, STEP_SCOPES, EVENT_LOOP_SCOPES, ExcInfo
+
+IN_STEP_POOL: contextvars.ContextVar = contextvars.ContextVar('in_step_pool', default=False)
+
+
+async def await_step(awaitable: Awaitable) -> Union[Any, ExcInfo]:
+    """The result of `awaitable` - or its failure, with the traceback from the step method"""
+    try:
+        return await awaitable
+    except Exception:
+        return ExcInfo()
+
+
+def run_concurrently(tester, step_runs: list[StepRun]):
+    """
+    Resolves the results of `step_runs` in a thread pool, each in a copy of the
+    current context, while the tester event loop runs the async step methods
+    """
+    event_loop = tester.event_loop if any(run.step.is_async for run in step_runs) else None
+    contexts = [contextvars.copy_context() for _ in step_runs]
+
+    for context in contexts:
+        context.run(IN_STEP_POOL.set, True)
+
+    with ThreadPoolExecutor(max_workers=len(step_runs)) as executor:
+        futures = [executor.submit(context.run, step_run.step.resolve, step_run, tester,
+                                   **step_run.call_kwargs) for context, step_run in zip(contexts, step_runs)]
+
+        if event_loop is not None:
+            event_loop.run_until_complete(asyncio.gather(*(
+                asyncio.wrap_future(future, loop=event_loop) for future in futures)))
+
+    for future in futures:
+        future.result()
 
 
 class StepRun(stock.Repr):
@@ -27,6 +76,17 @@ class StepRun(stock.Repr):
         self.kwargs: dict = {}
         self.result: Optional[Union[tuple, ExcInfo]] = None
         self.is_last: bool = False
+        self.thread_id: Optional[int] = None
+        self.reused: str = ''  # 'shared', 'cached' or 'forked' result
+        self.call_kwargs: dict = {}  # Kept until the concurrent group of the step runs
+
+    @property
+    def qualname(self) -> str:
+        return self.step.method_qualname
+
+    @property
+    def test_id(self):
+        return self.scenario_run.test_id
 
     @property
     def symbol(self) -> str:
@@ -36,6 +96,7 @@ class StepRun(stock.Repr):
     def symbol(self, value):
         self.__symbol = value
         self.__end_time = datetime.datetime.utcnow()
+        self.__end_clock = time.perf_counter()
         self.log()
 
         if value == FAIL or value == OK and self.is_last:
@@ -49,8 +110,29 @@ class StepRun(stock.Repr):
     def end_time(self, value):
         raise AssertionError("'end_time' is read-only")
 
+    @property
+    def start_clock(self) -> Optional[float]:
+        return getattr(self, '_StepRun__start_clock', None)
+
+    @property
+    def end_clock(self) -> Optional[float]:
+        return getattr(self, '_StepRun__end_clock', None)
+
+    @property
+    def duration(self) -> Optional[float]:
+        if self.start_clock is None or self.end_clock is None:
+            return None
+
+        return self.end_clock - self.start_clock
+
+    def start(self):
+        self.__start_clock = time.perf_counter()
+        self.thread_id = threading.get_native_id()
+        self.scenario_run.start(self.__start_clock)
+
     def __str__(self) -> str:
         return (f'{self.end_time} {self.symbol} {self.step.method_qualname}'
+                f'{f" ({self.reused})" if self.reused else ""}'
                 f'{self.step.format_parameters(**self.kwargs)} {self.formatted_result}')
 
     @property
@@ -71,13 +153,21 @@ class StepRun(stock.Repr):
         lines[1:] = [f'|{line}' for line in lines[1:]]
         self.step.gherkin.log_message('\n'.join(lines))
 
+    def to_record(self) -> dict:
+        return {'qualname': self.qualname, 'name': self.step.name, 'symbol': self.symbol,
+                'start_clock': self.start_clock, 'duration': self.duration, 'reused': self.reused,
+                'kwargs': {name: repr(value) for name, value in self.kwargs.items()}}
+
 
 class ScenarioRun(stock.Repr):
-    def __init__(self, test_id: int, scenario: Scenario, parent_run: Optional[ScenarioRun] = None):
+    def __init__(self, test_id: int, scenario: Scenario, parent_run: Optional[ScenarioRun] = None,
+                 node_id: str = ''):
         self.test_id = test_id
         self.scenario = scenario
         self.parent_run = parent_run
+        self.node_id = node_id if parent_run is None else parent_run.node_id
         self.is_last: bool = False
+        self.memory_growth: Optional[MemoryGrowth] = None
         self.runs: list[Union[StepRun, ScenarioRun]] = [
             StepRun(step, self) if step.doc_scenario is None else ScenarioRun(
                 test_id, step.doc_scenario, self) for step in scenario.steps]
@@ -101,6 +191,18 @@ class ScenarioRun(stock.Repr):
         return (f'{PENDING} {qualname}' if self.symbol == PENDING else
                 f'{self.end_time} {BOLD[self.symbol]} {qualname}{result_text}')
 
+    @property
+    def qualname(self) -> str:
+        return self.scenario.qualname
+
+    @property
+    def kwargs(self) -> dict:
+        return dict(itertools.chain(*(r.kwargs.items() for r in self.iter_step_runs())))
+
+    @property
+    def thread_id(self) -> Optional[int]:
+        return next(filter(None, (r.thread_id for r in self.iter_step_runs())), None)
+
     @property
     def result(self) -> Union[tuple, ExcInfo]:
         for step_run in self.iter_step_runs():
@@ -116,9 +218,13 @@ class ScenarioRun(stock.Repr):
     def symbol(self, value):
         self.__symbol = value
         self.__end_time = datetime.datetime.utcnow()
+        self.__end_clock = max(filter(None, (run.end_clock for run in self.runs)),
+                               default=time.perf_counter())
         self.log()
 
-        if self.parent_run is not None and (value == FAIL or value == OK and self.is_last):
+        if self.parent_run is None:
+            self.scenario.gherkin.end_run(self)
+        elif value == FAIL or value == OK and self.is_last:
             self.parent_run.symbol = value
 
     @property
@@ -129,6 +235,28 @@ class ScenarioRun(stock.Repr):
     def end_time(self, value):
         raise AssertionError("'end_time' is read-only")
 
+    @property
+    def start_clock(self) -> Optional[float]:
+        return getattr(self, '_ScenarioRun__start_clock', None)
+
+    @property
+    def end_clock(self) -> Optional[float]:
+        return getattr(self, '_ScenarioRun__end_clock', None)
+
+    @property
+    def duration(self) -> Optional[float]:
+        if self.start_clock is None or self.end_clock is None:
+            return None
+
+        return self.end_clock - self.start_clock
+
+    def start(self, clock: float):
+        if self.start_clock is None:
+            self.__start_clock = clock
+
+            if self.parent_run is not None:
+                self.parent_run.start(clock)
+
     def iter_step_runs(self) -> Iterator[StepRun]:
         for run in self.runs:
             if isinstance(run, StepRun):
@@ -142,6 +270,17 @@ class ScenarioRun(stock.Repr):
                 return step_run
         return None
 
+    def to_record(self) -> dict:
+        """JSON-serializable summary, nesting the records of `runs`"""
+        return {'test_id': str(self.test_id), 'qualname': self.qualname,
+                'name': self.scenario.name, 'symbol': self.symbol, 'text': str(self),
+                'start_clock': self.start_clock, 'duration': self.duration,
+                'kwargs': {name: repr(value) for name, value in self.kwargs.items()},
+                'memory_growth': None if self.memory_growth is None else {
+                    'delta': self.memory_growth.delta, 'unit': self.memory_growth.unit,
+                    'text': str(self.memory_growth)},
+                'runs': [run.to_record() for run in self.runs]}
+
     def log(self):
         self.scenario.gherkin.log_message('└─' + (
             f'{PENDING} {self.scenario.qualname}' if self.symbol == PENDING else
@@ -154,6 +293,7 @@ class Step(StepSpec):
         self.scenario = scenario
         self.doc_scenario: Optional[Scenario] = None
         self.test_scenario: Optional[Scenario] = None
+        self.method: Callable
 
     @property
     def gherkin(self) -> Gherkin:
@@ -173,28 +313,175 @@ class Step(StepSpec):
         return (f'Doc scenario {self.name}' if self.doc_scenario is not None
                 else super().__str__())
 
-    def __call__(self, step_method: Callable) -> Callable:
-        @functools.wraps(step_method)
-        def logger_step_method(tester, *args, **kwargs):
-            if tester.current_run.symbol != PENDING:
-                return
+    @property
+    def arg_names(self) -> list[str]:
+        """Argument names of the step method, to be injected by pytest"""
+        return list(inspect.signature(self.method).parameters)[1:]
+
+    def get_shared_key(self, tester, kwargs: dict) -> Optional[tuple]:
+        """
+        Key of the step result to share, for the step method scope - see
+        `Gherkin.scoped` -, the step inputs, and the scenario parameter values
+        """
+        if self.scope == 'function':
+            return None
+
+        scope_key = {'class': type(tester).__qualname__, 'module': type(tester).__module__,
+                     'session': ''}[self.scope]
+
+        return (self.method_qualname, self.scope, scope_key, tuple(self.inputs),
+                tuple(repr(kwargs.get(name)) for name in self.param_names))
+
+    def get_cache_key(self, kwargs: dict) -> Optional[str]:
+        """`StepCache` key, if the step method is cacheable - see `Gherkin.cacheable`"""
+        if not getattr(self.method, 'step_cacheable', False):
+            return None
+
+        return StepCache.make_key(self.method, self.inputs, *(
+            kwargs.get(name) for name in self.param_names))
+
+    @property
+    def is_async(self) -> bool:
+        return inspect.iscoroutinefunction(self.method)
 
-            step_run = tester.current_run.get_pending_step_run(self)
-            step_run.kwargs = {k: v for k, v in kwargs.items()
-                               if k not in self.gherkin.fixtures_not_to_log}
-            tester.param = self.fixture_param[0] if self.inputs else ()
+    def await_method(self, tester, *args, **kwargs) -> Union[Any, ExcInfo]:
+        """
+        Runs the async step method on the tester event loop, see `BddTester.event_loop`
+        - from the thread pool of `run_concurrently`, while it runs the event loop
+        """
+        awaitable = await_step(self.method(tester, *args, **kwargs))
 
+        if IN_STEP_POOL.get():
+            return asyncio.run_coroutine_threadsafe(awaitable, tester.event_loop).result()
+
+        return tester.event_loop.run_until_complete(awaitable)
+
+    @property
+    def is_concurrent(self) -> bool:
+        return self.doc_scenario is None and getattr(self.method, 'step_concurrent', False)
+
+    @functools.cached_property
+    def concurrent_group(self) -> list[Step]:
+        """Consecutive concurrent steps of the scenario including this one - or just this one"""
+        if not self.is_concurrent:
+            return [self]
+
+        groups = itertools.groupby(self.scenario.steps, key=lambda step: step.is_concurrent)
+
+        return next(group for group in (list(steps) for _, steps in groups) if self in group)
+
+    def call_method(self, step_run: StepRun, tester, *args, **kwargs):
+        """Sets the step run result - loaded from the step cache, if there -, caching it if OK"""
+        try:
+            cache_key = self.get_cache_key(kwargs)
+        except exceptions.UnstableCacheKeyError as error:
+            cache_key = None
+            self.gherkin.log_message(f'├─Step cache miss: {error}')
+
+        if cache_key is not None:
             try:
-                step_run.result = step_method(tester, *args, **kwargs)
-            except Exception:
-                step_run.result = ExcInfo()
-                step_run.symbol = FAIL
+                step_run.result = self.gherkin.step_cache.get(cache_key)
+            except KeyError:
+                pass
             else:
-                step_run.symbol = OK
+                step_run.reused = 'cached'
+                return
 
-                if isinstance(step_run.result, tuple):
-                    for name, value in zip(self.output_names, step_run.result):
-                        self.gherkin.outputs[name].append(value)
+        try:
+            with self.gherkin.profiling(step_run):
+                step_run.result = stream_outputs(self.await_method(tester, *args, **kwargs)
+                                                 if self.is_async else self.method(tester, *args, **kwargs))
+        except Exception:
+            step_run.result = ExcInfo()
+        else:
+            if cache_key is not None and not isinstance(step_run.result, ExcInfo) and not (
+                    self.gherkin.step_cache.set(cache_key, step_run.result)):
+                self.gherkin.log_message(f'├─Step cache miss: {self.method_qualname} result '
+                                         'could not be pickled')
+
+    def run(self, tester, **kwargs):
+        """
+        Runs the step - or, if concurrent, waits for the last step of its group to
+        run them all, see `Gherkin.concurrent`. The runs end in order, as if run
+        sequentially: those after a failure stay pending, and out of the log
+        """
+        if tester.current_run.symbol != PENDING:
+            return
+
+        step_run = tester.current_run.get_pending_step_run(self)
+        step_run.kwargs = {k: v for k, v in kwargs.items()
+                           if k not in self.gherkin.fixtures_not_to_log}
+        step_run.call_kwargs = kwargs
+        group = self.concurrent_group
+
+        if self is not group[-1]:
+            return
+
+        if len(group) == 1:
+            self.resolve(step_run, tester, **kwargs)
+            step_runs = [step_run]
+        else:
+            all_runs = list(tester.current_run.iter_step_runs())
+            index = all_runs.index(step_run) + 1
+            step_runs = all_runs[index - len(group):index]
+            run_concurrently(tester, step_runs)
+
+        for index, step_run in enumerate(step_runs):
+            step_run.step.end(step_run)
+
+            if step_run.symbol == FAIL:
+                for discarded_run in step_runs[index + 1:]:
+                    discarded_run.result = None
+
+                break
+
+    def resolve(self, step_run: StepRun, tester, **kwargs):
+        """Sets the step run result - replayed, shared, or from calling the method"""
+        tester.param = self.fixture_param[0] if self.inputs else ()
+        shared_key = self.get_shared_key(tester, kwargs)
+        step_run.start()
+
+        prefix_index = self.gherkin.get_prefix_index(step_run)
+
+        if prefix_index is not None:
+            step_run.reused = 'forked'
+            step_run.result = self.gherkin.prefix_results[prefix_index]
+        elif shared_key is None:
+            self.call_method(step_run, tester, **kwargs)
+        else:
+            with self.gherkin.get_shared_lock(shared_key):  # So that one thread calls the method
+                if shared_key in self.gherkin.shared_results:
+                    step_run.reused = 'shared'
+                    step_run.result = tee_outputs(self.gherkin.shared_results[shared_key])
+                else:
+                    self.call_method(step_run, tester, **kwargs)
+                    self.gherkin.shared_results[shared_key] = step_run.result
+                    step_run.result = tee_outputs(step_run.result)
+
+    def end(self, step_run: StepRun):
+        """Sets the step run symbol - logging it -, and its outputs"""
+        if isinstance(step_run.result, ExcInfo):
+            step_run.symbol = FAIL
+        else:
+            step_run.symbol = OK
+
+            if isinstance(step_run.result, tuple):
+                for name, value in zip(self.output_names, step_run.result):
+                    self.gherkin.outputs[name].append(value)
+
+    @property
+    def scope(self) -> str:
+        return getattr(self.method, 'step_scope', 'function')
+
+    def __call__(self, step_method: Callable) -> Callable:
+        self.method = step_method
+
+        @functools.wraps(step_method)
+        def logger_step_method(tester, **kwargs):
+            self.run(tester, **kwargs)
+
+            if tester.current_run.symbol == FAIL:
+                tester.skip_pending_steps()
 
         return pytest.fixture(name=self.fixture_name, params=self.fixture_param)(
             logger_step_method)
@@ -206,6 +493,7 @@ class Scenario(stock.Repr):
         self.param_values = param_values
         self.marked: bool = False
         self.ready: bool = False
+        self.dispatcher: Optional[Callable] = None
         self.steps: list[Step]
         self.is_test: bool
 
@@ -230,10 +518,52 @@ class Scenario(stock.Repr):
                 names.append(name)
         return names
 
-    def refine(self) -> tuple[list[Step], list[str], tuple]:
+    @property
+    def strategy(self) -> Optional[ParamStrategy]:
+        if len(self.param_values) == 1 and isinstance(self.param_values[0], ParamStrategy):
+            return self.param_values[0]
+        return None
+
+    @property
+    def source(self) -> Optional[ParamSource]:
+        if len(self.param_values) == 1 and isinstance(self.param_values[0], ParamSource):
+            return self.param_values[0]
+        return None
+
+    @property
+    def base_dir(self) -> str:
+        """Directory of the test module, for relative parameter source paths"""
+        return os.path.dirname(os.path.abspath(sys.modules[self.method.__module__].__file__))
+
+    @functools.cached_property
+    def refined_param_names(self) -> list[str]:
+        """The parameter names of `refine`, without making the rows"""
+        return self.param_names + [name for step in self.steps if step.doc_scenario is not None
+                                   for name in step.doc_scenario.refined_param_names]
+
+    def refine(self) -> tuple[list[Step], list[str], Union[tuple, Rows]]:
+        """
+        Steps, parameter names and rows, with the doc scenarios refined into them - with
+        rows zipped, or combined by the parameter strategy of this scenario, if any.
+        Rows read from a parameter source are lazy, see `Rows`
+        """
         fine_steps, param_ids, param_values = [], self.param_names, self.param_values
-        wrong_values = [i for i, values in enumerate(param_values) if not (
-            isinstance(values, list) and len(param_ids) == len(values))]
+        factors: list[Factor] = []
+
+        if self.source is not None:
+            param_values = self.source.get_rows(list(param_ids), self.base_dir)
+
+        if self.strategy is not None:
+            if set(self.strategy.domains) != set(param_ids):
+                raise exceptions.WrongParameterDomainsError(
+                    name=self.name, domains=', '.join(self.strategy.domains),
+                    params=', '.join(param_ids))
+
+            factors.extend(self.strategy.get_factors(param_ids))
+
+        wrong_values = [] if self.strategy or self.source else [
+            i for i, values in enumerate(param_values)
+            if not (isinstance(values, list) and len(param_ids) == len(values))]
 
         if wrong_values:
             raise exceptions.WrongParametersError(
@@ -253,13 +583,29 @@ class Scenario(stock.Repr):
                 param_ids.extend(paramids)
                 fine_steps.extend(finesteps)
 
-                param_values = (tuple(v1 + v2 for v1, v2 in zip(param_values, paramvalues))
-                                if param_values else paramvalues)
+                if self.strategy is None:
+                    param_values = (zip_rows(param_values, paramvalues)
+                                    if isinstance(param_values, Rows) or param_values else paramvalues)
+                elif paramids:
+                    factors.append((tuple(paramids), [tuple(values) for values in paramvalues]))
+
+        if self.strategy is not None:
+            param_values = tuple(self.strategy.make_rows(factors))
 
         return fine_steps, param_ids, param_values
 
     def mark_method(self, method):
-        self.steps = list(Step.generate_steps(method.__doc__.splitlines(), self))
+        doc_lines = method.__doc__.splitlines()
+        self.steps = list(Step.generate_steps(doc_lines, self))
+        examples_path = find_examples_path(doc_lines)
+
+        if examples_path is not None:
+            if self.param_values:
+                raise exceptions.ParamSourceError(
+                    path=examples_path, error=f'{method.__name__} parameters given twice')
+
+            self.param_values = (ParamSource.from_path(examples_path),)
+
         self.gherkin[method.__qualname__] = self
         self.is_test = method.__name__.startswith('test_')
 
@@ -272,21 +618,62 @@ class Scenario(stock.Repr):
 
         return scenario_doc_method
 
+    @property
+    def dispatcher_name(self) -> str:
+        return f'{self.name}{id(self)}'
+
+    def make_dispatcher(self, fine_steps: list[Step]) -> Callable:
+        """
+        Single fixture running `fine_steps` in order, taking the union of their
+        arguments from pytest. Steps with inputs give it one parameter, for test ids
+        """
+        arg_names = stock.list_drop_duplicates(
+            itertools.chain(*(step.arg_names for step in fine_steps)), lambda name: name)
+        inputs = [', '.join(step.inputs) for step in fine_steps if step.inputs]
+
+        def scenario_dispatcher(tester, **kwargs):
+            for step in fine_steps:
+                if tester.current_run.symbol == FAIL:
+                    break
+
+                step.run(tester, **{name: kwargs[name] for name in step.arg_names})
+
+        scenario_dispatcher.__signature__ = inspect.Signature([
+            inspect.Parameter(name, inspect.Parameter.POSITIONAL_OR_KEYWORD)
+            for name in ['self', *arg_names]])
+
+        return pytest.fixture(name=self.dispatcher_name, params=[inputs] if inputs else None,
+                              ids=['-'.join(inputs)] if inputs else None)(scenario_dispatcher)
+
     def make_test_method(self, marked_method: Callable) -> Callable:
+        """
+        With `Gherkin(dispatch=True)`, the test uses the single `dispatcher` fixture
+        - to be set on the tester class -, instead of one fixture per step
+        """
         fine_steps, param_ids, param_values = self.refine()
 
+        if self.gherkin.dispatch:
+            self.dispatcher = self.make_dispatcher(fine_steps)
+            fixture_names = [self.dispatcher_name]
+        else:
+            fixture_names = [step.fixture_name for step in fine_steps]
+
         @functools.wraps(marked_method)
-        @pytest.mark.usefixtures(*(step.fixture_name for step in fine_steps))
+        @pytest.mark.usefixtures(*fixture_names)
         def scenario_test_method(tester, *args, **kwargs):
             __tracebackhide__ = True
 
             if tester.current_run.symbol == FAIL:
                 pytest.fail(reason=tester.current_run.result.next_traceback, pytrace=False)
 
-        if len(param_ids) == 1:
+            tester.gherkin.check_memory_budget(tester.current_run)
+
+        if isinstance(param_values, Rows):
+            param_values = Rows(param_values.iter_params, param_values.name)
+        elif len(param_ids) == 1:
             param_values = tuple(v[0] for v in param_values)
 
-        if param_values:
+        if isinstance(param_values, Rows) or param_values:
             return pytest.mark.parametrize(','.join(param_ids), param_values)(scenario_test_method)
 
         return scenario_test_method
@@ -306,15 +693,67 @@ class Scenario(stock.Repr):
 
 class Gherkin(stock.Repr):
     BDD_RUN_LOG_LEVEL = 5
+    instances: list[Gherkin] = []
 
     def __init__(self, validate: bool = True, fixtures_not_to_log: tuple[str, ...] = ('request',),
-                 **logging_kwds):
+                 profile: Union[bool, StepProfiler, None] = None,
+                 sample: Union[bool, SamplingProfiler, None] = None,
+                 memory: Union[bool, MemoryTracker] = False,
+                 chrome_trace_path: Optional[str] = None, history_path: Optional[str] = None,
+                 dispatch: bool = False, step_cache: Optional[StepCache] = None,
+                 dedupe_tests: bool = False, event_loop_scope: str = 'session', **logging_kwds):
+        """
+        Step runs are profiled if `profile` is a `StepProfiler`, and scenario runs
+        are sampled if `sample` is a `SamplingProfiler` - or `True`, for default
+        settings. If `None`, the environment may set them, see `from_env` methods.
+        Memory growth of scenario runs is tracked if `memory` is a `MemoryTracker` or `True`.
+        With `chrome_trace_path` - by default, the `BDD_CHROME_TRACE` environment variable -,
+        `log` exports the runs as Chrome trace events. With `history_path` - by default,
+        the `BDD_HISTORY` environment variable -, the runs of each session are stored
+        in a `RunHistory` at its end, by the `bdd_coder` plugin.
+        With `dispatch`, each test scenario runs its steps from a single fixture.
+        Results of cacheable steps are kept in `step_cache` - by default, the
+        `BDD_STEP_CACHE` directory, or `.bdd-step-cache`. With `dedupe_tests`, test
+        scenarios inherited by test classes run once, see `bdd_coder.dedupe`. Async step
+        methods run on one event loop per `event_loop_scope`, 'session' or 'class'
+        """
         self.reset_logger(**logging_kwds)
+        self.outputs_context: contextvars.ContextVar = contextvars.ContextVar(
+            f'outputs{len(self.instances)}')
         self.reset_outputs()
+        self.lock = threading.RLock()  # Of the registries shared by threads
         self.scenarios: dict[str, dict[str, Callable]] = defaultdict(dict)
         self.validate = validate
         self.fixtures_not_to_log = fixtures_not_to_log
         self.test_runs: dict = {}
+        self.profiler: Optional[StepProfiler] = (
+            StepProfiler.from_env() if profile is None else
+            StepProfiler() if profile is True else profile or None)
+        self.sampler: Optional[SamplingProfiler] = (
+            SamplingProfiler.from_env() if sample is None else
+            SamplingProfiler() if sample is True else sample or None)
+        self.memory_tracker: Optional[MemoryTracker] = (
+            MemoryTracker() if memory is True else memory or None)
+        self.chrome_trace_path = (os.environ.get('BDD_CHROME_TRACE', '')
+                                  if chrome_trace_path is None else chrome_trace_path)
+        self.history_path = RunHistory.path_from_env() if history_path is None else history_path
+        self.dispatch = dispatch
+        self.shared_results: dict[tuple, Union[tuple, ExcInfo]] = {}
+        self.shared_locks: dict[tuple, threading.Lock] = {}
+        self.step_cache = StepCache.from_env() if step_cache is None else step_cache
+        self.dedupe_tests = dedupe_tests
+
+        if event_loop_scope not in EVENT_LOOP_SCOPES:
+            raise exceptions.WrongEventLoopScopeError(
+                scope=event_loop_scope, scopes=', '.join(EVENT_LOOP_SCOPES))
+
+        self.event_loop_scope = event_loop_scope
+        self.event_loops: dict[str, asyncio.AbstractEventLoop] = {}
+        self.prefix_results: Optional[list] = None
+        self.prefix_state: dict = {}
+        self.fail_if_pending = False
+        self.worker = ''  # Id of the `bdd-run` worker process, see `bdd_coder.runner`
+        self.instances.append(self)
 
     def __str__(self) -> str:
         return str(self.test_runs or self.scenarios)
@@ -322,6 +761,46 @@ class Gherkin(stock.Repr):
     def __call__(self, *param_values) -> Scenario:
         return Scenario(self, *param_values)
 
+    @staticmethod
+    def scoped(scope: str) -> Callable:
+        """
+        Step method decorator: the step runs once per `scope` - 'class', 'module' or
+        'session', besides the default 'function' -, inputs and scenario parameter
+        values. The later runs share its result and outputs, and are still logged
+        """
+        if scope not in STEP_SCOPES:
+            raise exceptions.WrongStepScopeError(scope=scope, scopes=', '.join(STEP_SCOPES))
+
+        def scoped_step_method(step_method: Callable) -> Callable:
+            step_method.step_scope = scope
+
+            return step_method
+
+        return scoped_step_method
+
+    @staticmethod
+    def cacheable(step_method: Callable) -> Callable:
+        """
+        Step method decorator: its results are pickled to the `step_cache`, keyed by
+        its source, step inputs and scenario parameter values, and loaded in later
+        sessions instead of running it. For deterministic steps only
+        """
+        step_method.step_cacheable = True
+
+        return step_method
+
+    @staticmethod
+    def concurrent(step_method: Callable) -> Callable:
+        """
+        Step method decorator: consecutive concurrent steps of a scenario run at once,
+        in a thread pool - async ones on the tester event loop -, with their outputs
+        added, runs logged, and failures handled in declaration order. For independent
+        steps only, not taking the outputs of each other
+        """
+        step_method.step_concurrent = True
+
+        return step_method
+
     def __iter__(self) -> Iterator[Callable]:
         for class_name in self.scenarios:
             yield from self.scenarios[class_name].values()
@@ -340,48 +819,185 @@ class Gherkin(stock.Repr):
         class_name, method_name = scenario_qualname.split('.')
         self.scenarios[class_name][method_name] = scenario_method
 
-    def new_run(self, test_id: int, scenario: Scenario):
-        self.test_runs[test_id] = ScenarioRun(test_id, scenario)
+    def new_run(self, node_id: str, scenario: Scenario, test_id: str) -> ScenarioRun:
+        """Registers the run by pytest node id - the test id may repeat across test classes"""
+        scenario_run = ScenarioRun(test_id, scenario, node_id=node_id)
+
+        with self.lock:
+            self.test_runs[node_id] = scenario_run
+
         self.log_message('_'*26)
 
+        if self.memory_tracker is not None:
+            self.memory_tracker.start(scenario_run)
+
+        if self.sampler is not None:
+            self.sampler.start(scenario_run)
+
+        return scenario_run
+
+    def get_test_runs(self) -> list[ScenarioRun]:
+        with self.lock:
+            return list(self.test_runs.values())
+
+    def end_run(self, scenario_run: ScenarioRun):
+        if self.memory_tracker is not None:
+            self.memory_tracker.finish(scenario_run)
+
+        if self.profiler is not None:
+            self.profiler.finish(scenario_run)
+
+        if self.sampler is not None:
+            self.sampler.stop()
+
+    def get_shared_lock(self, shared_key: tuple) -> threading.Lock:
+        """Lock of the shared step result of `shared_key`, held while resolving it"""
+        with self.lock:
+            return self.shared_locks.setdefault(shared_key, threading.Lock())
+
+    def get_prefix_index(self, step_run: StepRun) -> Optional[int]:
+        """
+        Index of `step_run` in the `prefix_results` run before forking - see
+        `bdd_coder.forking` -, if there
+        """
+        if not self.prefix_results:
+            return None
+
+        index = list(root_run(step_run.scenario_run).iter_step_runs()).index(step_run)
+
+        return index if index < len(self.prefix_results) else None
+
+    def get_event_loop(self, tester_class: type) -> asyncio.AbstractEventLoop:
+        """The event loop of `tester_class` - or of the session -, made on first use"""
+        key = tester_class.__qualname__ if self.event_loop_scope == 'class' else ''
+
+        with self.lock:
+            if key not in self.event_loops:
+                self.event_loops[key] = asyncio.new_event_loop()
+
+            return self.event_loops[key]
+
+    def close_event_loops(self, tester_class: Optional[type] = None):
+        """Closes the event loop of `tester_class` - with class scope -, or all"""
+        keys = list(self.event_loops) if tester_class is None else [
+            tester_class.__qualname__] if self.event_loop_scope == 'class' else []
+
+        for key in keys:
+            with self.lock:
+                event_loop = self.event_loops.pop(key, None)
+
+            if event_loop is None:
+                continue
+
+            event_loop.run_until_complete(event_loop.shutdown_asyncgens())
+            event_loop.close()
+
+    def check_memory_budget(self, scenario_run: ScenarioRun):
+        __tracebackhide__ = True
+
+        if self.memory_tracker is not None and self.memory_tracker.exceeds_budget(scenario_run):
+            message = (f'Memory growth {scenario_run.memory_growth} of {scenario_run.scenario.qualname}'
+                       f' exceeds the budget of {self.memory_tracker.budget} {self.memory_tracker.unit}')
+            self.log_message(message)
+            pytest.fail(reason=message, pytrace=False)
+
+    def profiling(self, step_run: StepRun) -> contextlib.AbstractContextManager:
+        """To be entered by the step method caller only"""
+        if self.profiler is None and self.sampler is None:
+            return contextlib.nullcontext()
+
+        stack = contextlib.ExitStack()
+
+        if self.profiler is not None:
+            stack.enter_context(self.profiler.profiling(step_run))
+
+        if self.sampler is not None:
+            stack.enter_context(self.sampler.sampling(step_run, sys._getframe(1)))
+
+        return stack
+
     def reset_logger(self, propagate_logs: bool = False, logs_path: str = './',
                      maxBytes: int = 1000000, backupCount: int = 10):
+        """Under pytest-xdist, each worker logs to its own file - see `stock.worker_path`"""
+        self.logs_path = logs_path
         self.logger = logging.getLogger('bdd_test_runs')
         logging.addLevelName(self.BDD_RUN_LOG_LEVEL, 'BDDR')
         self.logger.setLevel(level=self.BDD_RUN_LOG_LEVEL)
-        handler = RotatingFileHandler(logs_path, maxBytes=maxBytes, backupCount=backupCount)
+        handler = RotatingFileHandler(
+            stock.worker_path(logs_path), maxBytes=maxBytes, backupCount=backupCount)
         handler.setFormatter(logging.Formatter('%(message)s'))
         self.logger.handlers.clear()
         self.logger.addHandler(handler)
         self.logger.propagate = propagate_logs
 
-    def log_message(self, *args):
-        self.logger.log(self.BDD_RUN_LOG_LEVEL, *args)
-
-    def log(self, fail_if_pending: bool = False):
+    def log_message(self, *args, **kwargs):
+        kwargs['extra'] = {'logs_path': self.logs_path, **kwargs.get('extra', {})}
+        self.logger.log(self.BDD_RUN_LOG_LEVEL, *args, **kwargs)
+
+    def log(self, fail_if_pending: bool = False, slowest_steps: int = 10,
+            largest_growths: int = 10):
+        """
+        Logs the final summary - but in forked test runs, left to the parent, see
+        `bdd_coder.forking`, and under pytest-xdist or `bdd-run`, left to the controller,
+        see `bdd_coder.plugin`, as is the pending scenarios check
+        """
         __tracebackhide__ = True
-        runs = self.get_scenario_runs()
-        self.log_message('\n' + ''.join([
-            f'  {len(runs[OK])}{BOLD[OK]}' if runs[OK] else '',
-            f'  {len(runs[FAIL])}{BOLD[FAIL]}' if runs[FAIL] else '',
-            f'  {len(runs[PENDING])}{PENDING}' if runs[PENDING] else f'  {COMPLETION_MSG}'
-        ]) + '\n')
-        failed_runs = list(itertools.chain(*runs[FAIL].values()))
 
-        if failed_runs:
-            self.log_message('  ' + Style.bold('Scenario failures summary:'))
+        if self.sampler is not None:
+            self.sampler.stop()
+
+        report = self.get_report()
+
+        if self.prefix_results is None:
+            if not (stock.is_worker() or self.worker):  # The controller writes the merged one
+                for message in report.get_summary_messages(slowest_steps, largest_growths):
+                    self.log_message(message, extra={'summary': True})
 
-            for run in failed_runs:
-                self.log_message(indent(str(run)) + '\n')
+            if self.chrome_trace_path:
+                self.export_chrome_trace(stock.worker_path(self.chrome_trace_path, self.worker))
 
-        if runs[PENDING] and fail_if_pending:
-            names = ', '.join(list(runs[PENDING]))
-            pytest.fail(reason=f'These scenarios did not run: {names}')
+        pending_names = report.get_names(PENDING)
+
+        if fail_if_pending and self.prefix_results is not None:
+            self.fail_if_pending = True  # The parent may hold no records, see `bdd_coder.forking`
+        elif pending_names and fail_if_pending:
+            if stock.is_worker() or self.worker:
+                self.fail_if_pending = True
+            else:
+                pytest.fail(reason=f'These scenarios did not run: {", ".join(pending_names)}')
+
+    def get_records(self) -> list[dict]:
+        return [run.to_record() for run in self.get_test_runs()]
+
+    def get_report(self) -> RunsReport:
+        return RunsReport(self.get_records())
+
+    def export_chrome_trace(self, path: str):
+        ChromeTraceExporter(self.get_test_runs()).export(path)
+
+    def get_step_durations(self) -> dict[str, stock.DurationStats]:
+        """Duration statistics of the step runs that finished, by step method qualname"""
+        return self.get_report().get_step_durations()
+
+    def get_scenario_durations(self) -> dict[str, stock.DurationStats]:
+        """Duration statistics of the scenario runs that finished - doc ones included -, by qualname"""
+        return self.get_report().get_scenario_durations()
 
     def get_scenario_runs(self, symbols=(OK, FAIL, PENDING)) -> dict[str, OrderedDict]:
         return {symbol: OrderedDict(itertools.groupby(
-            filter(lambda s: s.symbol == symbol, itertools.chain(*self.test_runs.values())),
+            filter(lambda s: s.symbol == symbol, itertools.chain(*self.get_test_runs())),
             key=lambda s: s.scenario.name)) for symbol in symbols}
 
-    def reset_outputs(self):
-        self.outputs = defaultdict(list)
+    @property
+    def outputs(self) -> defaultdict[str, list]:
+        """Step outputs of the test run in this context, see `BddTester.current_run`"""
+        try:
+            return self.outputs_context.get()
+        except LookupError:
+            return self.reset_outputs()
+
+    def reset_outputs(self) -> defaultdict[str, list]:
+        outputs: defaultdict[str, list] = defaultdict(list)
+        self.outputs_context.set(outputs)
+
+        return outputs
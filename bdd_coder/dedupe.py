@@ -0,0 +1,70 @@
+"""
+Test scenarios inherited by test classes, which pytest collects - and runs - again
+in each, deduplicated with `--bdd-dedupe-tests` or `Gherkin(dedupe_tests=True)`
+"""
+from __future__ import annotations
+
+from collections import defaultdict
+
+import pytest
+
+from bdd_coder import scheduling
+from bdd_coder import stock
+
+
+class InheritedTestsSelector:
+    """
+    Pytest plugin keeping each deduped test scenario case - by test name, with its
+    parameter ids - only in the test class defining the scenario, or else in the
+    first collected one, and reporting the classes where it did not run, once per
+    scenario
+    """
+    def __init__(self, config):
+        self.config = config
+        self.skipped: dict[str, list[str]] = defaultdict(list)  # Class names, by scenario qualname
+
+    @staticmethod
+    def is_kept_over(item: pytest.Item, kept_item: pytest.Item) -> bool:
+        defining_class_name = scheduling.get_scenario(item).qualname.split('.')[0]
+
+        return item.cls.__name__ == defining_class_name != kept_item.cls.__name__
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_collection_modifyitems(self, config, items):
+        kept: dict[tuple[str, str], pytest.Item] = {}
+        deduped = []
+
+        for item in items:
+            scenario = scheduling.get_scenario(item)
+
+            if scenario is None or getattr(item, 'cls', None) is None or not (
+                    config.getoption('bdd_dedupe_tests') or scenario.gherkin.dedupe_tests):
+                continue
+
+            scenario.gherkin.dedupe_tests = True  # For validation, see `BddTester.setup_class`
+            key = (scenario.qualname, item.name)
+            deduped.append((key, item))
+
+            if key not in kept or self.is_kept_over(item, kept[key]):
+                kept[key] = item
+
+        dropped = [(qualname, item) for (qualname, _), item in deduped
+                   if kept[qualname, item.name] is not item]
+
+        for qualname, item in dropped:
+            self.skipped[qualname].append(item.cls.__name__)
+
+        if dropped:
+            dropped_ids = {item.nodeid for _, item in dropped}
+            scheduling.select(config, items, [item for item in items if item.nodeid not in dropped_ids])
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.skipped:
+            return
+
+        terminalreporter.section('bdd-coder')
+        terminalreporter.line('Inherited test scenarios run once, not in:')
+
+        for qualname, class_names in self.skipped.items():
+            names = stock.list_drop_duplicates(class_names, lambda name: name)
+            terminalreporter.line(f'  {qualname}: {", ".join(names)}')
@@ -29,6 +29,15 @@ def makedirs(path, exist_ok):
         raise OverwriteError(path=path, error=error)
 
 
+class CollectionError(DocException):
+    """Test collection failed with exit code {code}:
+    {output}"""
+
+
+class TestsFailedError(DocException):
+    """Tests finished with exit code {code}"""
+
+
 class ScenarioMismatchError(DocException):
     """Scenario code not understood: {code}..."""
 
@@ -46,6 +55,32 @@ class WrongParametersError(DocException):
     """
 
 
+class WrongParameterDomainsError(DocException):
+    """
+    Parameter domains {domains} of scenario {name} do not match
+    the parameters declared in doc: {params}
+    """
+
+
+class ParamSourceError(DocException):
+    """Wrong parameter source {path}: {error}"""
+
+
+class WrongStepScopeError(DocException):
+    """Wrong step scope {scope}: should be one of {scopes}"""
+
+
+class WrongEventLoopScopeError(DocException):
+    """Wrong event loop scope {scope}: should be one of {scopes}"""
+
+
+class UnstableCacheKeyError(DocException):
+    """
+    Step cache key part {part} is not stable across sessions, having a memory address
+    in its repr - define __repr__ to cache {qualname}
+    """
+
+
 class RedeclaredParametersError(DocException):
     """
     Redeclared parameter(s) {params}. If trying to reuse a step, you may take the
@@ -0,0 +1,71 @@
+"""Exports of scenario runs to external tools"""
+from __future__ import annotations
+
+import json
+import os
+
+from typing import TYPE_CHECKING, Iterable, Iterator, Union
+
+from bdd_coder import stock
+from bdd_coder.text_utils import OK, FAIL, PENDING
+
+if TYPE_CHECKING:  # NO COVER
+    from bdd_coder.decorators import ScenarioRun, StepRun
+
+OUTCOMES: dict[str, str] = {OK: 'passed', FAIL: 'failed', PENDING: 'pending'}
+
+
+class ChromeTraceExporter(stock.Repr):
+    """
+    Turns test scenario runs into Chrome trace-event JSON - one complete event
+    per finished scenario, doc scenario and step run, with parameters and outcome
+    as arguments -, loadable in Perfetto or chrome://tracing. Each process is a
+    lane named after its pytest-xdist worker
+    """
+    def __init__(self, test_runs: Iterable[ScenarioRun]):
+        self.test_runs = list(test_runs)
+        self.pid = os.getpid()
+
+    def __str__(self) -> str:
+        return f'{len(self.test_runs)} test runs from process {self.pid} ({stock.worker_id()})'
+
+    @property
+    def trace(self) -> dict:
+        return {'traceEvents': list(self.iter_events()), 'displayTimeUnit': 'ms'}
+
+    def iter_events(self) -> Iterator[dict]:
+        yield {'name': 'process_name', 'ph': 'M', 'pid': self.pid, 'tid': 0,
+               'args': {'name': stock.worker_id()}}
+
+        for test_run in self.test_runs:
+            yield from self.iter_run_events(test_run)
+
+    def iter_run_events(self, run: Union[ScenarioRun, StepRun]) -> Iterator[dict]:
+        if run.duration is None:
+            return
+
+        yield {
+            'name': run.qualname, 'cat': 'scenario' if hasattr(run, 'runs') else 'step',
+            'ph': 'X', 'pid': self.pid, 'tid': run.thread_id,
+            'ts': run.start_clock*1e6, 'dur': run.duration*1e6,
+            'args': {'test_id': str(run.test_id), 'outcome': OUTCOMES[run.symbol],
+                     'params': {name: repr(value) for name, value in run.kwargs.items()}}}
+
+        for sub_run in getattr(run, 'runs', ()):
+            yield from self.iter_run_events(sub_run)
+
+    def export(self, path: str):
+        with open(path, 'w') as trace_file:
+            json.dump(self.trace, trace_file)
+
+
+def merge_chrome_traces(paths: Iterable[str], path: str):
+    """Writes to `path` the events of all traces in `paths`, one lane per process"""
+    events: list[dict] = []
+
+    for trace_path in paths:
+        with open(trace_path) as trace_file:
+            events.extend(json.load(trace_file)['traceEvents'])
+
+    with open(path, 'w') as trace_file:
+        json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, trace_file)
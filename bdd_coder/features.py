@@ -17,15 +17,27 @@ from bdd_coder import stock
 from bdd_coder.text_utils import make_class_head, indent
 from bdd_coder.text_utils import sentence_to_name
 from bdd_coder.text_utils import strip_lines
-from bdd_coder.text_utils import I_REGEX, O_REGEX, PARAM_REGEX, TO
+from bdd_coder.text_utils import EXAMPLES_REGEX, I_REGEX, O_REGEX, PARAM_REGEX, STEP_SCOPES, TO
 
 MAX_INHERITANCE_LEVEL = 100
 
 
+def find_examples_path(lines: list[str]) -> Optional[str]:
+    """Path of the parameter source file in the `Examples: <path>` line, if any"""
+    for line in strip_lines(lines):
+        match = re.match(EXAMPLES_REGEX, line)
+
+        if match:
+            return match.group(1)
+
+    return None
+
+
 class StepSpec(stock.Repr, stock.Hashable):
     @classmethod
     def generate_steps(cls, lines: list[str], *args, **kwargs) -> Iterator[StepSpec]:
-        return (cls(line, i, *args, **kwargs) for i, line in enumerate(strip_lines(lines)))
+        return (cls(line, i, *args, **kwargs) for i, line in enumerate(
+            line for line in strip_lines(lines) if not re.match(EXAMPLES_REGEX, line)))
 
     def __init__(self, text: str, ordinal: int):
         self.text: str = text.strip().split(maxsplit=1)[1].strip()
@@ -104,7 +116,8 @@ class ScenarioSpec(stock.Repr, stock.Hashable):
 
 class FeatureClassSpec(stock.Repr):
     def __init__(self, class_name: str, scenarios: list[dict], doc: str = '',
-                 bases=None, mro_bases=None, inherited: bool = False):
+                 bases=None, mro_bases=None, inherited: bool = False,
+                 step_scopes: Optional[dict[str, str]] = None):
         self.class_name = class_name
         self.doc = doc
         self.bases = bases or set()
@@ -112,6 +125,8 @@ class FeatureClassSpec(stock.Repr):
         self.inherited = inherited
         self.scenarios: dict[str, ScenarioSpec] = {
             sentence_to_name(s['title']): ScenarioSpec(**s) for s in scenarios}
+        self.step_scopes = step_scopes or {}
+        self.validate_step_scopes()
 
     def __str__(self) -> str:
         head = f'{self.class_name}: ' + ', '.join([f'{key}={getattr(self, key)}' for key in [
@@ -119,6 +134,20 @@ class FeatureClassSpec(stock.Repr):
 
         return '\n'.join([head, indent(indent(self.doc)), indent(self.scenarios_text)])
 
+    def validate_step_scopes(self):
+        wrong_scopes = {name: scope for name, scope in self.step_scopes.items()
+                        if scope not in STEP_SCOPES}
+        unknown_names = set(self.step_scopes) - set(self.steps)
+
+        if wrong_scopes:
+            raise exceptions.FeaturesSpecError(
+                f'Wrong step scopes in {self.class_name}: {wrong_scopes}, '
+                f'should be one of {", ".join(STEP_SCOPES)}')
+
+        if unknown_names:
+            raise exceptions.FeaturesSpecError(
+                f'Scopes of unknown steps in {self.class_name}: {", ".join(sorted(unknown_names))}')
+
     @property
     def test_class_name(self) -> str:
         return f'Test{self.class_name}' if self.is_test else self.class_name
@@ -227,7 +256,8 @@ class FeaturesSpec(stock.Repr):
                 class_name=cls.title_to_class_name(yml_feature.pop('Title')),
                 doc=yml_feature.pop('Story').strip(),
                 scenarios=[dict(title=title, doc_lines=lines)
-                           for title, lines in yml_feature.pop('Scenarios').items()])
+                           for title, lines in yml_feature.pop('Scenarios').items()],
+                step_scopes=yml_feature.pop('Step scopes', None))
 
     @staticmethod
     def simplify_bases(features: dict[str, FeatureClassSpec]) -> dict[str, FeatureClassSpec]:
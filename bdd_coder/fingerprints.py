@@ -0,0 +1,118 @@
+"""
+Fingerprints of test scenarios, covering their spec lines, their doc scenario
+chain, and the source of every step method they reach
+"""
+from __future__ import annotations
+
+import functools
+import hashlib
+import inspect
+import json
+
+from typing import TYPE_CHECKING, Callable, Iterator, Optional
+
+import pytest
+
+from bdd_coder import scheduling
+from bdd_coder.text_utils import strip_lines
+
+if TYPE_CHECKING:  # NO COVER
+    from bdd_coder.decorators import Scenario
+
+FINGERPRINTS_KEY = 'bdd_coder/fingerprints'
+
+
+@functools.lru_cache(maxsize=None)
+def get_source(function: Callable) -> str:
+    try:
+        return inspect.getsource(function)
+    except (OSError, TypeError):
+        return function.__code__.co_code.hex()
+
+
+def iter_scenario_parts(scenario: Scenario, tester_class: type) -> Iterator[str]:
+    yield scenario.qualname
+    yield repr(scenario.param_values)
+    yield from strip_lines((scenario.method.__doc__ or '').splitlines())
+
+    for step in scenario.steps:
+        if step.doc_scenario is None:
+            yield get_source(getattr(tester_class, step.name))
+        else:
+            yield from iter_scenario_parts(step.doc_scenario, tester_class)
+
+
+def get_fingerprint(item: pytest.Item) -> Optional[str]:
+    """SHA-256 hex digest, or `None` if `item` is not a test scenario"""
+    scenario = scheduling.get_scenario(item)
+
+    if scenario is None or getattr(item, 'cls', None) is None:
+        return None
+
+    digest = hashlib.sha256()
+
+    for part in iter_scenario_parts(scenario, item.cls):
+        digest.update(part.encode())
+        digest.update(b'\0')
+
+    return digest.hexdigest()
+
+
+class AffectedSelector:
+    """
+    Pytest plugin storing in the cache the fingerprints of the test scenarios that
+    pass - those of pytest-xdist workers sent to the controller -, and - with
+    `--bdd-affected` - deselecting those with the same fingerprint
+    """
+    def __init__(self, config):
+        self.config = config
+        self.fingerprints: dict[str, str] = config.cache.get(FINGERPRINTS_KEY, {})
+        self.worker_fingerprints: dict[str, str] = {}
+        self.passed: set[str] = set()
+        self.failed: set[str] = set()
+
+    def is_affected(self, item: pytest.Item) -> bool:
+        fingerprint = get_fingerprint(item)
+
+        return fingerprint is None or self.fingerprints.get(item.nodeid) != fingerprint
+
+    def get_passed_fingerprints(self, items: list[pytest.Item]) -> dict[str, str]:
+        fingerprints = {}
+
+        for item in items:
+            if item.nodeid in self.passed - self.failed:
+                fingerprint = get_fingerprint(item)
+
+                if fingerprint is not None:
+                    fingerprints[item.nodeid] = fingerprint
+
+        return fingerprints
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_collection_modifyitems(self, config, items):
+        if config.getoption('bdd_affected'):
+            scheduling.select(config, items, list(filter(self.is_affected, items)))
+
+    def pytest_runtest_logreport(self, report):
+        if report.failed:
+            self.failed.add(report.nodeid)
+        elif report.when == 'call' and report.passed:
+            self.passed.add(report.nodeid)
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_testnodedown(self, node, error):
+        self.worker_fingerprints.update(json.loads(
+            getattr(node, 'workeroutput', {}).get(FINGERPRINTS_KEY, '{}')))
+
+    def pytest_sessionfinish(self, session):
+        passed = self.get_passed_fingerprints(session.items)
+
+        if hasattr(self.config, 'workerinput'):  # Sent to the controller
+            self.config.workeroutput[FINGERPRINTS_KEY] = json.dumps(passed)
+            return
+
+        for nodeid in self.failed:
+            self.fingerprints.pop(nodeid, None)
+
+        self.fingerprints.update({**self.worker_fingerprints, **passed})
+        self.config.cache.set(FINGERPRINTS_KEY, self.fingerprints)
@@ -0,0 +1,424 @@
+"""
+Shared-prefix execution of test scenarios, with `--bdd-fork` - where `os.fork`
+is available, as on Linux.
+
+The test scenarios of each test class are arranged in a trie by their refined
+steps - step method, inputs, and the parameter values it takes -, until the first
+step taking other fixtures, or a concurrent one. Walking the trie, each step runs
+once, in the process of its node, which forks at branch points, so that children
+continue from its copy-on-write state. Prefix steps are resolved as in test runs
+- cached, shared by scope, profiled -, on behalf of the first test below. The
+parent sets up the module and class of each trie - and the fixtures of wider
+scope than function - beforehand, so that the tests share them, and runs the
+leading steps of wider scope than function all its tests share, so that the next
+tries share them too. Each test then runs in a forked process of its own, where
+its prefix steps replay their results - logged as `(forked)` -, and sends its
+reports and run records to the parent, which logs them and writes the summary.
+
+Setting up scopes apart from their tests, and running the tests with given next
+items, takes pytest internals - the session setup state, item fixture info and
+requests, and `runtestprotocol` -, so pytest is pinned to the tested versions
+"""
+from __future__ import annotations
+
+from collections import defaultdict
+
+import functools
+import itertools
+import json
+import os
+import sys
+import tempfile
+import traceback
+
+from typing import TYPE_CHECKING, Callable, Iterator, Optional
+
+import pytest
+from _pytest.runner import TEST_OUTCOME, runtestprotocol
+
+from bdd_coder.decorators import Gherkin, ScenarioRun
+from bdd_coder.history import RunHistory
+from bdd_coder.lastfailed import get_params
+from bdd_coder.reports import RunsReport
+from bdd_coder import scheduling
+from bdd_coder import stock
+from bdd_coder.text_utils import PENDING, ExcInfo
+
+if TYPE_CHECKING:  # NO COVER
+    from bdd_coder.decorators import Step
+
+
+def iter_prefix_steps(item: pytest.Item) -> Iterator[tuple[Step, dict]]:
+    """
+    Refined steps of the scenario of `item`, with the parameter values they take
+    - until one taking other fixtures, or a concurrent one, to run with its group.
+    None if scenario runs are sampled or profiled as a whole, as the prefix steps
+    would be missing
+    """
+    params, scenario = get_params(item), scheduling.get_scenario(item)
+    profiler = scenario.gherkin.profiler
+
+    if scenario.gherkin.sampler is not None or profiler is not None and profiler.per == 'scenario':
+        return
+
+    for step in scenario.refine()[0]:
+        if step.is_concurrent or not set(step.arg_names) <= set(params):
+            return
+
+        yield step, {name: params[name] for name in step.arg_names}
+
+
+def get_scope(item: pytest.Item, name: str) -> Optional[str]:
+    fixturedefs = item._fixtureinfo.name2fixturedefs.get(name)
+
+    return fixturedefs[-1].scope if fixturedefs else None
+
+
+def iter_function_hooks(item: pytest.Item) -> Iterator[str]:
+    """
+    Autouse fixtures of function scope of `item` - like that of `setup_method` -,
+    but `BddTester.fixture_setup`, which could only run after its prefix steps
+    """
+    requested = set(item._fixtureinfo.argnames) | set(itertools.chain(
+        *(marker.args for marker in item.iter_markers('usefixtures'))))
+
+    for name in item._fixtureinfo.initialnames:
+        if name not in requested and name != 'fixture_setup' and get_scope(item, name) == 'function':
+            yield name
+
+
+class PrefixNode(stock.Repr):
+    """
+    Step run shared by the tests below, with the parameter values it takes - or
+    the root of the trie of a test class
+    """
+    def __init__(self, step: Optional[Step] = None, kwargs: Optional[dict] = None):
+        self.step = step
+        self.kwargs = kwargs or {}
+        self.children: dict[tuple, PrefixNode] = {}
+        self.items: list[pytest.Item] = []
+
+    def __str__(self) -> str:
+        return (f'{"root" if self.step is None else self.step.method_qualname}: '
+                f'{len(self.children)} children, {len(self.items)} items')
+
+    def __iter__(self) -> Iterator[PrefixNode]:
+        yield self
+
+        for child in self.children.values():
+            yield from child
+
+    @staticmethod
+    def make_key(step: Step, kwargs: dict) -> tuple:
+        return (step.method_qualname, tuple(step.inputs),
+                tuple((name, repr(value)) for name, value in kwargs.items()))
+
+    def add(self, item: pytest.Item) -> int:
+        """Adds `item` below its prefix steps, returning their count"""
+        node, count = self, 0
+
+        for step, kwargs in iter_prefix_steps(item):
+            key = self.make_key(step, kwargs)
+
+            if key not in node.children:
+                node.children[key] = PrefixNode(step, kwargs)
+
+            node, count = node.children[key], count + 1
+
+        node.items.append(item)
+
+        return count
+
+    def iter_items(self) -> Iterator[pytest.Item]:
+        for node in self:
+            yield from node.items
+
+    @property
+    def step_count(self) -> int:
+        return sum(1 for node in self if node.step is not None)
+
+
+class ForkRunner:
+    """
+    Pytest plugin running the test scenarios by shared prefixes in forked
+    processes, and then the other tests as usual
+    """
+    def __init__(self, config):
+        self.config = config
+        self.tries: dict[type, PrefixNode] = {}
+        self.step_counts = (0, 0)  # Prefix step runs, shared and not
+        self.messages_path = ''
+        self.read_bytes = 0
+        self.nextitems: dict[pytest.Item, pytest.Item] = {}
+        self.outputs: dict[int, list[dict]] = defaultdict(list)
+        self.reports: dict[str, RunsReport] = {}
+        self.errors: list[str] = []
+
+    def make_tries(self, items: list[pytest.Item]) -> list[pytest.Item]:
+        """Arranges the test scenarios in tries by test class, returning the other items"""
+        other_items, step_count = [], 0
+
+        for item in items:
+            if getattr(item, 'cls', None) is None or scheduling.get_scenario(item) is None:
+                other_items.append(item)
+            else:
+                step_count += self.tries.setdefault(item.cls, PrefixNode()).add(item)
+
+        self.step_counts = (sum(root.step_count for root in self.tries.values()), step_count)
+        hooks = sorted({f'{item.cls.__qualname__}.{name}' for root in self.tries.values()
+                        for item in root.iter_items() for name in iter_function_hooks(item)})
+
+        if hooks:
+            raise pytest.UsageError(
+                '--bdd-fork cannot run the prefix steps of test scenarios after function-scoped '
+                f'autouse fixtures - like setup_method: {", ".join(hooks)}')
+
+        return other_items
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtestloop(self, session):
+        if session.config.option.collectonly:
+            return None
+
+        if session.testsfailed and not session.config.option.continue_on_collection_errors:
+            raise session.Interrupted(f'{session.testsfailed} errors during collection')
+
+        other_items = self.make_tries(session.items)
+        roots = list(self.tries.values())
+        first_items = [next(root.iter_items()) for root in roots]
+        file_descriptor, self.messages_path = tempfile.mkstemp(prefix='bdd-fork-', suffix='.jsonl')
+        os.close(file_descriptor)
+
+        for gherkin in Gherkin.instances:  # Summaries and pending checks are left to `pytest_sessionfinish`
+            gherkin.prefix_results = []
+
+        try:
+            for root, nextitem in zip(roots, [*first_items[1:], *other_items[:1], None]):
+                self.run_trie(root, nextitem)
+        finally:
+            os.remove(self.messages_path)
+
+        for item, nextitem in zip(other_items, [*other_items[1:], None]):
+            item.config.hook.pytest_runtest_protocol(item=item, nextitem=nextitem)
+            self.check_session(session)
+
+        return True
+
+    @staticmethod
+    def check_session(session):
+        if session.shouldfail:
+            raise session.Failed(session.shouldfail)
+        if session.shouldstop:
+            raise session.Interrupted(session.shouldstop)
+
+    def run_trie(self, root: PrefixNode, nextitem: Optional[pytest.Item]):
+        """
+        Walks the trie of a test class, after setting up its module and class, which
+        its forked tests share - tearing them down before `nextitem`, if not its own
+        """
+        items = list(root.iter_items())
+        self.nextitems = dict(zip(items, [*items[1:], items[0]]))  # Within the class
+        tester = items[0].cls()
+        tester.gherkin.reset_outputs()
+
+        if self.setup_scopes(items[0]):
+            results: list = []
+            tasks = self.iter_tasks(self.run_scoped_steps(root, tester, results), tester, results)
+        else:  # Each test reports the setup error
+            tasks = (([item], functools.partial(self.run_item, item, tester, [])) for item in items)
+
+        for task_items, task in tasks:
+            self.receive(task_items, self.fork(task))
+            self.check_session(items[0].session)
+
+        try:
+            items[0].session._setupstate.teardown_exact(nextitem)
+        except TEST_OUTCOME:
+            self.log_reports(items[-1], [pytest.TestReport(
+                items[-1].nodeid, items[-1].location, {}, 'failed', traceback.format_exc(), 'teardown')])
+
+    @staticmethod
+    def setup_scopes(item: pytest.Item) -> bool:
+        """
+        Sets up the module, class... of `item`, and its fixtures of wider scope than
+        function - as those of `setup_class` -, returning whether all succeeded
+        """
+        setup_state = item.session._setupstate
+
+        try:
+            setup_state.setup(item.parent)
+            setup_state.stack[item] = ([], None)  # Active for its fixture requests, not set up
+
+            for name in item.fixturenames:
+                if get_scope(item, name) not in (None, 'function'):
+                    item._request.getfixturevalue(name)
+        except TEST_OUTCOME:
+            return False
+        finally:
+            setup_state.stack.pop(item, None)
+
+        return True
+
+    def run_scoped_steps(self, root: PrefixNode, tester, results: list) -> PrefixNode:
+        """
+        Runs the leading steps all tests share, of wider scope than function, in this
+        process - so that the next tries share them too -, returning the last node run
+        """
+        node = root
+
+        while not node.items and len(node.children) == 1:
+            child = next(iter(node.children.values()))
+
+            if child.step.scope == 'function':
+                break
+
+            self.run_step(child, tester, results)
+            node = child
+
+        return node
+
+    def iter_tasks(self, node: PrefixNode, tester, results: list
+                   ) -> Iterator[tuple[list[pytest.Item], Callable[[], Optional[int]]]]:
+        """Tests and branches to run from the state of `node`, with the items they run"""
+        for item in node.items:
+            yield [item], functools.partial(self.run_item, item, tester, results)
+
+        for child in node.children.values():
+            yield list(child.iter_items()), functools.partial(self.run_node, child, tester, results)
+
+    def run_node(self, node: PrefixNode, tester, results: list) -> Optional[int]:
+        """
+        Runs the step of `node`, then what follows - forking, if it is a branch point -,
+        returning the first failing exit code of the forked processes
+        """
+        self.run_step(node, tester, results)
+        tasks = [task for _, task in self.iter_tasks(node, tester, results)]
+
+        if len(tasks) == 1:
+            return tasks[0]()
+
+        exit_codes = [self.fork(task) for task in tasks]
+
+        return next((code if code > 0 else 128 - code for code in exit_codes if code), 0)
+
+    @staticmethod
+    def run_step(node: PrefixNode, tester, results: list):
+        """
+        Appends the result of the step of `node` to `results` - unless a previous one failed -,
+        resolved in a run of the first test below, not logged
+        """
+        if results and isinstance(results[-1], ExcInfo):
+            return
+
+        item = next(node.iter_items())
+        scenario_run = ScenarioRun(item.name, scheduling.get_scenario(item), node_id=item.nodeid)
+        step_run = list(scenario_run.iter_step_runs())[len(results)]
+        node.step.resolve(step_run, tester, **node.kwargs)
+
+        if isinstance(step_run.result, tuple):
+            for name, value in zip(node.step.output_names, step_run.result):
+                node.step.gherkin.outputs[name].append(value)
+
+        results.append(step_run.result)
+
+    def run_item(self, item: pytest.Item, tester, results: list):
+        gherkin = scheduling.get_scenario(item).gherkin
+        gherkin.prefix_results, gherkin.prefix_state = list(results), dict(vars(tester))
+        reports = runtestprotocol(item, log=False, nextitem=self.nextitems[item])
+
+        with open(self.messages_path, 'a') as messages_file:
+            messages_file.write(json.dumps({
+                'nodeid': item.nodeid, 'gherkin': Gherkin.instances.index(gherkin),
+                'fail_if_pending': gherkin.fail_if_pending, 'records': gherkin.get_records(),
+                'reports': [self.config.hook.pytest_report_to_serializable(
+                    config=self.config, report=report) for report in reports]}) + '\n')
+
+    @staticmethod
+    def fork(function: Callable[[], Optional[int]]) -> int:
+        """Runs `function` in a forked process - exiting with its return code -, returning the exit code"""
+        pid = os.fork()
+
+        if pid == 0:  # NO COVER
+            exit_code = 0
+
+            try:
+                exit_code = function() or 0
+            except BaseException:
+                traceback.print_exc()
+                exit_code = 1
+            finally:
+                sys.stdout.flush()
+                sys.stderr.flush()
+                os._exit(exit_code)
+
+        return os.waitstatus_to_exitcode(os.waitpid(pid, 0)[1])
+
+    def receive(self, items: list[pytest.Item], exit_code: int):
+        """Logs the reports sent for `items` - and a failure for those without, as crashed"""
+        with open(self.messages_path, 'rb') as messages_file:
+            messages_file.seek(self.read_bytes)
+            data = messages_file.read()
+            self.read_bytes += len(data)
+
+        items_by_id = {item.nodeid: item for item in items}
+
+        for message in map(json.loads, data.decode().splitlines()):
+            self.outputs[message['gherkin']].append(message)
+            self.log_reports(items_by_id.pop(message['nodeid']), [
+                self.config.hook.pytest_report_from_serializable(config=self.config, data=data)
+                for data in message['reports']])
+
+        for item in items_by_id.values():
+            self.log_reports(item, [pytest.TestReport(
+                item.nodeid, item.location, {}, 'failed',
+                f'Forked process exited with code {exit_code}', 'call')])
+
+    @staticmethod
+    def log_reports(item: pytest.Item, reports: list):
+        item.ihook.pytest_runtest_logstart(nodeid=item.nodeid, location=item.location)
+
+        for report in reports:
+            item.ihook.pytest_runtest_logreport(report=report)
+
+        item.ihook.pytest_runtest_logfinish(nodeid=item.nodeid, location=item.location)
+
+    def pytest_sessionfinish(self, session):
+        for index, gherkin in enumerate(Gherkin.instances):
+            messages = self.outputs[index]
+            records = [*itertools.chain(*(m['records'] for m in messages)), *gherkin.get_records()]
+
+            if not records:
+                continue
+
+            report = self.reports[gherkin.logs_path] = RunsReport(records)
+
+            for message in report.get_summary_messages():
+                gherkin.log_message(message, extra={'summary': True})
+
+            if gherkin.history_path:
+                RunHistory(gherkin.history_path).record(report.records)
+
+            pending_names = report.get_names(PENDING)
+
+            if pending_names and (gherkin.fail_if_pending or any(m['fail_if_pending'] for m in messages)):
+                self.errors.append(f'These scenarios did not run: {", ".join(pending_names)}')
+
+        if self.reports:
+            scheduling.update_durations(getattr(session.config, 'cache', None), self.reports.values(),
+                                        session.config.getoption('bdd_durations'))
+
+        if self.errors:
+            session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.tries:
+            return
+
+        terminalreporter.section('bdd-coder')
+        terminalreporter.line('{} prefix step runs, instead of {}'.format(*self.step_counts))
+
+        for logs_path, report in self.reports.items():
+            terminalreporter.line(f'{logs_path}:{report.counts_text}')
+
+        for error in self.errors:
+            terminalreporter.line(error, red=True)
@@ -0,0 +1,160 @@
+"""Local SQLite store of scenario and step run outcomes and durations, across sessions"""
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import sqlite3
+import subprocess
+import time
+
+from typing import Iterable, Iterator
+
+from bdd_coder.exporters import OUTCOMES
+from bdd_coder import stock
+from bdd_coder.text_utils import Style, indent
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY, commit_id TEXT NOT NULL, worker TEXT NOT NULL, created REAL NOT NULL);
+CREATE TABLE IF NOT EXISTS runs (
+    session_id INTEGER NOT NULL REFERENCES sessions (id), kind TEXT NOT NULL,
+    qualname TEXT NOT NULL, test_id TEXT NOT NULL, params TEXT NOT NULL,
+    outcome TEXT NOT NULL, duration REAL);
+CREATE INDEX IF NOT EXISTS runs_by_key ON runs (qualname, params);
+"""
+
+
+def get_commit_id() -> str:
+    """`BDD_COMMIT_ID`, or the git HEAD commit, or an empty string"""
+    if 'BDD_COMMIT_ID' in os.environ:
+        return os.environ['BDD_COMMIT_ID']
+
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], stdout=subprocess.PIPE,
+                              stderr=subprocess.DEVNULL, check=True).stdout.decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ''
+
+
+class RunHistory(stock.Repr):
+    """
+    Stores the runs of each session - test scenarios, doc scenarios and steps -,
+    keyed by qualname and parameters, with the commit id, and answers queries on them
+    """
+    env_var = 'BDD_HISTORY'
+    default_path = '.bdd-history.sqlite3'
+
+    @classmethod
+    def path_from_env(cls) -> str:
+        """The `BDD_HISTORY` path - 1 for the default one -, or an empty string"""
+        value = os.environ.get(cls.env_var, '')
+
+        if value.lower() in {'', '0', 'false', 'no'}:
+            return ''
+
+        return cls.default_path if value == '1' else value
+
+    def __init__(self, path: str = default_path):
+        self.path = path
+
+        with self.connect() as connection:
+            connection.executescript(SCHEMA)
+
+    def __str__(self) -> str:
+        return self.path
+
+    @contextlib.contextmanager
+    def connect(self) -> Iterator[sqlite3.Connection]:
+        connection = sqlite3.connect(self.path, timeout=30)
+
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    def record(self, records: Iterable[dict], commit_id: str = ''):
+        """Stores a session with the test scenario run `records` - see `ScenarioRun.to_record`"""
+        with self.connect() as connection:
+            session_id = connection.execute(
+                'INSERT INTO sessions (commit_id, worker, created) VALUES (?, ?, ?)',
+                (commit_id or get_commit_id(), stock.worker_id(), time.time())).lastrowid
+            connection.executemany(
+                'INSERT INTO runs (session_id, kind, qualname, test_id, params, outcome, duration) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)', [(session_id, *row) for row in self.iter_rows(records)])
+
+    def iter_rows(self, records: Iterable[dict], kind: str = 'test') -> Iterator[tuple]:
+        for record in records:
+            yield (kind if 'runs' in record else 'step', record['qualname'],
+                   record.get('test_id', ''), json.dumps(record['kwargs'], sort_keys=True),
+                   OUTCOMES[record['symbol']], record['duration'])
+
+            yield from self.iter_rows(record.get('runs', []), kind='scenario')
+
+    def query(self, sql: str, *params) -> list[tuple]:
+        with self.connect() as connection:
+            return connection.execute(sql, params).fetchall()
+
+    def get_slowest(self, kinds: tuple[str, ...], limit: int = 10) -> list[tuple[str, int, float, float]]:
+        """(qualname, run count, mean duration, max duration) rows, by decreasing mean"""
+        return self.query(
+            'SELECT qualname, COUNT(*), AVG(duration), MAX(duration) FROM runs '
+            f'WHERE duration IS NOT NULL AND kind IN ({", ".join("?"*len(kinds))}) '
+            'GROUP BY qualname ORDER BY AVG(duration) DESC LIMIT ?', *kinds, limit)
+
+    def get_slowest_scenarios(self, limit: int = 10) -> list[tuple[str, int, float, float]]:
+        return self.get_slowest(('test', 'scenario'), limit)
+
+    def get_slowest_steps(self, limit: int = 10) -> list[tuple[str, int, float, float]]:
+        return self.get_slowest(('step',), limit)
+
+    def get_trends(self, limit: int = 10) -> dict[str, list[tuple[str, float]]]:
+        """
+        Mean test scenario durations by commit, in order of first run, for the
+        `limit` scenarios with the largest change between their first and last commits
+        """
+        trends: dict[str, list[tuple[str, float]]] = {}
+
+        for qualname, commit_id, mean in self.query(
+                'SELECT qualname, commit_id, AVG(duration) FROM runs '
+                'JOIN sessions ON sessions.id = runs.session_id '
+                "WHERE kind = 'test' AND duration IS NOT NULL "
+                'GROUP BY qualname, commit_id ORDER BY qualname, MIN(created)'):
+            trends.setdefault(qualname, []).append((commit_id, mean))
+
+        return dict(sorted(filter(lambda it: len(it[1]) > 1, trends.items()),
+                           key=lambda it: abs(it[1][-1][1] - it[1][0][1]), reverse=True)[:limit])
+
+    def get_flaky(self, limit: int = 10) -> list[tuple[str, str, int, int]]:
+        """
+        (qualname, parameters, pass/fail flips, run count) rows of the test
+        scenarios with flips across sessions, the flakiest first
+        """
+        return self.query(
+            'SELECT qualname, params, SUM(outcome != previous) AS flips, COUNT(*) AS count FROM ('
+            '  SELECT qualname, params, outcome, LAG(outcome) OVER ('
+            '    PARTITION BY qualname, params ORDER BY session_id) AS previous FROM runs'
+            "  WHERE kind = 'test' AND outcome != 'pending') "
+            'GROUP BY qualname, params HAVING flips > 0 ORDER BY flips DESC, count DESC LIMIT ?',
+            limit)
+
+    def get_report_messages(self, limit: int = 10) -> list[str]:
+        messages = []
+
+        for title, rows in (('Slowest scenarios:', self.get_slowest_scenarios(limit)),
+                            ('Slowest steps:', self.get_slowest_steps(limit))):
+            messages.extend(['  ' + Style.bold(title), indent(
+                f'{"count":>6} {"mean ms":>10} {"max ms":>10}  qualname')] + [
+                indent(f'{count:>6} {mean*1000:>10.3f} {top*1000:>10.3f}  {qualname}')
+                for qualname, count, mean, top in rows])
+
+        messages.append('  ' + Style.bold('Duration trends:'))
+        messages.extend(indent(f'{qualname}: ' + ' → '.join(
+            f'{commit_id[:7] or "?"} {mean*1000:.3f} ms' for commit_id, mean in means))
+            for qualname, means in self.get_trends(limit).items())
+        messages.append('  ' + Style.bold('Flaky scenarios:'))
+        messages.extend(indent(f'{flips} flips in {count} runs  {qualname} {params}')
+                        for qualname, params, flips, count in self.get_flaky(limit))
+
+        return messages
@@ -0,0 +1,124 @@
+"""
+Failed cases - (scenario qualname, parameters) pairs - of test and doc scenarios,
+kept across sessions, independently of node ids and generated fixture names
+"""
+from __future__ import annotations
+
+import json
+
+from typing import TYPE_CHECKING, Iterator, Optional
+
+import pytest
+
+from bdd_coder import scheduling
+from bdd_coder.text_utils import OK, FAIL
+
+if TYPE_CHECKING:  # NO COVER
+    from bdd_coder.decorators import Scenario, ScenarioRun
+
+LAST_FAILED_KEY = 'bdd_coder/lastfailed'
+
+
+def case_key(scenario: Scenario, params: dict) -> str:
+    """JSON of the scenario qualname, and the reprs of its refined parameter values"""
+    return json.dumps([scenario.qualname, {name: repr(params[name])
+                                           for name in scenario.refined_param_names if name in params}],
+                      sort_keys=True)
+
+
+def iter_doc_scenarios(scenario: Scenario) -> Iterator[Scenario]:
+    for step in scenario.steps:
+        if step.doc_scenario is not None:
+            yield step.doc_scenario
+            yield from iter_doc_scenarios(step.doc_scenario)
+
+
+def get_params(item: pytest.Item) -> dict:
+    return getattr(getattr(item, 'callspec', None), 'params', {})
+
+
+def iter_item_cases(item: pytest.Item) -> Iterator[str]:
+    """Cases of the test scenario of `item`, and of the doc scenarios it reaches"""
+    scenario = scheduling.get_scenario(item)
+
+    if scenario is None:
+        return
+
+    yield case_key(scenario, get_params(item))
+
+    for doc_scenario in iter_doc_scenarios(scenario):
+        yield case_key(doc_scenario, get_params(item))
+
+
+def iter_run_cases(item: pytest.Item) -> Iterator[tuple[str, str]]:
+    """
+    (case, symbol) pairs of the finished runs - test and doc scenario ones - of
+    `item`, with the parameters of the item, as the steps after a failure do not run
+    """
+    scenario = scheduling.get_scenario(item)
+    test_run: Optional[ScenarioRun] = None if scenario is None else (
+        scenario.gherkin.test_runs.get(item.nodeid))
+
+    if test_run is None or test_run.scenario is not scenario:
+        return
+
+    for run in test_run:
+        if run.symbol in (OK, FAIL):
+            yield case_key(run.scenario, get_params(item)), run.symbol
+
+
+class LastFailedSelector:
+    """
+    Pytest plugin storing in the cache the failed cases at session end - those of
+    pytest-xdist workers sent to the controller -, and - with `--bdd-last-failed` -
+    selecting the test scenarios with some failed case, if any. Then the cases of
+    collected scenarios that no collected test reaches are dropped
+    """
+    def __init__(self, config):
+        self.config = config
+        self.failed: set[str] = set(config.cache.get(LAST_FAILED_KEY, []))
+        self.collected: set[str] = set()
+        self.worker_cases: dict[str, set[str]] = {OK: set(), FAIL: set()}
+
+    def is_failed(self, item: pytest.Item) -> bool:
+        return any(case in self.failed for case in iter_item_cases(item))
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_collection_modifyitems(self, config, items):
+        if not config.getoption('bdd_last_failed'):
+            return
+
+        self.collected = {case for item in items for case in iter_item_cases(item)}
+
+        if self.failed:
+            scheduling.select(config, items, list(filter(self.is_failed, items)))
+
+    def get_stale(self) -> set[str]:
+        """Failed cases of collected scenarios that no collected test reaches anymore"""
+        qualnames = {json.loads(case)[0] for case in self.collected}
+
+        return {case for case in self.failed - self.collected if json.loads(case)[0] in qualnames}
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_testnodedown(self, node, error):
+        output = json.loads(getattr(node, 'workeroutput', {}).get(LAST_FAILED_KEY, '{}'))
+        self.collected.update(output.get('collected', []))
+
+        for symbol, cases in self.worker_cases.items():
+            cases.update(output.get(symbol, []))
+
+    def pytest_sessionfinish(self, session):
+        cases: dict[str, set[str]] = {OK: set(), FAIL: set()}
+
+        for item in session.items:
+            for case, symbol in iter_run_cases(item):
+                cases[symbol].add(case)
+
+        if hasattr(self.config, 'workerinput'):  # Sent to the controller
+            self.config.workeroutput[LAST_FAILED_KEY] = json.dumps({
+                'collected': sorted(self.collected), **{s: sorted(c) for s, c in cases.items()}})
+            return
+
+        passed, failed = cases[OK] | self.worker_cases[OK], cases[FAIL] | self.worker_cases[FAIL]
+        self.failed = self.failed - passed - self.get_stale() | failed
+        self.config.cache.set(LAST_FAILED_KEY, sorted(self.failed))
@@ -0,0 +1,128 @@
+"""Memory growth tracking of test scenario runs"""
+from __future__ import annotations
+
+import gc
+import os
+import tracemalloc
+
+from typing import TYPE_CHECKING, Any, Optional
+
+from bdd_coder import stock
+
+if TYPE_CHECKING:  # NO COVER
+    from bdd_coder.decorators import ScenarioRun
+
+
+def format_amount(amount: int, unit: str) -> str:
+    if unit != 'B':
+        return f'{amount:+d} {unit}'
+
+    value = float(amount)
+
+    for prefix in ('', 'Ki', 'Mi', 'Gi'):
+        if abs(value) < 1024 or prefix == 'Gi':
+            break
+
+        value /= 1024
+
+    return f'{value:+.1f} {prefix}B'
+
+
+class MemoryGrowth(stock.Repr):
+    def __init__(self, delta: int, unit: str, sites: list[tuple[str, int]]):
+        self.delta = delta
+        self.unit = unit
+        self.sites = sites
+
+    def __str__(self) -> str:
+        return ', '.join([format_amount(self.delta, self.unit)] + [
+            f'{site} {format_amount(size, self.unit)}' for site, size in self.sites])
+
+
+class MemoryTracker(stock.Repr):
+    """
+    Measures memory at test scenario run start and end, with one of the `modes`:
+    `tracemalloc` snapshots - traced bytes, with the top allocation sites -,
+    or the `gc` tracked live object count, or the process `rss` in bytes. The `gc`
+    mode runs a full collection before each count - two per scenario run -, so it
+    spares the `tracemalloc` overhead on every allocation, but takes longer on
+    large heaps. If `budget` - in the mode's unit - is set, scenarios growing
+    beyond it fail
+    """
+    modes = {'tracemalloc': 'B', 'gc': 'objects', 'rss': 'B'}
+    ignored_files = (tracemalloc.__file__, '<frozen importlib._bootstrap>',
+                     '<frozen importlib._bootstrap_external>', '<unknown>')
+
+    def __init__(self, mode: str = 'tracemalloc', top_sites: int = 3,
+                 budget: Optional[int] = None, frames: int = 1):
+        if mode not in self.modes:
+            raise ValueError(f'mode should be one of {tuple(self.modes)}, got {mode!r}')
+
+        self.mode = mode
+        self.top_sites = top_sites
+        self.budget = budget
+        self.frames = frames
+        self.starts: dict[int, Any] = {}
+
+    def __str__(self) -> str:
+        budget = f' budget={format_amount(self.budget, self.unit)}' if self.budget else ''
+
+        return f'{self.mode} top_sites={self.top_sites}{budget}'
+
+    @property
+    def unit(self) -> str:
+        return self.modes[self.mode]
+
+    def start(self, scenario_run: ScenarioRun):
+        if self.mode == 'tracemalloc' and not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+
+        self.starts[id(scenario_run)] = self.measure()
+
+    def finish(self, scenario_run: ScenarioRun):
+        start = self.starts.pop(id(scenario_run), None)
+
+        if start is None:
+            return
+
+        end = self.measure()
+
+        if self.mode == 'tracemalloc':
+            stats = end.filter_traces(self.snapshot_filters).compare_to(
+                start.filter_traces(self.snapshot_filters), 'lineno')
+            scenario_run.memory_growth = MemoryGrowth(
+                sum(stat.size_diff for stat in stats), self.unit,
+                [(str(stat.traceback[0]), stat.size_diff) for stat in sorted(
+                    filter(lambda s: s.size_diff > 0, stats),
+                    key=lambda s: s.size_diff, reverse=True)[:self.top_sites]])
+        else:
+            scenario_run.memory_growth = MemoryGrowth(end - start, self.unit, [])
+
+    @property
+    def snapshot_filters(self) -> list[tracemalloc.Filter]:
+        return [tracemalloc.Filter(False, name) for name in self.ignored_files]
+
+    def measure(self) -> Any:
+        if self.mode == 'tracemalloc':
+            return tracemalloc.take_snapshot()
+
+        if self.mode == 'gc':  # Live objects only, not garbage pending collection
+            gc.collect()
+
+            return len(gc.get_objects())
+
+        return self.get_rss()
+
+    @staticmethod
+    def get_rss() -> int:
+        try:
+            with open('/proc/self/statm') as statm:
+                return int(statm.read().split()[1])*os.sysconf('SC_PAGE_SIZE')
+        except OSError:  # NO COVER: not Linux, take peak RSS
+            import resource
+
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss*1024
+
+    def exceeds_budget(self, scenario_run: ScenarioRun) -> bool:
+        return (self.budget is not None and scenario_run.memory_growth is not None
+                and scenario_run.memory_growth.delta > self.budget)
@@ -0,0 +1,218 @@
+"""
+Parameter strategies and sources, to be given to `Gherkin.__call__` instead of
+parameter rows.
+
+Strategies combine the value domains of the scenario parameters - and the refined
+rows of each of its doc scenarios, as one more factor - into the scenario rows.
+
+Sources read the rows from a file, lazily, one at a time on each iteration
+"""
+from __future__ import annotations
+
+import abc
+import ast
+import collections.abc
+import csv
+import itertools
+import json
+import math
+import os
+import random
+
+from typing import Any, Callable, Iterable, Iterator, Union
+
+import pytest
+
+from bdd_coder import exceptions
+from bdd_coder import stock
+
+Factor = tuple[tuple[str, ...], list[tuple]]  # Parameter names, and their value tuples
+
+
+class ParamStrategy(stock.Repr, metaclass=abc.ABCMeta):
+    def __init__(self, **domains: Iterable):
+        self.domains = {name: list(values) for name, values in domains.items()}
+
+    def __str__(self) -> str:
+        return ', '.join(f'{name}={values!r}' for name, values in self.domains.items())
+
+    def get_factors(self, param_names: list[str]) -> list[Factor]:
+        return [((name,), [(value,) for value in self.domains[name]]) for name in param_names]
+
+    def make_rows(self, factors: list[Factor]) -> list[list]:
+        """Rows of parameter values, from the value tuples chosen for `factors`"""
+        return [list(itertools.chain(*(values[i] for (_, values), i in zip(factors, indices))))
+                for indices in self.iter_indices([len(values) for _, values in factors])]
+
+    @abc.abstractmethod
+    def iter_indices(self, sizes: list[int]) -> Iterator[tuple[int, ...]]:
+        """Yield the value index combinations to take, for factors with `sizes` values"""
+
+
+class Cartesian(ParamStrategy):
+    """All combinations"""
+    def iter_indices(self, sizes: list[int]) -> Iterator[tuple[int, ...]]:
+        yield from itertools.product(*map(range, sizes))
+
+
+class Pairwise(ParamStrategy):
+    """
+    Combinations covering every pair of values of any two factors, greedily and
+    deterministically: each new row starts from the first uncovered pair, and
+    takes the values covering the most uncovered pairs - the first one on ties
+    """
+    @staticmethod
+    def pair(i: int, a: int, j: int, b: int) -> tuple[int, int, int, int]:
+        return (i, a, j, b) if i < j else (j, b, i, a)
+
+    def iter_indices(self, sizes: list[int]) -> Iterator[tuple[int, ...]]:
+        if len(sizes) < 2:
+            yield from itertools.product(*map(range, sizes))
+            return
+
+        uncovered = {(i, a, j, b) for i, j in itertools.combinations(range(len(sizes)), 2)
+                     for a in range(sizes[i]) for b in range(sizes[j])}
+
+        while uncovered:
+            i, a, j, b = min(uncovered)
+            row = {i: a, j: b}
+
+            for k in filter(lambda k: k not in row, range(len(sizes))):
+                row[k] = max(range(sizes[k]), key=lambda c: (sum(
+                    self.pair(k, c, m, v) in uncovered for m, v in row.items()), -c))
+
+            indices = tuple(row[k] for k in range(len(sizes)))
+            uncovered -= {(i, indices[i], j, indices[j])
+                          for i, j in itertools.combinations(range(len(sizes)), 2)}
+
+            yield indices
+
+
+class RandomSample(ParamStrategy):
+    """`k` distinct combinations, sampled with `seed` - all of them, if not more than `k`"""
+    def __init__(self, k: int, seed: int = 0, **domains: Iterable):
+        super().__init__(**domains)
+        self.k, self.seed = k, seed
+
+    def __str__(self) -> str:
+        return f'k={self.k}, seed={self.seed}, {super().__str__()}'
+
+    def iter_indices(self, sizes: list[int]) -> Iterator[tuple[int, ...]]:
+        total = math.prod(sizes)
+
+        for number in sorted(random.Random(self.seed).sample(range(total), min(self.k, total))):
+            indices = []
+
+            for size in reversed(sizes):
+                number, index = divmod(number, size)
+                indices.append(index)
+
+            yield tuple(reversed(indices))
+
+
+class Rows(stock.Repr, collections.abc.Collection):
+    """
+    Parameter rows, made again on each iteration instead of kept in memory - also
+    to get their count, or check membership
+    """
+    def __init__(self, make_rows: Callable[[], Iterator[Any]], name: str):
+        self.make_rows, self.name = make_rows, name
+
+    def __str__(self) -> str:
+        return self.name
+
+    def __iter__(self) -> Iterator[Any]:
+        return self.make_rows()
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __contains__(self, row: object) -> bool:
+        return any(r == row for r in self)
+
+    def iter_params(self) -> Iterator[Any]:
+        """Pytest parameter sets with compact ids, like `boards-0`"""
+        for index, row in enumerate(self):
+            yield pytest.param(*row, id=f'{self.name}-{index}')
+
+
+def zip_rows(rows: Iterable[list], other_rows: Iterable[list]) -> Union[Rows, tuple]:
+    """Rows joined pairwise - lazily, if either are `Rows`"""
+    if isinstance(rows, Rows) or isinstance(other_rows, Rows):
+        return Rows(lambda: (r1 + r2 for r1, r2 in zip(rows, other_rows)), next(
+            r.name for r in (rows, other_rows) if isinstance(r, Rows)))
+
+    return tuple(r1 + r2 for r1, r2 in zip(rows, other_rows))
+
+
+def literal(value: str) -> Any:
+    """The Python literal in `value`, or `value` itself"""
+    try:
+        return ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        return value
+
+
+class ParamSource(stock.Repr, metaclass=abc.ABCMeta):
+    """
+    Parameter rows from a file of records by parameter name - the path being
+    relative to the test module directory, unless absolute
+    """
+    suffixes: tuple[str, ...] = ()
+
+    @staticmethod
+    def from_path(path: str) -> ParamSource:
+        for source_class in ParamSource.__subclasses__():
+            if path.endswith(source_class.suffixes):
+                return source_class(path)
+
+        raise exceptions.ParamSourceError(path=path, error='unknown file type')
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def __str__(self) -> str:
+        return self.path
+
+    @property
+    def name(self) -> str:
+        return os.path.splitext(os.path.basename(self.path))[0]
+
+    def get_rows(self, param_names: list[str], base_dir: str = '') -> Rows:
+        path = os.path.join(base_dir, self.path)
+
+        return Rows(lambda: self.iter_rows(path, param_names), self.name)
+
+    def iter_rows(self, path: str, param_names: list[str]) -> Iterator[list]:
+        for number, record in enumerate(self.iter_records(path), 1):
+            missing = [name for name in param_names if name not in record]
+
+            if missing:
+                raise exceptions.ParamSourceError(
+                    path=path, error=f'record {number} lacks {", ".join(missing)}')
+
+            yield [record[name] for name in param_names]
+
+    @abc.abstractmethod
+    def iter_records(self, path: str) -> Iterator[dict]:
+        """Yield the records in file `path`, one at a time"""
+
+
+class CsvSource(ParamSource):
+    """CSV file with a header row, and Python literals - or strings - as values"""
+    suffixes = ('.csv',)
+
+    def iter_records(self, path: str) -> Iterator[dict]:
+        with open(path, newline='') as csv_file:
+            for record in csv.DictReader(csv_file):
+                yield {name: literal(value) for name, value in record.items()}
+
+
+class JsonLinesSource(ParamSource):
+    """JSON-lines file of objects"""
+    suffixes = ('.jsonl', '.ndjson')
+
+    def iter_records(self, path: str) -> Iterator[dict]:
+        with open(path) as jsonl_file:
+            for line in filter(str.strip, jsonl_file):
+                yield json.loads(line)
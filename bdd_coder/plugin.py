@@ -0,0 +1,198 @@
+"""
+Pytest plugin, registered through the `pytest11` entry point.
+
+At session end, the test scenario runs are stored in the run history of their
+`Gherkin` - if it has a `history_path` -, and the test scenario durations are
+recorded in the pytest cache - and in the `--bdd-durations` file -, for scheduling
+- see `bdd_coder.scheduling` -, as with `--bdd-shard`, and so are
+the fingerprints of the test scenarios that passed, for `--bdd-affected`, and
+the failed cases of test and doc scenarios, for `--bdd-last-failed`.
+With `--bdd-cache-clear`, the step caches are cleared before running, and with
+`--bdd-fork` the test scenarios run by shared step prefixes, see `bdd_coder.forking`.
+With `--bdd-dedupe-tests`, inherited test scenarios run once, see `bdd_coder.dedupe`.
+
+Under pytest-xdist, workers log to their own files and send their scenario run
+records to the controller, which moves the worker logs into the merged run logs
+with one final summary, and evaluates `fail_if_pending` across all workers
+"""
+from __future__ import annotations
+
+from collections import defaultdict
+
+import itertools
+import json
+import os
+
+import pytest
+
+from bdd_coder.cache import StepCache
+from bdd_coder.decorators import Gherkin
+from bdd_coder.dedupe import InheritedTestsSelector
+from bdd_coder.exporters import merge_chrome_traces
+from bdd_coder.fingerprints import AffectedSelector
+from bdd_coder.forking import ForkRunner
+from bdd_coder.history import RunHistory
+from bdd_coder.lastfailed import LastFailedSelector
+from bdd_coder.reports import RunsReport
+from bdd_coder import scheduling
+from bdd_coder import stock
+from bdd_coder.text_utils import PENDING
+
+WORKER_OUTPUT_KEY = 'bdd_coder'
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('bdd_coder', 'bdd-coder')
+    group.addoption('--bdd-shard', metavar='i/n', type=scheduling.parse_shard,
+                    help='Run the i-th of n shards of balanced cost, by the --bdd-durations file')
+    group.addoption('--bdd-durations', metavar='PATH', default='',
+                    help='JSON file of test scenario durations, read for scheduling and updated at '
+                    'session end - to share across CI nodes')
+    group.addoption('--bdd-longest-first', action='store_true',
+                    help='Run the most expensive tests first')
+    group.addoption('--bdd-affected', action='store_true',
+                    help='Run only the test scenarios changed since they last passed')
+    group.addoption('--bdd-last-failed', action='store_true',
+                    help='Run only the test scenarios with failed cases - by qualname and '
+                    'parameters -, if any')
+    group.addoption('--bdd-cache-clear', action='store_true',
+                    help='Remove the cached results of cacheable steps before running')
+    group.addoption('--bdd-dedupe-tests', action='store_true',
+                    help='Run each test scenario inherited by test classes once, in the defining '
+                    'class - or else in the first one collected')
+    group.addoption('--bdd-fork', action='store_true',
+                    help='Run each shared prefix of test scenario steps once, forking at branch '
+                    'points - where os.fork is available')
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_configure(config):
+    config.pluginmanager.register(InheritedTestsSelector(config), 'bdd_coder_inherited_tests_selector')
+
+    if hasattr(config, 'cache'):
+        config.pluginmanager.register(AffectedSelector(config), 'bdd_coder_affected_selector')
+        config.pluginmanager.register(LastFailedSelector(config), 'bdd_coder_last_failed_selector')
+
+    if hasattr(config, 'workerinput'):
+        config.pluginmanager.register(XdistWorker(config), 'bdd_coder_xdist_worker')
+    else:
+        if config.getoption('bdd_cache_clear'):
+            StepCache.from_env().clear()
+
+        if config.pluginmanager.hasplugin('dsession'):
+            config.pluginmanager.register(XdistController(), 'bdd_coder_xdist_controller')
+        elif config.getoption('bdd_fork'):
+            if not hasattr(os, 'fork'):
+                raise pytest.UsageError('--bdd-fork requires os.fork')
+
+            config.pluginmanager.register(ForkRunner(config), 'bdd_coder_fork_runner')
+
+
+def pytest_collection_finish(session):
+    """Clears the step caches of other directories, given to `Gherkin` - if not under pytest-xdist"""
+    if session.config.getoption('bdd_cache_clear') and not hasattr(session.config, 'workerinput'):
+        for path in {gherkin.step_cache.path for gherkin in Gherkin.instances}:
+            StepCache(path).clear()
+
+
+def pytest_collection_modifyitems(config, items):
+    shard, longest_first = config.getoption('bdd_shard'), config.getoption('bdd_longest_first')
+
+    if shard is None and not longest_first:
+        return
+
+    index, count = shard or (1, 1)
+    # Shards never read the pytest cache, as it is not the same in all nodes
+    cache = None if shard else getattr(config, 'cache', None)
+    estimator = scheduling.CostEstimator(
+        scheduling.load_durations(cache, config.getoption('bdd_durations')))
+    scheduling.select(config, items, estimator.shard(items, count, longest_first)[index - 1])
+
+
+def pytest_sessionfinish(session):
+    for gherkin in Gherkin.instances:
+        gherkin.close_event_loops()
+
+    reports = [gherkin.get_report() for gherkin in Gherkin.instances if gherkin.test_runs]
+
+    for gherkin in Gherkin.instances:  # Once per session - with --bdd-fork, by `ForkRunner`
+        if gherkin.history_path and gherkin.test_runs and gherkin.prefix_results is None:
+            RunHistory(gherkin.history_path).record(gherkin.get_records())
+
+    if reports and not hasattr(session.config, 'workerinput'):
+        scheduling.update_durations(getattr(session.config, 'cache', None), reports,
+                                    session.config.getoption('bdd_durations'))
+
+
+class XdistWorker:
+    def __init__(self, config):
+        self.config = config
+
+    def pytest_sessionfinish(self):
+        self.config.workeroutput[WORKER_OUTPUT_KEY] = json.dumps([{
+            'worker': stock.worker_id(), 'logs_path': gherkin.logs_path,
+            'chrome_trace_path': gherkin.chrome_trace_path,
+            'fail_if_pending': gherkin.fail_if_pending, 'records': gherkin.get_records(),
+        } for gherkin in Gherkin.instances if gherkin.test_runs])
+
+
+class XdistController:
+    def __init__(self):
+        self.outputs: dict[str, list[dict]] = defaultdict(list)
+        self.reports: dict[str, RunsReport] = {}
+        self.errors: list[str] = []
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_testnodedown(self, node, error):
+        for output in json.loads(getattr(node, 'workeroutput', {}).get(WORKER_OUTPUT_KEY, '[]')):
+            self.outputs[output['logs_path']].append(output)
+
+    def pytest_sessionfinish(self, session):
+        for logs_path, outputs in self.outputs.items():
+            outputs.sort(key=lambda o: (len(o['worker']), o['worker']))
+            report = self.reports[logs_path] = RunsReport(
+                itertools.chain(*(o['records'] for o in outputs)))
+            self.write_merged_log(logs_path, outputs, report)
+            pending_names = report.get_names(PENDING)
+
+            for trace_path in {o['chrome_trace_path'] for o in outputs} - {''}:
+                merge_chrome_traces([stock.worker_path(trace_path, o['worker']) for o in outputs
+                                     if o['chrome_trace_path'] == trace_path], trace_path)
+
+            if pending_names and any(o['fail_if_pending'] for o in outputs):
+                self.errors.append(f'These scenarios did not run: {", ".join(pending_names)}')
+
+        if self.reports:
+            scheduling.update_durations(getattr(session.config, 'cache', None), self.reports.values(),
+                                        session.config.getoption('bdd_durations'))
+
+        if self.errors:
+            session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+    @staticmethod
+    def write_merged_log(logs_path: str, outputs: list[dict], report: RunsReport):
+        """Appends the worker logs - removing them, so that later sessions start anew - and the summary"""
+        with open(logs_path, 'a') as log_file:
+            for worker in stock.list_drop_duplicates((o['worker'] for o in outputs),
+                                                     lambda w: w):
+                worker_logs_path = stock.worker_path(logs_path, worker)
+
+                if os.path.exists(worker_logs_path):
+                    with open(worker_logs_path) as worker_log_file:
+                        log_file.write(f'{"="*26} {worker}\n{worker_log_file.read()}')
+
+                    os.remove(worker_logs_path)
+
+            log_file.writelines(f'{message}\n' for message in report.get_summary_messages())
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.reports:
+            return
+
+        terminalreporter.section('bdd-coder')
+
+        for logs_path, report in self.reports.items():
+            terminalreporter.line(f'{logs_path}:{report.counts_text}')
+
+        for error in self.errors:
+            terminalreporter.line(error, red=True)
@@ -0,0 +1,242 @@
+"""Opt-in profiling of scenario runs"""
+from __future__ import annotations
+
+from collections import Counter
+
+import contextlib
+import cProfile
+import fnmatch
+import os
+import re
+import signal
+import threading
+
+from types import FrameType
+from typing import TYPE_CHECKING, Iterable, Iterator, Optional
+
+from bdd_coder import stock
+
+if TYPE_CHECKING:  # NO COVER
+    from bdd_coder.decorators import ScenarioRun, StepRun
+
+
+def safe_file_name(text: str) -> str:
+    return re.sub(r'[^\w.\-]+', '_', text).strip('_')
+
+
+def matches(names: Iterable[str], patterns: tuple[str, ...]) -> bool:
+    return not patterns or any(fnmatch.fnmatchcase(name, pattern)
+                               for name in names for pattern in patterns)
+
+
+def root_run(scenario_run: ScenarioRun) -> ScenarioRun:
+    while scenario_run.parent_run is not None:
+        scenario_run = scenario_run.parent_run
+
+    return scenario_run
+
+
+def scenario_chain(scenario_run: ScenarioRun) -> Iterator[ScenarioRun]:
+    while scenario_run is not None:
+        yield scenario_run
+
+        scenario_run = scenario_run.parent_run
+
+
+class StepProfiler(stock.Repr):
+    """
+    Runs the step methods under `cProfile`, dumping one pstats file per
+    profiled step run (`per='step'`) or test scenario run (`per='scenario'`),
+    named after the step method or scenario qualname and the pytest node id -
+    and the position of the step run in the scenario, as a step may repeat.
+    Scenario and step filters are `fnmatch` patterns on names or qualnames
+    """
+    env_var = 'BDD_PROFILE'
+    default_dir = '.bdd-profiles'
+    pers = ('step', 'scenario')
+
+    @classmethod
+    def from_env(cls) -> Optional[StepProfiler]:
+        """
+        Profiler configured by environment variables, if `BDD_PROFILE` is set - to
+        the output directory, or 1. `BDD_PROFILE_SCENARIOS`, `BDD_PROFILE_STEPS` are
+        comma-separated filters, and `BDD_PROFILE_PER` is one of `pers`
+        """
+        value = os.environ.get(cls.env_var, '')
+
+        if value.lower() in {'', '0', 'false', 'no'}:
+            return None
+
+        def patterns(name):
+            return tuple(filter(None, map(
+                str.strip, os.environ.get(f'{cls.env_var}_{name}', '').split(','))))
+
+        return cls(profile_dir=cls.default_dir if value == '1' else value,
+                   scenarios=patterns('SCENARIOS'), steps=patterns('STEPS'),
+                   per=os.environ.get(f'{cls.env_var}_PER', 'step'))
+
+    def __init__(self, profile_dir: str = default_dir, scenarios: tuple[str, ...] = (),
+                 steps: tuple[str, ...] = (), per: str = 'step'):
+        if per not in self.pers:
+            raise ValueError(f'per should be one of {self.pers}, got {per!r}')
+
+        self.profile_dir = profile_dir
+        self.scenarios = tuple(scenarios)
+        self.steps = tuple(steps)
+        self.per = per
+        self.scenario_profiles: dict[int, cProfile.Profile] = {}
+
+    def __str__(self) -> str:
+        return (f'{self.per} profiles in {self.profile_dir} scenarios={self.scenarios} '
+                f'steps={self.steps}')
+
+    def selects(self, step_run: StepRun) -> bool:
+        scenario_names = [name for run in scenario_chain(step_run.scenario_run)
+                          for name in (run.scenario.name, run.scenario.qualname)]
+
+        return (matches((step_run.step.name, step_run.step.method_qualname), self.steps)
+                and matches(scenario_names, self.scenarios))
+
+    def get_path(self, qualname: str, node_id: str, position: Optional[int] = None) -> str:
+        suffix = '' if position is None else f'-{position}'
+
+        return os.path.join(self.profile_dir, f'{safe_file_name(qualname)}-'
+                            f'{safe_file_name(node_id)}{suffix}.pstats')
+
+    @contextlib.contextmanager
+    def profiling(self, step_run: StepRun) -> Iterator[None]:
+        if not self.selects(step_run):
+            yield
+            return
+
+        top_run = root_run(step_run.scenario_run)
+        profile = (cProfile.Profile() if self.per == 'step' else
+                   self.scenario_profiles.setdefault(id(top_run), cProfile.Profile()))
+        profile.enable()
+
+        try:
+            yield
+        finally:
+            profile.disable()
+
+            if self.per == 'step':
+                self.dump(profile, step_run.step.method_qualname, top_run.node_id,
+                          list(top_run.iter_step_runs()).index(step_run))
+
+    def finish(self, scenario_run: ScenarioRun):
+        """Dumps the scenario profile, if any, of a finished test scenario run"""
+        profile = self.scenario_profiles.pop(id(scenario_run), None)
+
+        if profile is not None:
+            self.dump(profile, scenario_run.scenario.qualname, scenario_run.node_id)
+
+    def dump(self, profile: cProfile.Profile, qualname: str, node_id: str,
+             position: Optional[int] = None):
+        os.makedirs(self.profile_dir, exist_ok=True)
+        profile.dump_stats(self.get_path(qualname, node_id, position))
+
+
+class SamplingProfiler(stock.Repr):
+    """
+    Statistical profiler driven by `SIGPROF` signals - every `interval` seconds of
+    process CPU time - that samples only while a test scenario run is active.
+    Sampled stacks are rooted at the scenario chain and step being run, and are
+    written per test scenario run in collapsed-stack format, as consumed by
+    flamegraph tools
+    """
+    env_var = 'BDD_SAMPLE'
+    default_dir = '.bdd-samples'
+    default_interval = 0.005
+    max_depth = 128
+    out_of_step = '(pytest)'
+
+    @classmethod
+    def from_env(cls) -> Optional[SamplingProfiler]:
+        """
+        Profiler configured by environment variables, if `BDD_SAMPLE` is set - to
+        the output directory, or 1. `BDD_SAMPLE_INTERVAL` is in seconds
+        """
+        value = os.environ.get(cls.env_var, '')
+
+        if value.lower() in {'', '0', 'false', 'no'}:
+            return None
+
+        return cls(samples_dir=cls.default_dir if value == '1' else value, interval=float(
+            os.environ.get(f'{cls.env_var}_INTERVAL', cls.default_interval)))
+
+    def __init__(self, samples_dir: str = default_dir, interval: float = default_interval):
+        if not hasattr(signal, 'setitimer'):  # NO COVER
+            raise RuntimeError('Sampling requires signal.setitimer, not available on this OS')
+
+        self.samples_dir = samples_dir
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self.scenario_run: Optional[ScenarioRun] = None
+        self.step_run: Optional[StepRun] = None
+        self.step_frame: Optional[FrameType] = None
+        self.previous_handler = None
+
+    def __str__(self) -> str:
+        return f'samples every {self.interval}s in {self.samples_dir}'
+
+    def start(self, scenario_run: ScenarioRun):
+        self.stop()
+
+        if threading.current_thread() is not threading.main_thread():
+            return
+
+        self.scenario_run = scenario_run
+        self.previous_handler = signal.signal(signal.SIGPROF, self.sample)
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+
+    def stop(self):
+        if self.scenario_run is None:
+            return
+
+        signal.setitimer(signal.ITIMER_PROF, 0)
+        signal.signal(signal.SIGPROF, self.previous_handler or signal.SIG_DFL)
+        self.dump()
+        self.samples.clear()
+        self.scenario_run = self.step_run = self.step_frame = None
+
+    @contextlib.contextmanager
+    def sampling(self, step_run: StepRun, step_frame: FrameType) -> Iterator[None]:
+        """Tags the samples taken in `step_frame` callees with `step_run`"""
+        self.step_run, self.step_frame = step_run, step_frame
+
+        try:
+            yield
+        finally:
+            self.step_run = self.step_frame = None
+
+    def sample(self, signum, frame: Optional[FrameType]):
+        names = []
+
+        while frame is not None and frame is not self.step_frame and len(names) < self.max_depth:
+            code = frame.f_code
+            names.append(f'{getattr(code, "co_qualname", code.co_name)} '
+                         f'({os.path.basename(code.co_filename)}:{code.co_firstlineno})')
+            frame = frame.f_back
+
+        self.samples[';'.join(name.replace(';', ',') for name in self.tags + names[::-1])] += 1
+
+    @property
+    def tags(self) -> list[str]:
+        if self.step_run is None:
+            return [self.scenario_run.scenario.qualname, self.out_of_step]
+
+        return [run.scenario.qualname for run in scenario_chain(self.step_run.scenario_run)
+                ][::-1] + [self.step_run.step.method_qualname]
+
+    def get_path(self) -> str:
+        return os.path.join(self.samples_dir, f'{safe_file_name(self.scenario_run.scenario.qualname)}'
+                            f'-{safe_file_name(self.scenario_run.node_id)}.collapsed')
+
+    def dump(self):
+        if not self.samples:
+            return
+
+        os.makedirs(self.samples_dir, exist_ok=True)
+
+        with open(self.get_path(), 'w') as collapsed_file:
+            collapsed_file.writelines(f'{stack} {count}\n' for stack, count in self.samples.items())
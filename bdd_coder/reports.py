@@ -0,0 +1,102 @@
+"""Summaries of scenario run records, possibly from several processes"""
+from __future__ import annotations
+
+from collections import defaultdict
+
+from typing import Iterable, Iterator, Optional
+
+from bdd_coder import stock
+from bdd_coder.text_utils import OK, FAIL, PENDING, COMPLETION_MSG, BOLD, Style, indent
+
+
+class RunsReport(stock.Repr):
+    """
+    Built from test scenario run records, as made by `ScenarioRun.to_record`,
+    which nest doc scenario and step run records in 'runs'
+    """
+    def __init__(self, records: Iterable[dict]):
+        self.records = list(records)
+
+    def __str__(self) -> str:
+        return self.counts_text.strip()
+
+    def iter_scenario_records(self, records: Optional[list[dict]] = None) -> Iterator[dict]:
+        for record in self.records if records is None else records:
+            if 'runs' in record:
+                yield record
+                yield from self.iter_scenario_records(record['runs'])
+
+    def iter_step_records(self) -> Iterator[dict]:
+        for record in self.iter_scenario_records():
+            yield from filter(lambda r: 'runs' not in r, record['runs'])
+
+    def get_names(self, symbol: str) -> list[str]:
+        """Names of the scenarios - doc ones included - with runs of `symbol`"""
+        return stock.list_drop_duplicates((r['name'] for r in self.iter_scenario_records()
+                                           if r['symbol'] == symbol), lambda name: name)
+
+    @property
+    def counts_text(self) -> str:
+        ok, fail, pending = map(len, map(self.get_names, (OK, FAIL, PENDING)))
+
+        return ''.join([f'  {ok}{BOLD[OK]}' if ok else '',
+                        f'  {fail}{BOLD[FAIL]}' if fail else '',
+                        f'  {pending}{PENDING}' if pending else f'  {COMPLETION_MSG}'])
+
+    @property
+    def failed_records(self) -> list[dict]:
+        return [r for r in self.records if r['symbol'] == FAIL]
+
+    def get_step_durations(self) -> dict[str, stock.DurationStats]:
+        return self.get_durations(self.iter_step_records())
+
+    def get_scenario_durations(self) -> dict[str, stock.DurationStats]:
+        return self.get_durations(self.iter_scenario_records())
+
+    @staticmethod
+    def get_durations(records: Iterable[dict]) -> dict[str, stock.DurationStats]:
+        durations = defaultdict(list)
+
+        for record in filter(lambda r: r['duration'] is not None, records):
+            durations[record['qualname']].append(record['duration'])
+
+        return {name: stock.DurationStats(values) for name, values in durations.items()}
+
+    def get_summary_messages(self, slowest_steps: int = 10, largest_growths: int = 10) -> list[str]:
+        messages = ['\n' + self.counts_text + '\n']
+
+        if self.failed_records:
+            messages.append('  ' + Style.bold('Scenario failures summary:'))
+            messages.extend(indent(r['text']) + '\n' for r in self.failed_records)
+
+        if slowest_steps:
+            messages.extend(self.get_slowest_steps_messages(slowest_steps))
+
+        if largest_growths:
+            messages.extend(self.get_largest_growths_messages(largest_growths))
+
+        return messages
+
+    def get_slowest_steps_messages(self, count: int) -> list[str]:
+        durations = sorted(self.get_step_durations().items(),
+                           key=lambda it: it[1].total, reverse=True)[:count]
+
+        if not durations:
+            return []
+
+        return ['  ' + Style.bold('Slowest steps:'), indent(
+            f'{"count":>6} {"total ms":>10} {"p50 ms":>10} {"p95 ms":>10} {"max ms":>10}  step'
+        )] + [indent(f'{stats.count:>6} {stats.total*1000:>10.3f} {stats.p50*1000:>10.3f} '
+                     f'{stats.p95*1000:>10.3f} {stats.max*1000:>10.3f}  {qualname}')
+              for qualname, stats in durations]
+
+    def get_largest_growths_messages(self, count: int) -> list[str]:
+        growths = sorted(filter(lambda r: r['memory_growth'] is not None, self.records),
+                         key=lambda r: r['memory_growth']['delta'], reverse=True)[:count]
+
+        if not growths:
+            return []
+
+        return ['  ' + Style.bold('Largest memory growths:')] + [
+            indent(f'{r["qualname"]} {r["test_id"]}: {r["memory_growth"]["text"]}')
+            for r in growths]
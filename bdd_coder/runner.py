@@ -0,0 +1,265 @@
+"""
+Work-stealing scenario runner, behind the `bdd-run` command.
+
+The controller collects the tests once, groups them by test class - so that
+scenarios inherited by a class run together, reusing its fixtures -, and puts
+the groups into a shared queue, most expensive first by the durations recorded
+in the pytest cache - or in the `--bdd-durations` file. Each worker process runs
+pytest on the same paths, taking the next group from the queue whenever idle,
+and streams its run log lines and test reports back to the controller, which
+writes one aggregated run log per `Gherkin.logs_path` - ending with the merged
+summary
+"""
+from __future__ import annotations
+
+from collections import defaultdict
+
+import contextlib
+import io
+import itertools
+import logging
+import multiprocessing
+import os
+import queue
+import sys
+import time
+
+from typing import Any, Iterator
+
+import pytest
+
+from bdd_coder.decorators import Gherkin
+from bdd_coder import exceptions
+from bdd_coder.reports import RunsReport
+from bdd_coder import scheduling
+from bdd_coder import stock
+from bdd_coder.text_utils import PENDING
+
+WORKER_PREFIX = 'bw'
+
+
+class Collector:
+    """Pytest plugin sorting the collected test groups by cost"""
+    def __init__(self):
+        self.groups: list[tuple[str, float]] = []
+        self.cache: Any = None
+        self.durations_path = ''
+
+    def pytest_collection_finish(self, session):
+        self.cache = getattr(session.config, 'cache', None)
+        self.durations_path = session.config.getoption('bdd_durations')
+        self.groups = scheduling.CostEstimator(
+            scheduling.load_durations(self.cache, self.durations_path)).sort_groups(session.items)
+
+
+class QueueLogHandler(logging.Handler):
+    """Sends the run log lines to the controller, by the `logs_path` of their `Gherkin`"""
+    def __init__(self, worker: str, results: Any):
+        super().__init__()
+        self.worker, self.results = worker, results
+
+    def emit(self, record: logging.LogRecord):
+        if not getattr(record, 'summary', False):
+            self.results.put(('log', self.worker, record.logs_path, self.format(record)))
+
+
+class QueueWorker:
+    """Pytest plugin running the test groups taken from `tasks`"""
+    def __init__(self, worker: str, tasks: Any, results: Any):
+        self.worker, self.tasks, self.results = worker, tasks, results
+
+    def pytest_collection_finish(self, session):
+        """The run logs of all `Gherkin` instances go to the controller, instead of their files"""
+        for gherkin in Gherkin.instances:
+            gherkin.worker = self.worker
+
+        for logger in {gherkin.logger for gherkin in Gherkin.instances}:
+            for handler in logger.handlers:
+                handler.close()
+
+            logger.handlers = [QueueLogHandler(self.worker, self.results)]
+
+    def iter_items(self, groups: dict[str, list[pytest.Item]]) -> Iterator[pytest.Item]:
+        for key in iter(self.tasks.get, None):
+            yield from groups.get(key, [])
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtestloop(self, session):
+        if session.testsfailed and not session.config.option.continue_on_collection_errors:
+            raise session.Interrupted(f'{session.testsfailed} errors during collection')
+
+        items = self.iter_items(scheduling.group_items(session.items))
+        item = next(items, None)
+
+        while item is not None:
+            nextitem = next(items, None)  # Takes the next group before the last item of this one
+            item.config.hook.pytest_runtest_protocol(item=item, nextitem=nextitem)
+
+            if session.shouldfail:
+                raise session.Failed(session.shouldfail)
+            if session.shouldstop:
+                raise session.Interrupted(session.shouldstop)
+
+            item = nextitem
+
+        return True
+
+    def pytest_runtest_logreport(self, report):
+        if report.when == 'call' or report.outcome != 'passed':
+            self.results.put(('report', self.worker, report.nodeid, report.when, report.outcome,
+                              report.longreprtext if report.failed else ''))
+
+    def pytest_sessionfinish(self):
+        self.results.put(('records', self.worker, [{
+            'logs_path': gherkin.logs_path, 'fail_if_pending': gherkin.fail_if_pending,
+            'records': gherkin.get_records()} for gherkin in Gherkin.instances if gherkin.test_runs]))
+
+
+def run_worker(worker: str, pytest_args: list[str], tasks: Any, results: Any):
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        # Durations are recorded by the controller only
+        exit_code = pytest.main(['-p', 'no:cacheprovider', *pytest_args, '--bdd-durations='],
+                                plugins=[QueueWorker(worker, tasks, results)])
+
+    results.put(('done', worker, int(exit_code)))
+
+
+class WorkStealingRunner(stock.Repr):
+    def __init__(self, *paths: str, workers: int = 0, pytest_args: tuple[str, ...] = (),
+                 stream: Any = None):
+        self.paths = paths
+        self.workers = workers or os.cpu_count() or 1
+        self.pytest_args = [*pytest_args, *paths]
+        self.stream = stream or sys.stdout
+        self.outcomes: dict[str, str] = {}
+        self.failures: list[tuple[str, str, str]] = []
+        self.outputs: dict[str, list[dict]] = defaultdict(list)
+        self.errors: list[str] = []
+
+    def __str__(self) -> str:
+        return f'{self.workers} workers on {" ".join(self.paths) or "."}'
+
+    def collect(self) -> Collector:
+        collector, output = Collector(), io.StringIO()
+
+        with contextlib.redirect_stdout(output):
+            exit_code = pytest.main(['--collect-only', '-q', *self.pytest_args], plugins=[collector])
+
+        if exit_code not in (pytest.ExitCode.OK, pytest.ExitCode.NO_TESTS_COLLECTED):
+            raise exceptions.CollectionError(code=int(exit_code), output=output.getvalue())
+
+        return collector
+
+    def run(self) -> int:
+        start = time.perf_counter()
+        collector = self.collect()
+        context = multiprocessing.get_context('spawn')
+        tasks, results = context.Queue(), context.Queue()
+
+        for key, cost in collector.groups:
+            tasks.put(key)
+
+        processes = [context.Process(target=run_worker, args=(
+            f'{WORKER_PREFIX}{i}', self.pytest_args, tasks, results)) for i in range(self.workers)]
+
+        for process in processes:
+            tasks.put(None)
+            process.start()
+
+        self.write(f'{self} - {len(collector.groups)} test groups\n')
+        exit_codes = self.consume(results, processes)
+
+        for process in processes:
+            process.join()
+
+        reports = self.write_summaries()
+
+        if reports:
+            scheduling.update_durations(collector.cache, reports, collector.durations_path)
+
+        self.write_results(time.perf_counter() - start)
+
+        if self.errors or any(o != 'passed' and o != 'skipped' for o in self.outcomes.values()):
+            return int(pytest.ExitCode.TESTS_FAILED)
+
+        if any(code not in (0, int(pytest.ExitCode.NO_TESTS_COLLECTED)) for code in exit_codes):
+            return max(exit_codes)
+
+        return int(pytest.ExitCode.OK if self.outcomes else pytest.ExitCode.NO_TESTS_COLLECTED)
+
+    def consume(self, results: Any, processes: list) -> list[int]:
+        """Handles the worker messages as they come, until all workers are done"""
+        exit_codes: list[int] = []
+
+        with contextlib.ExitStack() as stack:
+            log_files: dict[str, Any] = {}
+
+            while len(exit_codes) < len(processes):
+                try:
+                    kind, worker, *data = results.get(timeout=1)
+                except queue.Empty:
+                    if not any(process.is_alive() for process in processes):
+                        self.errors.append(f'{len(processes) - len(exit_codes)} workers crashed')
+                        break
+
+                    continue
+
+                if kind == 'log':
+                    logs_path, message = data
+
+                    if logs_path not in log_files:
+                        log_files[logs_path] = stack.enter_context(open(logs_path, 'a'))
+
+                    log_files[logs_path].writelines(f'[{worker}] {line}\n'
+                                                    for line in message.splitlines())
+                    log_files[logs_path].flush()
+                elif kind == 'report':
+                    self.handle_report(worker, *data)
+                elif kind == 'records':
+                    for output in data[0]:
+                        self.outputs[output['logs_path']].append(output)
+                else:
+                    exit_codes.append(data[0])
+
+        return exit_codes
+
+    def handle_report(self, worker: str, nodeid: str, when: str, outcome: str, longrepr: str):
+        self.outcomes[nodeid] = 'error' if when != 'call' and outcome == 'failed' else outcome
+
+        if longrepr:
+            self.failures.append((nodeid, when, longrepr))
+
+        self.write(f'[{worker}] {nodeid} {outcome.upper()}\n')
+
+    def write_summaries(self) -> list[RunsReport]:
+        reports = []
+
+        for logs_path, outputs in self.outputs.items():
+            report = RunsReport(itertools.chain(*(o['records'] for o in outputs)))
+            pending_names = report.get_names(PENDING)
+            reports.append(report)
+
+            with open(logs_path, 'a') as log_file:
+                log_file.writelines(f'{message}\n' for message in report.get_summary_messages())
+
+            self.write(f'{logs_path}:{report.counts_text}\n')
+
+            if pending_names and any(o['fail_if_pending'] for o in outputs):
+                self.errors.append(f'These scenarios did not run: {", ".join(pending_names)}')
+
+        return reports
+
+    def write_results(self, seconds: float):
+        for nodeid, when, longrepr in self.failures:
+            self.write(f'{"_"*26} {nodeid} ({when})\n{longrepr}\n')
+
+        for error in self.errors:
+            self.write(f'{error}\n')
+
+        counts = ', '.join(f'{count} {outcome}' for outcome, count in sorted(
+            (o, sum(1 for v in self.outcomes.values() if v == o)) for o in set(self.outcomes.values())))
+        self.write(f'{counts or "no tests ran"} in {seconds:.2f}s\n')
+
+    def write(self, text: str):
+        self.stream.write(text)
+        self.stream.flush()
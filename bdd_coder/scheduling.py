@@ -0,0 +1,179 @@
+"""Cost estimates and grouping of collected test scenarios, for scheduling"""
+from __future__ import annotations
+
+from collections import defaultdict
+
+import argparse
+import json
+import os
+
+from typing import TYPE_CHECKING, Any, Iterable, Optional
+
+import pytest
+
+from bdd_coder import stock
+
+if TYPE_CHECKING:  # NO COVER
+    from bdd_coder.decorators import Scenario
+    from bdd_coder.reports import RunsReport
+
+DURATIONS_KEY = 'bdd_coder/durations'
+
+
+def get_scenario(item: pytest.Item) -> Optional[Scenario]:
+    return getattr(getattr(item, 'function', None), 'scenario', None)
+
+
+def duration_key(qualname: str, test_id: str) -> str:
+    return f'{qualname}::{test_id}'
+
+
+def load_durations(cache: Any, path: str = '') -> dict[str, float]:
+    """
+    Last recorded test scenario durations, by `duration_key`, from the JSON file
+    at `path` if given - none if it does not exist -, or else from the pytest `cache`
+    """
+    if path:
+        if not os.path.exists(path):
+            return {}
+
+        with open(path) as durations_file:
+            return json.load(durations_file)
+
+    return {} if cache is None else cache.get(DURATIONS_KEY, {})
+
+
+def update_durations(cache: Any, reports: Iterable[RunsReport], path: str = ''):
+    """Records the durations in `reports` in the pytest `cache` - if any -, and in the file at `path`"""
+    recorded = {}
+
+    for report in reports:
+        recorded.update({duration_key(r['qualname'], r['test_id']): r['duration']
+                         for r in report.records if r['duration'] is not None})
+
+    if cache is not None:
+        cache.set(DURATIONS_KEY, {**load_durations(cache), **recorded})
+
+    if path:
+        durations = {**load_durations(None, path), **recorded}
+
+        with open(f'{path}.tmp', 'w') as durations_file:
+            json.dump(durations, durations_file, indent=2, sort_keys=True)
+
+        os.replace(f'{path}.tmp', path)
+
+
+def group_key(item: pytest.Item) -> str:
+    """Node id of the test class of `item` - or of its module"""
+    parts = item.nodeid.split('::')
+
+    return '::'.join(parts[:2]) if getattr(item, 'cls', None) is not None else parts[0]
+
+
+def group_items(items: Iterable[pytest.Item]) -> dict[str, list[pytest.Item]]:
+    groups = defaultdict(list)
+
+    for item in items:
+        groups[group_key(item)].append(item)
+
+    return dict(groups)
+
+
+class CostEstimator(stock.Repr):
+    """
+    Estimates test run costs in seconds: the last recorded duration of the test,
+    or else the mean one of its scenario, or else its step count times the mean
+    duration per step of the recorded tests - 1 second if there are none
+    """
+    def __init__(self, durations: dict[str, float]):
+        self.durations = durations
+        scenario_durations = defaultdict(list)
+
+        for key, duration in durations.items():
+            scenario_durations[key.split('::', 1)[0]].append(duration)
+
+        self.scenario_means = {qualname: sum(values)/len(values)
+                               for qualname, values in scenario_durations.items()}
+
+    def __str__(self) -> str:
+        return f'{len(self.durations)} recorded durations'
+
+    def get_recorded(self, item: pytest.Item) -> Optional[float]:
+        scenario = get_scenario(item)
+
+        if scenario is None:
+            return None
+
+        return self.durations.get(duration_key(scenario.qualname, item.name),
+                                  self.scenario_means.get(scenario.qualname))
+
+    @staticmethod
+    def count_steps(item: pytest.Item) -> int:
+        scenario = get_scenario(item)
+
+        return 1 if scenario is None else len(scenario.refine()[0])
+
+    def estimate(self, items: Iterable[pytest.Item]) -> dict[str, float]:
+        """Costs by node id"""
+        recorded = {item.nodeid: self.get_recorded(item) for item in items}
+        step_counts = {item.nodeid: self.count_steps(item) for item in items}
+        known = [nodeid for nodeid, cost in recorded.items() if cost is not None]
+        known_steps = sum(step_counts[nodeid] for nodeid in known)
+        step_cost = sum(recorded[nodeid] for nodeid in known)/known_steps if known_steps else 1.0
+
+        return {nodeid: step_counts[nodeid]*step_cost if cost is None else cost
+                for nodeid, cost in recorded.items()}
+
+    def sort_groups(self, items: Iterable[pytest.Item]) -> list[tuple[str, float]]:
+        """Groups of `items` - see `group_items` - with their costs, most expensive first"""
+        items = list(items)
+        costs = self.estimate(items)
+
+        return sorted(((key, sum(costs[item.nodeid] for item in group))
+                       for key, group in group_items(items).items()),
+                      key=lambda it: it[1], reverse=True)
+
+    def shard(self, items: Iterable[pytest.Item], count: int,
+              longest_first: bool = False) -> list[list[pytest.Item]]:
+        """
+        Splits `items` into `count` shards of balanced cost, deterministically:
+        from the most expensive item, each goes to the cheapest shard so far - the
+        first one on ties. Shard items keep their order, or go longest first
+        """
+        items = list(items)
+        costs = self.estimate(items)
+        loads, shards = [0.0]*count, [[] for _ in range(count)]
+
+        for item in sorted(items, key=lambda i: (-costs[i.nodeid], i.nodeid)):
+            index = loads.index(min(loads))
+            loads[index] += costs[item.nodeid]
+            shards[index].append(item)
+
+        positions = {item.nodeid: position for position, item in enumerate(items)}
+
+        return [shard if longest_first else sorted(shard, key=lambda i: positions[i.nodeid])
+                for shard in shards]
+
+
+def select(config: pytest.Config, items: list[pytest.Item], selected: list[pytest.Item]):
+    """Replaces `items` with `selected`, reporting the rest as deselected"""
+    selected_ids = {item.nodeid for item in selected}
+    deselected = [item for item in items if item.nodeid not in selected_ids]
+
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+
+    items[:] = selected
+
+
+def parse_shard(value: str) -> tuple[int, int]:
+    """'i/n' into (i, n), for 1 <= i <= n"""
+    try:
+        index, count = map(int, value.split('/'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'expected i/n, got {value!r}')
+
+    if not 1 <= index <= count:
+        raise argparse.ArgumentTypeError(f'expected 1 <= i <= n, got {value!r}')
+
+    return index, count
@@ -5,6 +5,8 @@ import abc
 from collections import OrderedDict
 
 import itertools
+import math
+import os
 import subprocess
 import sys
 
@@ -80,7 +82,9 @@ class Process(subprocess.Popen):
     def next_stdout(self) -> str:
         return self.stdout.readline().decode()
 
-    def write(self, stream=sys.stdout):
+    def write(self, stream=None):
+        stream = stream or sys.stdout
+
         for line in self:
             stream.write(line)
 
@@ -123,6 +127,28 @@ class SetPair(Repr):
             raise AssertionError
 
 
+def worker_id() -> str:
+    """The pytest-xdist worker id, or 'main'"""
+    return os.environ.get('PYTEST_XDIST_WORKER', 'main')
+
+
+def is_worker() -> bool:
+    return 'PYTEST_XDIST_WORKER' in os.environ
+
+
+def worker_path(path: str, worker: str = '') -> str:
+    """
+    `path` with the `worker` id before the extension - by default, that of this
+    process, if running as a pytest-xdist worker
+    """
+    if not worker and not is_worker():
+        return path
+
+    root, ext = os.path.splitext(path)
+
+    return f'{root}.{worker or worker_id()}{ext}'
+
+
 def list_drop_duplicates(iterable: Iterable, keylambda: Callable) -> list:
     elements: list = []
     keys: list[str] = []
@@ -132,3 +158,39 @@ def list_drop_duplicates(iterable: Iterable, keylambda: Callable) -> list:
         elements.append(e)
 
     return elements
+
+
+class DurationStats(Repr):
+    def __init__(self, durations: Iterable[float]):
+        self.durations = sorted(durations)
+
+    def __str__(self) -> str:
+        return (f'count={self.count} total={self.total:.6f} p50={self.p50:.6f} '
+                f'p95={self.p95:.6f} max={self.max:.6f}')
+
+    @property
+    def count(self) -> int:
+        return len(self.durations)
+
+    @property
+    def total(self) -> float:
+        return sum(self.durations)
+
+    @property
+    def p50(self) -> float:
+        return self.percentile(50)
+
+    @property
+    def p95(self) -> float:
+        return self.percentile(95)
+
+    @property
+    def max(self) -> float:
+        return self.durations[-1] if self.durations else 0.0
+
+    def percentile(self, q: float) -> float:
+        """Nearest-rank percentile, 0 if there are no durations"""
+        if not self.durations:
+            return 0.0
+
+        return self.durations[max(math.ceil(q*len(self.durations)/100), 1) - 1]
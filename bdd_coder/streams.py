@@ -0,0 +1,78 @@
+"""
+Streamed step outputs: generators returned by step methods - or yielded from,
+as generator functions - are kept as `OutputStream`s, consumed lazily by the
+next steps through `BddTester.get_output`, in constant memory. Other iterators -
+like cursors or files - are kept as they are, with their own interface
+"""
+from __future__ import annotations
+
+import collections.abc
+import inspect
+import itertools
+import reprlib
+
+from typing import Any, Iterator
+
+from bdd_coder import stock
+
+
+class OutputStream(stock.Repr, collections.abc.Iterator):
+    """
+    Iterator over a step output, with its first `preview_size` items taken on
+    creation - in the step run -, for a bounded preview in the run log. Pickling
+    takes the remaining items, see `StepCache`
+    """
+    preview_size = 3
+    item_repr = reprlib.Repr()
+    item_repr.maxlevel, item_repr.maxstring, item_repr.maxother = 2, 40, 40
+
+    def __init__(self, iterator: Iterator[Any]):
+        iterator = iter(iterator)
+        head = list(itertools.islice(iterator, self.preview_size + 1))
+        self.preview = head[:self.preview_size]
+        self.is_longer = len(head) > self.preview_size
+        self.iterator = itertools.chain(head, iterator)
+
+    def __str__(self) -> str:
+        items = [self.item_repr.repr(item) for item in self.preview] + ['...']*self.is_longer
+
+        return f'[{", ".join(items)}]'
+
+    def __next__(self) -> Any:
+        return next(self.iterator)
+
+    def __reduce__(self) -> tuple:
+        items = list(self.iterator)
+        self.iterator = iter(items)
+
+        return type(self), (items,)
+
+    def tee(self) -> OutputStream:
+        """
+        Copy yielding the remaining items independently - as `itertools.tee`, keeping
+        those taken by one copy until all have
+        """
+        stream = type(self).__new__(type(self))
+        stream.preview, stream.is_longer = self.preview, self.is_longer
+        self.iterator, stream.iterator = itertools.tee(self.iterator)
+
+        return stream
+
+
+def stream_outputs(result: Any) -> Any:
+    """The step method `result`, with its generators as `OutputStream`s - itself, if one"""
+    if inspect.isgenerator(result):
+        return OutputStream(result),
+
+    if isinstance(result, tuple):
+        return tuple(OutputStream(value) if inspect.isgenerator(value) else value for value in result)
+
+    return result
+
+
+def tee_outputs(result: Any) -> Any:
+    """The step run `result`, with its streams teed - for reusing it"""
+    if isinstance(result, tuple):
+        return tuple(value.tee() if isinstance(value, OutputStream) else value for value in result)
+
+    return result
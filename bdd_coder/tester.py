@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from collections import OrderedDict
 
+import asyncio
+import contextvars
 import inspect
 import os
 import re
@@ -20,11 +22,16 @@ from bdd_coder import exceptions
 from bdd_coder.features import FeaturesSpec
 from bdd_coder import stock
 
+from bdd_coder.text_utils import PENDING
 from bdd_coder.text_utils import extract_name
 from bdd_coder.text_utils import strip_lines
 from bdd_coder.text_utils import to_sentence
 
 
+STEP_PARAM: contextvars.ContextVar = contextvars.ContextVar('step_param', default=())
+CURRENT_RUN: contextvars.ContextVar = contextvars.ContextVar('current_run', default=None)
+
+
 class literal(str):
     """Employed to make nice YAML files"""
 
@@ -62,6 +69,8 @@ class BddTester(YamlDumper, stock.SubclassesMixin):
 
                 if step_method.__qualname__ in cls.gherkin:
                     step.doc_scenario = cls.gherkin[step_method.__qualname__]
+                elif cls.gherkin.dispatch:
+                    step.method = step_method
                 else:
                     setattr(cls, step.fixture_name, step(step_method))
 
@@ -69,6 +78,9 @@ class BddTester(YamlDumper, stock.SubclassesMixin):
                                cls.gherkin.scenarios[cls.__name__].values()):
             setattr(cls, scenario.name, scenario(getattr(cls, scenario.name)))
 
+            if scenario.dispatcher is not None:
+                setattr(cls, scenario.dispatcher_name, scenario.dispatcher)
+
     @classmethod
     def subclass_names(cls) -> Iterator[str]:
         for subclass in cls.subclasses_down():
@@ -80,7 +92,7 @@ class BddTester(YamlDumper, stock.SubclassesMixin):
 
     @classmethod
     def features_spec(cls, parent_dir: Optional[str] = None, overwrite: bool = True) -> FeaturesSpec:
-        directory = parent_dir or cls.tmp_dir
+        directory = parent_dir or stock.worker_path(cls.tmp_dir, cls.gherkin.worker)
         cls.dump_yaml_specs(directory, overwrite)
 
         try:
@@ -138,9 +150,22 @@ class BddTester(YamlDumper, stock.SubclassesMixin):
                strip_lines(getattr(cls, name).__doc__.splitlines())
                for name in cls.get_own_scenario_names()}
 
+        step_scopes = cls.get_own_step_scopes()
+
         return OrderedDict([
             ('Title', cls.get_title()), ('Story', literal(story)), ('Scenarios', scs)
-        ] + [(to_sentence(n), v) for n, v in cls.get_own_class_attrs().items()])
+        ] + ([('Step scopes', step_scopes)] if step_scopes else []) + [
+            (to_sentence(n), v) for n, v in cls.get_own_class_attrs().items()])
+
+    @classmethod
+    def get_own_step_scopes(cls) -> dict[str, str]:
+        """Scopes of the steps of own scenarios defined in this class, see `Gherkin.scoped`"""
+        step_names = stock.list_drop_duplicates((
+            step.name for scenario in cls.gherkin.scenarios[cls.__name__].values()
+            for step in scenario.steps if step.name in vars(cls)), lambda name: name)
+
+        return {name: vars(cls)[name].step_scope for name in step_names
+                if getattr(vars(cls)[name], 'step_scope', 'function') != 'function'}
 
     @classmethod
     def get_title(cls) -> str:
@@ -155,20 +180,70 @@ class BddTester(YamlDumper, stock.SubclassesMixin):
         return dict(filter(lambda it: f'\n    {it[0]} = ' in inspect.getsource(cls),
                            inspect.getmembers(cls)))
 
+    @classmethod
+    def get_root_class(cls) -> type:
+        """The class holding the `Gherkin` instance"""
+        return next(c for c in cls.__mro__ if 'gherkin' in vars(c))
+
     @classmethod
     def setup_class(cls):
+        """With deduped tests, the whole hierarchy is validated, as some classes may not run"""
         if cls.gherkin.validate:
-            cls.validate()
+            (cls.get_root_class() if cls.gherkin.dedupe_tests else cls).validate()
+
+    @classmethod
+    def teardown_class(cls):
+        cls.gherkin.close_event_loops(cls)
+
+    @property
+    def param(self) -> Any:
+        """Inputs of the step being run - in this context, as steps may run concurrently"""
+        return STEP_PARAM.get()
+
+    @param.setter
+    def param(self, value: Any):
+        STEP_PARAM.set(value)
+
+    @property
+    def event_loop(self) -> asyncio.AbstractEventLoop:
+        """Running the async step methods, see `Gherkin(event_loop_scope)`"""
+        return self.gherkin.get_event_loop(type(self))
 
     @pytest.fixture(autouse=True)
     def fixture_setup(self, request):
-        self.gherkin.new_run(request.node.name, request.function.scenario)
+        self.start_run(request)
+
+    def start_run(self, request):
+        """Starts the run of the test scenario of `request`, in this context"""
+        vars(self).update(self.gherkin.prefix_state)
         self.pytest_request = request
+        CURRENT_RUN.set(self.gherkin.new_run(
+            request.node.nodeid, request.function.scenario, request.node.name))
         self.gherkin.reset_outputs()
 
+    def skip_pending_steps(self):
+        """
+        Marks the fixtures of the pending steps - after a failure - as set up, so
+        that pytest does not set them up: the item fixtures are filled by the private
+        `FixtureRequest._fillfixtures`, which skips names already in `item.funcargs`.
+        Checked against pytest 8 and 9 - the versions pinned -, see
+        `test_steps_after_failure_not_set_up`
+        """
+        funcargs = self.pytest_request.node.funcargs
+
+        for step_run in self.current_run.iter_step_runs():
+            if step_run.symbol == PENDING:
+                funcargs.setdefault(step_run.step.fixture_name, None)
+
     @property
     def current_run(self) -> ScenarioRun:
-        return self.gherkin.test_runs[self.pytest_request.node.name]
+        """The run started in this context - or else found by pytest node id"""
+        scenario_run = CURRENT_RUN.get()
+
+        if scenario_run is None or scenario_run.scenario.gherkin is not self.gherkin:
+            return self.gherkin.test_runs[self.pytest_request.node.nodeid]
+
+        return scenario_run
 
     def get_output(self, name: str, index: int = -1) -> Any:
         return self.gherkin.outputs[name][index]
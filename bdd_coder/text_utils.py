@@ -26,6 +26,9 @@ BOLD: dict[str, str] = {OK: '✅', FAIL: '❌'}
 PARAM_REGEX: str = r'\$([a-zA-Z_]+)'
 I_REGEX: str = r'\$\(([^\$]+)\)'
 O_REGEX: str = r'`([^`\$]+)`'
+EXAMPLES_REGEX: str = r'^Examples: *(\S+)$'
+STEP_SCOPES: tuple[str, ...] = ('function', 'class', 'module', 'session')
+EVENT_LOOP_SCOPES: tuple[str, ...] = ('class', 'session')
 
 
 class Style:
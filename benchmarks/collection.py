@@ -0,0 +1,215 @@
+"""
+Collection-time benchmark: generates tester packages of increasing size with
+`PackageCoder`, runs `pytest --collect-only` on each in-process, and splits the
+time between bdd_coder - `Gherkin` decoration, `BddTester.__init_subclass__`,
+`Scenario.refine` and fixture registration, and the bdd_coder plugin hooks - and
+pytest. Results are compared with the committed baseline, `collection.json` - by
+mode, default or dispatch -, by the bdd_coder to pytest time ratio, less dependent
+on the machine than times
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import functools
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from typing import Callable, Iterator
+
+import pytest
+import yaml
+
+from bdd_coder.coders import PackageCoder
+from bdd_coder import decorators
+from bdd_coder import tester
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'collection.json')
+SIZES = ('10x10x5', '20x25x5', '40x50x5')  # Features x scenarios x steps
+TOLERANCE = 0.5
+
+
+def parse_size(size: str) -> tuple[int, int, int]:
+    feature_count, scenario_count, step_count = map(int, size.split('x'))
+
+    return feature_count, scenario_count, step_count
+
+
+def write_specs(specs_dir: str, feature_count: int, scenario_count: int, step_count: int):
+    """
+    YAML specs of `feature_count` features with `scenario_count` test scenarios of
+    `step_count` steps each - the first one being a doc scenario, with a step input
+    """
+    os.makedirs(specs_dir)
+
+    for i in range(feature_count):
+        scenarios = {f'Setup of feature {i}': [f'Given feature {i} is set up with $(input {i})',
+                                               f'And `state {i}` is ready']}
+        scenarios.update({f'Scenario {j} of feature {i}': [f'Given setup of feature {i}'] + [
+            f'When step {k} of scenario {j} of feature {i} runs' for k in range(step_count - 1)]
+            for j in range(scenario_count)})
+
+        with open(os.path.join(specs_dir, f'feature-{i}.yml'), 'w') as yml_file:
+            yaml.dump({'Title': f'Feature {i}', 'Story': 'As a benchmark\nI want scenarios',
+                       'Scenarios': scenarios}, yml_file, sort_keys=False)
+
+
+def make_package(parent_dir: str, size: str, dispatch: bool = False) -> str:
+    name = f'bench_{size}{"_dispatch" if dispatch else ""}'
+    tests_path = os.path.join(parent_dir, name)
+    write_specs(os.path.join(parent_dir, f'{name}_specs'), *parse_size(size))
+    PackageCoder(os.path.join(parent_dir, f'{name}_specs'), tests_path,
+                 logs_path=os.path.join(parent_dir, f'{name}.log')).create_tester_package()
+
+    if dispatch:
+        base_path = os.path.join(tests_path, 'base.py')
+
+        with open(base_path) as base_py:
+            source = base_py.read()
+
+        with open(base_path, 'w') as base_py:
+            base_py.write(source.replace('Gherkin(', 'Gherkin(dispatch=True, '))
+
+    return tests_path
+
+
+class Timer:
+    """Wall time spent in the outermost calls of the wrapped functions"""
+    def __init__(self):
+        self.seconds = 0.0
+        self.depth = 0
+
+    def wrap(self, function: Callable) -> Callable:
+        @functools.wraps(function)
+        def timed_function(*args, **kwargs):
+            if self.depth:
+                return function(*args, **kwargs)
+
+            self.depth += 1
+            start = time.perf_counter()
+
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.seconds += time.perf_counter() - start
+                self.depth -= 1
+
+        return timed_function
+
+    @contextlib.contextmanager
+    def patching(self) -> Iterator[Timer]:
+        """Times `Gherkin` and `Scenario` calls, and `BddTester.__init_subclass__`"""
+        originals = (decorators.Gherkin.__call__, decorators.Scenario.__call__,
+                     tester.BddTester.__dict__['__init_subclass__'])
+        decorators.Gherkin.__call__ = self.wrap(originals[0])
+        decorators.Scenario.__call__ = self.wrap(originals[1])
+        tester.BddTester.__init_subclass__ = classmethod(self.wrap(originals[2].__func__))
+
+        try:
+            yield self
+        finally:
+            decorators.Gherkin.__call__, decorators.Scenario.__call__ = originals[:2]
+            tester.BddTester.__init_subclass__ = originals[2]
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_configure(self, config):
+        """Wraps the hook implementations of the bdd_coder plugins"""
+        for hook_caller in vars(config.hook).values():
+            for hook_impl in getattr(hook_caller, 'get_hookimpls', list)():
+                if type(hook_impl.plugin).__module__.startswith('bdd_coder') or getattr(
+                        hook_impl.plugin, '__name__', '').startswith('bdd_coder'):
+                    hook_impl.function = self.wrap(hook_impl.function)
+
+
+class CollectionCounter:
+    def __init__(self):
+        self.count = 0
+
+    def pytest_collection_finish(self, session):
+        self.count = len(session.items)
+
+
+def measure(tests_path: str) -> dict:
+    timer, counter = Timer(), CollectionCounter()
+
+    with timer.patching(), open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        exit_code = pytest.main(['--collect-only', '-q', '-p', 'no:cacheprovider', tests_path],
+                                plugins=[timer, counter])
+        total = time.perf_counter() - start
+
+    if exit_code != pytest.ExitCode.OK:
+        raise RuntimeError(f'Collection of {tests_path} failed with exit code {exit_code}')
+
+    return {'tests': counter.count, 'total': round(total, 4), 'bdd_coder': round(timer.seconds, 4),
+            'pytest': round(total - timer.seconds, 4),
+            'ratio': round(timer.seconds/(total - timer.seconds), 4)}
+
+
+def run(sizes: tuple[str, ...] = SIZES, dispatch: bool = False) -> dict[str, dict]:
+    parent_dir = tempfile.mkdtemp(prefix='bdd-bench-')
+    sys.path.insert(0, parent_dir)
+
+    try:
+        return {size: measure(make_package(parent_dir, size, dispatch)) for size in sizes}
+    finally:
+        sys.path.remove(parent_dir)
+        shutil.rmtree(parent_dir)
+
+
+def check(results: dict[str, dict], baseline: dict[str, dict],
+          tolerance: float = TOLERANCE) -> list[str]:
+    """Regression messages, for the sizes whose ratio exceeds the baseline one by `tolerance`"""
+    return [f'{size}: bdd_coder/pytest time ratio {result["ratio"]} > {baseline[size]["ratio"]}'
+            f' baseline (+{tolerance:.0%})' for size, result in results.items()
+            if size in baseline and result['ratio'] > baseline[size]['ratio']*(1 + tolerance)]
+
+
+def format_results(results: dict[str, dict]) -> str:
+    return '\n'.join([f'{"size":>10} {"tests":>6} {"total s":>9} {"bdd_coder s":>12} {"pytest s":>9} '
+                      f'{"ratio":>6}'] + [
+        f'{size:>10} {r["tests"]:>6} {r["total"]:>9.3f} {r["bdd_coder"]:>12.3f} {r["pytest"]:>9.3f} '
+        f'{r["ratio"]:>6.3f}' for size, r in results.items()])
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', nargs='+', default=SIZES,
+                        help='Features x scenarios x steps, like 10x10x5')
+    parser.add_argument('--dispatch', action='store_true', help='With Gherkin(dispatch=True)')
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE)
+    parser.add_argument('--update', action='store_true', help='Write the results as the baseline')
+    args = parser.parse_args(argv)
+    mode = 'dispatch' if args.dispatch else 'default'
+    results = run(tuple(args.sizes), args.dispatch)
+    print(format_results(results))
+
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as json_file:
+            baseline = json.load(json_file)
+    else:
+        baseline = {}
+
+    if args.update:
+        baseline[mode] = results
+
+        with open(args.baseline, 'w') as json_file:
+            json.dump(baseline, json_file, indent=2)
+            json_file.write('\n')
+
+        return 0
+
+    regressions = check(results, baseline.get(mode, {}), args.tolerance)
+
+    print('\n'.join(regressions) or 'No regressions')
+
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,166 @@
+"""
+Per-step runtime overhead benchmark: runs no-op suites as `BddTester` scenarios
+and as plain pytest test methods calling the same no-op step methods, and reports
+the bdd_coder overhead per scenario and per step in microseconds, for different
+step counts and doc scenario nesting depths. Times are the pytest setup, call and
+teardown durations - collection excluded, see `collection.py`. With `--fail-first`,
+the first step of each scenario fails, to measure the cost of the steps not run
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import itertools
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+import pytest
+
+STEP_COUNTS = (1, 5, 20)
+DEPTHS = (0, 1, 3)
+SCENARIO_COUNT = 200
+
+
+def make_step_body(level: int, i: int, depth: int, fail_first: bool) -> str:
+    """The first step to run - of the deepest level - fails with `fail_first`"""
+    return 'raise AssertionError' if fail_first and (level, i) == (depth, 0) else 'pass'
+
+
+def make_bdd_source(logs_path: str, scenario_count: int, step_count: int, depth: int,
+                    dispatch: bool = False, fail_first: bool = False) -> str:
+    """
+    Test scenarios of `step_count` steps, and a chain of `depth` doc scenarios of
+    `step_count` steps each, the first one starting with the next
+    """
+    def level_lines(level: int) -> list[str]:
+        return [f'Given level {level + 1}'] * (level < depth) + [
+            f'And step {i} of level {level}' for i in range(step_count)]
+
+    lines = ['from bdd_coder import decorators', 'from bdd_coder import tester', '', '',
+             'class BddTester(tester.BddTester):',
+             f'    gherkin = decorators.Gherkin(validate=False, dispatch={dispatch}, '
+             f'logs_path={logs_path!r})', '', '', 'class TestSteps(BddTester):', '    """Steps"""']
+
+    for name, level in itertools.chain(((f'test_scenario_{j}', 0) for j in range(scenario_count)),
+                                       ((f'level_{k}', k) for k in range(1, depth + 1))):
+        lines.extend(['', '    @BddTester.gherkin()', f'    def {name}(self):', '        """'] + [
+            f'        {line}' for line in level_lines(level)] + ['        """'])
+
+    for level, i in itertools.product(range(depth + 1), range(step_count)):
+        lines.extend(['', f'    def step_{i}_of_level_{level}(self):',
+                      f'        {make_step_body(level, i, depth, fail_first)}'])
+
+    return '\n'.join(lines) + '\n'
+
+
+def make_plain_source(scenario_count: int, step_count: int, depth: int,
+                      fail_first: bool = False) -> str:
+    lines = ['class TestSteps:']
+
+    for level, i in itertools.product(range(depth + 1), range(step_count)):
+        lines.extend([f'    def step_{i}_of_level_{level}(self):',
+                      f'        {make_step_body(level, i, depth, fail_first)}', ''])
+
+    for j in range(scenario_count):
+        lines.extend([f'    def test_scenario_{j}(self):'] + [
+            f'        self.step_{i}_of_level_{level}()'
+            for level, i in itertools.product(range(depth, -1, -1), range(step_count))] + [''])
+
+    return '\n'.join(lines)
+
+
+class DurationCounter:
+    def __init__(self):
+        self.seconds = 0.0
+        self.failed = 0
+
+    def pytest_runtest_logreport(self, report):
+        self.seconds += report.duration
+        self.failed += report.failed
+
+
+def measure(path: str, failed: int = 0) -> float:
+    """Seconds running the tests in `path`, of which `failed` should fail"""
+    counter = DurationCounter()
+
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        exit_code = pytest.main(['-q', '-p', 'no:cacheprovider', path], plugins=[counter])
+
+    if exit_code not in (pytest.ExitCode.OK, pytest.ExitCode.TESTS_FAILED) or (
+            counter.failed != failed):
+        raise RuntimeError(f'Run of {path} failed with exit code {exit_code}')
+
+    return counter.seconds
+
+
+def write_module(path: str, source: str):
+    with open(path, 'w') as py_file:
+        py_file.write(source)
+
+
+def run(step_counts: tuple[int, ...] = STEP_COUNTS, depths: tuple[int, ...] = DEPTHS,
+        scenario_count: int = SCENARIO_COUNT, dispatch: bool = False,
+        fail_first: bool = False) -> list[dict]:
+    parent_dir = tempfile.mkdtemp(prefix='bdd-bench-')
+    results = []
+
+    try:
+        for step_count, depth in itertools.product(step_counts, depths):
+            name = f'{step_count}_{depth}'
+            bdd_path = os.path.join(parent_dir, f'test_bdd_{name}.py')
+            plain_path = os.path.join(parent_dir, f'test_plain_{name}.py')
+            write_module(bdd_path, make_bdd_source(os.path.join(parent_dir, f'{name}.log'),
+                                                   scenario_count, step_count, depth, dispatch,
+                                                   fail_first))
+            write_module(plain_path, make_plain_source(scenario_count, step_count, depth, fail_first))
+            failed = scenario_count if fail_first else 0
+            bdd_seconds, plain_seconds = measure(bdd_path, failed), measure(plain_path, failed)
+            overhead = (bdd_seconds - plain_seconds)/scenario_count*1e6
+            results.append({'steps': step_count*(depth + 1), 'depth': depth,
+                            'bdd_us': round(bdd_seconds/scenario_count*1e6, 1),
+                            'plain_us': round(plain_seconds/scenario_count*1e6, 1),
+                            'scenario_overhead_us': round(overhead, 1),
+                            'step_overhead_us': round(overhead/(step_count*(depth + 1)), 1)})
+    finally:
+        shutil.rmtree(parent_dir)
+
+    return results
+
+
+def format_results(results: list[dict]) -> str:
+    """Microseconds per scenario - per test -, and per step"""
+    return '\n'.join([f'{"steps":>5} {"depth":>5} {"bdd us":>9} {"plain us":>9} '
+                      f'{"overhead us":>12} {"per step us":>12}'] + [
+        f'{r["steps"]:>5} {r["depth"]:>5} {r["bdd_us"]:>9.1f} {r["plain_us"]:>9.1f} '
+        f'{r["scenario_overhead_us"]:>12.1f} {r["step_overhead_us"]:>12.1f}' for r in results])
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--step-counts', nargs='+', type=int, default=STEP_COUNTS,
+                        help='Steps per scenario level')
+    parser.add_argument('--depths', nargs='+', type=int, default=DEPTHS,
+                        help='Doc scenario nesting depths')
+    parser.add_argument('--scenarios', type=int, default=SCENARIO_COUNT)
+    parser.add_argument('--dispatch', action='store_true', help='With Gherkin(dispatch=True)')
+    parser.add_argument('--fail-first', action='store_true',
+                        help='Make the first step of each scenario fail')
+    parser.add_argument('--output', help='JSON file to write the results to')
+    args = parser.parse_args(argv)
+    results = run(tuple(args.step_counts), tuple(args.depths), args.scenarios, args.dispatch,
+                  args.fail_first)
+    print(format_results(results))
+
+    if args.output:
+        with open(args.output, 'w') as json_file:
+            json.dump(results, json_file, indent=2)
+            json_file.write('\n')
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,77 @@
+import asyncio
+import os
+
+from . import base
+
+
+def teardown_module():
+    base.BddTester.gherkin.log(fail_if_pending=True)
+
+
+def record_loop():
+    with open(os.environ.get('BDD_CALLS_PATH', os.devnull), 'a') as calls_file:
+        calls_file.write(f'{id(asyncio.get_running_loop())}\n')
+
+
+class NewGame(base.BddTester):
+    """
+    As a codebreaker
+    I want to start a new Mastermind game of B boards of G guesses
+    In order to play
+    """
+
+    @base.BddTester.gherkin([6], [8])
+    def even_boards(self):
+        """
+        Given a connection `pool`
+        When I request a new `game` with $n boards
+        """
+
+    async def a_connection_pool(self):
+        record_loop()
+        await asyncio.sleep(0)
+
+        return asyncio.Queue(),
+
+    async def i_request_a_new_game_with_n_boards(self, n):
+        record_loop()
+        await self.get_output('pool').put(n)
+
+        return {'boards': await self.get_output('pool').get()},
+
+
+class TestClearBoard(NewGame):
+    """
+    As a codebreaker
+    I want a clear board with a new code
+    In order to start making guesses on it
+    """
+
+    @base.BddTester.gherkin(['Goat'], ['Cat'])
+    def test_start_board(self):
+        """
+        Given even boards
+        Then the first board is added with the $animal
+        """
+
+    def the_first_board_is_added_with_the_animal(self, animal):
+        assert self.get_output('game')['boards'] in (6, 8)
+
+
+class TestDrawBoard(NewGame):
+    """
+    As a codebreaker
+    I want to draw a board
+    In order to see it
+    """
+
+    @base.BddTester.gherkin(['Goat'], ['Cat'])
+    def test_draw_board(self):
+        """
+        Given even boards
+        Then the board is drawn with the $animal
+        """
+
+    async def the_board_is_drawn_with_the_animal(self, animal):
+        record_loop()
+        assert self.event_loop is asyncio.get_running_loop()
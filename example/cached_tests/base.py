@@ -0,0 +1,8 @@
+from bdd_coder.cache import StepCache
+from bdd_coder import decorators
+from bdd_coder import tester
+
+
+class BddTester(tester.BddTester):
+    gherkin = decorators.Gherkin(logs_path='example/cached_tests/bdd_runs.log',
+                                 step_cache=StepCache('example/cached_tests/.bdd-step-cache'))
@@ -0,0 +1,28 @@
+import os
+
+from . import base
+
+
+class TestNewGame(base.BddTester):
+    """
+    As a codebreaker
+    I want to start a new Mastermind game of B boards of G guesses
+    In order to play
+    """
+
+    @base.BddTester.gherkin([6], [8], [6])
+    def test_even_boards(self):
+        """
+        Given a seeded `database` with $n boards
+        Then the database has n boards
+        """
+
+    @base.BddTester.gherkin.cacheable
+    def a_seeded_database_with_n_boards(self, n):
+        with open(os.environ.get('BDD_CALLS_PATH', os.devnull), 'a') as calls_file:
+            calls_file.write(f'{n}\n')
+
+        return {'boards': list(range(n))},
+
+    def the_database_has_n_boards(self, n):
+        assert len(self.get_output('database')['boards']) == n
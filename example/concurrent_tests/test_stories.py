@@ -0,0 +1,68 @@
+import asyncio
+import threading
+
+from . import base
+
+SEEDING = threading.Barrier(3, timeout=5)  # Steps seeding at once, or failing
+
+
+def teardown_module():
+    base.BddTester.gherkin.log(fail_if_pending=True)
+
+
+class SeededServices(base.BddTester):
+    """
+    As a codebreaker
+    I want the stand-in services seeded at once
+    In order to start playing sooner
+    """
+
+    @base.BddTester.gherkin()
+    def seeded_services(self):
+        """
+        Given the `users` service is seeded with $(3) players
+        And the `codes` service is seeded
+        And the `scores` service is seeded
+        """
+
+    @base.BddTester.gherkin.concurrent
+    def the_users_service_is_seeded_with_players(self):
+        SEEDING.wait()
+
+        return [f'player-{i}' for i in range(int(self.param))],
+
+    @base.BddTester.gherkin.concurrent
+    def the_codes_service_is_seeded(self):
+        SEEDING.wait()
+
+        return ['RGBY', 'YBGR'],
+
+    @base.BddTester.gherkin.concurrent
+    async def the_scores_service_is_seeded(self):
+        await asyncio.get_running_loop().run_in_executor(None, SEEDING.wait)
+
+        return {},
+
+
+class TestNewGame(SeededServices):
+    """
+    As a codebreaker
+    I want to start a new Mastermind game
+    In order to play
+    """
+
+    @base.BddTester.gherkin()
+    def test_new_game(self):
+        """
+        Given seeded services
+        When I request a new `game`
+        Then the game has a code and no scores
+        """
+
+    def i_request_a_new_game(self):
+        return {'players': self.get_output('users'), 'code': self.get_output('codes')[0]},
+
+    def the_game_has_a_code_and_no_scores(self):
+        assert self.get_output('game') == {'players': ['player-0', 'player-1', 'player-2'],
+                                           'code': 'RGBY'}
+        assert self.get_output('scores') == {}
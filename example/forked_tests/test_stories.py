@@ -0,0 +1,72 @@
+import os
+
+from . import base
+
+
+def teardown_module():
+    base.BddTester.gherkin.log(fail_if_pending=True)
+
+
+def record_call(name):
+    with open(os.environ.get('BDD_CALLS_PATH', os.devnull), 'a') as calls_file:
+        calls_file.write(f'{name}\n')
+
+
+class TestNewGame(base.BddTester):
+    """
+    As a codebreaker
+    I want to start a new Mastermind game of B boards of G guesses
+    In order to play
+    """
+
+    @base.BddTester.gherkin()
+    def a_started_game(self):
+        """
+        Given a seeded `database`
+        And a new `game` in the database
+        """
+
+    @base.BddTester.gherkin()
+    def test_six_boards(self):
+        """
+        Given a started game
+        When I add $(6) boards
+        Then the game has the boards
+        """
+
+    @base.BddTester.gherkin()
+    def test_eight_boards(self):
+        """
+        Given a started game
+        When I add $(8) boards
+        Then the game has the boards
+        """
+
+    @base.BddTester.gherkin()
+    def test_no_boards(self):
+        """
+        Given a started game
+        Then the game has no boards
+        """
+
+    def a_seeded_database(self):
+        record_call('a_seeded_database')
+
+        return {'games': []},
+
+    def a_new_game_in_the_database(self):
+        record_call('a_new_game_in_the_database')
+        self.get_output('database')['games'].append([])
+
+        return self.get_output('database')['games'][-1],
+
+    def i_add_boards(self):
+        record_call(f'i_add_boards {self.param}')
+        self.boards = list(range(int(self.param)))
+        self.get_output('game').extend(self.boards)
+
+    def the_game_has_the_boards(self, request):
+        assert self.get_output('game') == self.boards
+
+    def the_game_has_no_boards(self, request):
+        assert self.get_output('game') == []
@@ -0,0 +1,81 @@
+from . import base
+
+
+def teardown_module():
+    base.BddTester.gherkin.log(fail_if_pending=True)
+
+
+class NewGame(base.BddTester):
+    """
+    As a codebreaker
+    I want to start a new Mastermind game of B boards of G guesses
+    In order to play
+    """
+
+    @base.BddTester.gherkin([7], [9])
+    def test_odd_boards(self):
+        """
+        When I request a new `game` with $n boards
+        Then I get a 400 response
+        """
+
+    @base.BddTester.gherkin()
+    def new_game(self):
+        """
+        When I request a new `game` with $(8) boards
+        """
+
+    def i_request_a_new_game_with_n_boards(self, n):
+        return 'game',
+
+    def i_get_a_400_response(self):
+        pass
+
+    def i_request_a_new_game_with_boards(self):
+        return 'game',
+
+
+class TestEvenBoards(NewGame):
+    """
+    As a codebreaker
+    I want an even number of boards
+    In order to play in pairs
+    """
+
+    @base.BddTester.gherkin()
+    def created_game(self):
+        """
+        Given new game
+        Then a game is created
+        """
+
+    @base.BddTester.gherkin()
+    def test_even_boards(self):
+        """
+        Given created game
+        """
+
+    def a_game_is_created(self):
+        pass
+
+
+class TestClearBoard(TestEvenBoards):
+    """
+    As a codebreaker
+    I want a clear board with a new code
+    In order to start making guesses on it
+    """
+
+    @base.BddTester.gherkin()
+    def test_start_board(self):
+        """
+        Given created game
+        When I request a clear `board` in my new game
+        Then the first board is added to the game
+        """
+
+    def i_request_a_clear_board_in_my_new_game(self):
+        return 'board',
+
+    def the_first_board_is_added_to_the_game(self):
+        pass
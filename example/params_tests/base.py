@@ -0,0 +1,6 @@
+from bdd_coder import decorators
+from bdd_coder import tester
+
+
+class BddTester(tester.BddTester):
+    gherkin = decorators.Gherkin(logs_path='example/params_tests/bdd_runs.log')
@@ -0,0 +1,53 @@
+from bdd_coder import params
+
+from . import base
+
+
+class NewGame(base.BddTester):
+    """
+    As a codebreaker
+    I want to start a new Mastermind game of B boards of G guesses
+    In order to play
+    """
+
+    @base.BddTester.gherkin(params.Pairwise(n=[6, 8], kind=['Boring', 'Funny'],
+                                            guess_count=[9, 11, 13]))
+    def even_boards(self):
+        """
+        When I request a new `game` with $n boards
+        Then a game of $kind is created with boards of $guess_count guesses
+        """
+
+    def i_request_a_new_game_with_n_boards(self, n):
+        return 'game',
+
+    def a_game_of_kind_is_created_with_boards_of_guess_count_guesses(self, kind, guess_count):
+        assert self.get_output('game') == 'game'
+
+
+class TestClearBoard(NewGame):
+    """
+    As a codebreaker
+    I want a clear board with a new code
+    In order to start making guesses on it
+    """
+
+    @base.BddTester.gherkin(params.Cartesian(animal=['Goat', 'Cat']))
+    def test_start_board(self):
+        """
+        Given even boards
+        Then the first board is added with the $animal
+        """
+
+    @base.BddTester.gherkin(params.RandomSample(3, seed=7, color=['Red', 'Green', 'Blue']))
+    def test_start_colored_board(self):
+        """
+        Given even boards
+        Then the first board is added with the $color
+        """
+
+    def the_first_board_is_added_with_the_animal(self, animal):
+        assert animal in ('Goat', 'Cat')
+
+    def the_first_board_is_added_with_the_color(self, color):
+        assert color in ('Red', 'Green', 'Blue')
@@ -0,0 +1,60 @@
+from . import base
+
+CALLS = {'database': 0, 'game': 0}
+
+
+class NewGame(base.BddTester):
+    """
+    As a codebreaker
+    I want to start a new Mastermind game of B boards of G guesses
+    In order to play
+    """
+
+    @base.BddTester.gherkin([6], [8])
+    def even_boards(self):
+        """
+        Given a populated `database`
+        When I request a new `game` with $n boards
+        """
+
+    @base.BddTester.gherkin.scoped('module')
+    def a_populated_database(self):
+        CALLS['database'] += 1
+
+        return 'database',
+
+    @base.BddTester.gherkin.scoped('class')
+    def i_request_a_new_game_with_n_boards(self, n):
+        CALLS['game'] += 1
+
+        return f'game of {n}',
+
+
+class TestClearBoard(NewGame):
+    """
+    As a codebreaker
+    I want a clear board with a new code
+    In order to start making guesses on it
+    """
+
+    @base.BddTester.gherkin(['Goat'], ['Cat'])
+    def test_start_board(self):
+        """
+        Given even boards
+        Then the first board is added with the $animal
+        """
+
+    @base.BddTester.gherkin()
+    def test_database(self):
+        """
+        Given a populated `database`
+        Then the database is shared
+        """
+
+    def the_first_board_is_added_with_the_animal(self, animal):
+        assert self.get_output('database') == 'database'
+        assert self.get_output('game') in ('game of 6', 'game of 8')
+
+    def the_database_is_shared(self):
+        assert self.get_output('database') == 'database'
+        assert CALLS == {'database': 1, 'game': 2}
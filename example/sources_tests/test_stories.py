@@ -0,0 +1,55 @@
+from bdd_coder import params
+
+from . import base
+
+
+class NewGame(base.BddTester):
+    """
+    As a codebreaker
+    I want to start a new Mastermind game of B boards of G guesses
+    In order to play
+    """
+
+    @base.BddTester.gherkin(params.CsvSource('boards.csv'))
+    def even_boards(self):
+        """
+        When I request a new `game` with $n boards
+        Then a game of $kind is created
+        """
+
+    def i_request_a_new_game_with_n_boards(self, n):
+        assert isinstance(n, int)
+
+        return 'game',
+
+    def a_game_of_kind_is_created(self, kind):
+        assert self.get_output('game') == 'game'
+
+
+class TestClearBoard(NewGame):
+    """
+    As a codebreaker
+    I want a clear board with a new code
+    In order to start making guesses on it
+    """
+
+    @base.BddTester.gherkin()
+    def test_start_board(self):
+        """
+        Given the first board is added with the $animal of $legs legs
+        And even boards
+        Examples: animals.jsonl
+        """
+
+    @base.BddTester.gherkin()
+    def test_start_colored_board(self):
+        """
+        Given the first board is added with the $color
+        Examples: colors.csv
+        """
+
+    def the_first_board_is_added_with_the_animal_of_legs_legs(self, animal, legs):
+        assert (animal, legs) in (('Goat', 4), ('Cat', 4), ('Hen', 2))
+
+    def the_first_board_is_added_with_the_color(self, color):
+        assert color in ('Red', 'Green')
@@ -0,0 +1,44 @@
+import tracemalloc
+
+from . import base
+
+ROW_COUNT = 50000
+
+
+def teardown_module():
+    base.BddTester.gherkin.log(fail_if_pending=True)
+
+
+class TestScores(base.BddTester):
+    """
+    As a codebreaker
+    I want my scores totalled
+    In order to compare them
+    """
+
+    @base.BddTester.gherkin()
+    def test_total_score(self):
+        """
+        Given the `rows` fetched from the scores service
+        When the `scores` are parsed from the rows
+        Then the total score is the sum of all scores
+        """
+
+    def the_rows_fetched_from_the_scores_service(self):
+        for i in range(ROW_COUNT):
+            yield f'player-{i},{i % 7}'
+
+    def the_scores_are_parsed_from_the_rows(self):
+        return (int(row.split(',')[1]) for row in self.get_output('rows')),
+
+    def the_total_score_is_the_sum_of_all_scores(self):
+        tracemalloc.start()
+
+        try:
+            total = sum(self.get_output('scores'))
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        assert total == sum(i % 7 for i in range(ROW_COUNT))
+        assert peak < 2**16
@@ -0,0 +1,24 @@
+from bdd_coder import params
+
+from . import base
+
+
+class TestNewGame(base.BddTester):
+    """
+    As a codebreaker
+    I want to start a new Mastermind game of B boards of G guesses
+    In order to play
+    """
+
+    @base.BddTester.gherkin(params.Cartesian(n=[6, 8], kind=['Boring', 'Funny']))
+    def test_even_boards(self):
+        """
+        When I request a new `game` with $n boards
+        Then a game of $kind is created with boards of $guess_count guesses
+        """
+
+    def i_request_a_new_game_with_n_boards(self, n):
+        return 'game',
+
+    def a_game_of_kind_is_created_with_boards_of_guess_count_guesses(self, kind, guess_count):
+        pass
@@ -8,7 +8,7 @@ ini.read('version.ini')
 with open('README.md', encoding='utf-8') as readme:
     long_description = readme.read()
 
-tests_require = ['pytest-cov', 'freezegun']
+tests_require = ['pytest-cov', 'freezegun', 'pytest-xdist']
 
 setuptools.setup(
     name=ini['version']['name'],
@@ -30,7 +30,7 @@ setuptools.setup(
         'Environment :: Console',
         'Intended Audience :: Developers'],
     packages=setuptools.find_packages(),
-    install_requires=['pyyaml', 'pygments', 'pytest', 'flake8', 'simple-cmd'],
+    install_requires=['pyyaml', 'pygments', 'pytest>=8,<10', 'flake8', 'simple-cmd'],
     setup_requires=['setuptools', 'configparser'],
     tests_require=tests_require,
     extras_require={
@@ -42,5 +42,8 @@ setuptools.setup(
     entry_points={'console_scripts': [
         'bdd-blueprint=bdd_coder.commands:make_blueprint',
         'bdd-patch=bdd_coder.commands:patch_blueprint',
-        'bdd-make-yaml-specs=bdd_coder.commands:make_yaml_specs']},
+        'bdd-make-yaml-specs=bdd_coder.commands:make_yaml_specs',
+        'bdd-run=bdd_coder.commands:run_scenarios',
+        'bdd-history=bdd_coder.commands:show_history'],
+        'pytest11': ['bdd_coder=bdd_coder.plugin']},
 )
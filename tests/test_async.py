@@ -0,0 +1,71 @@
+import os
+import shutil
+import subprocess
+import unittest
+
+from bdd_coder import decorators
+from bdd_coder import exceptions
+
+
+class AsyncStepsTests(unittest.TestCase):
+    tests_dir = 'tmp/async_tests'
+    calls_path = 'tmp/calls.txt'
+
+    def setUp(self):
+        shutil.copytree('example/async_tests', self.tests_dir)
+
+    def tearDown(self):
+        shutil.rmtree('tmp', ignore_errors=True)
+
+    def replace(self, name, old, new):
+        path = os.path.join(self.tests_dir, name)
+
+        with open(path) as py_file:
+            source = py_file.read()
+
+        with open(path, 'w') as py_file:
+            py_file.write(source.replace(old, new))
+
+    def run_pytest(self):
+        self.replace('base.py', 'example/async_tests', self.tests_dir)
+        process = subprocess.run(['pytest', '-p', 'no:cacheprovider', self.tests_dir], stdout=subprocess.PIPE,
+                                 env={**os.environ, 'BDD_CALLS_PATH': self.calls_path})
+
+        with open(self.calls_path) as calls_file:
+            loop_ids = calls_file.read().splitlines()
+
+        return process, loop_ids
+
+    def test_session_event_loop(self):
+        process, loop_ids = self.run_pytest()
+
+        assert process.returncode == 0, process.stdout.decode()
+        assert len(loop_ids) == 10
+        assert len(set(loop_ids)) == 1
+
+    def test_class_event_loops(self):
+        self.replace('base.py', 'Gherkin(', "Gherkin(event_loop_scope='class', ")
+        process, loop_ids = self.run_pytest()
+
+        assert process.returncode == 0, process.stdout.decode()
+        assert len(set(loop_ids[:4])) == 1
+        assert len(set(loop_ids[4:])) == 1
+        assert loop_ids[0] != loop_ids[-1]
+
+    def test_async_step_failure(self):
+        self.replace('test_stories.py', 'assert self.event_loop is asyncio.get_running_loop()',
+                     "assert animal == 'Goat'")
+        process, _ = self.run_pytest()
+        output = process.stdout.decode()
+
+        assert process.returncode == 1
+        assert '1 failed, 3 passed' in output
+        assert 'Traceback (most recent call last):\n  File "{}", line 77, in {}'.format(
+            os.path.abspath(os.path.join(self.tests_dir, 'test_stories.py')),
+            'the_board_is_drawn_with_the_animal') in output
+
+    def test_wrong_event_loop_scope(self):
+        with self.assertRaises(exceptions.WrongEventLoopScopeError) as cm:
+            decorators.Gherkin(event_loop_scope='module', logs_path='tmp/bdd_runs.log')
+
+        assert str(cm.exception) == 'Wrong event loop scope module: should be one of class, session'
@@ -0,0 +1,84 @@
+import json
+import os
+import shutil
+import subprocess
+import unittest
+
+
+class CollectionBenchmarkTests(unittest.TestCase):
+    baseline_path = 'tmp/collection.json'
+
+    def setUp(self):
+        os.makedirs('tmp')
+
+    def tearDown(self):
+        shutil.rmtree('tmp')
+
+    def run_benchmark(self, *args):
+        return subprocess.run(['python', 'benchmarks/collection.py', '--sizes', '2x3x4',
+                               '--baseline', self.baseline_path, *args], stdout=subprocess.PIPE)
+
+    def test_update_and_check(self):
+        assert self.run_benchmark('--update').returncode == 0
+        assert self.run_benchmark('--dispatch', '--update').returncode == 0
+
+        with open(self.baseline_path) as json_file:
+            baseline = json.load(json_file)
+
+        assert set(baseline) == {'default', 'dispatch'}
+        assert baseline['default']['2x3x4']['tests'] == 6
+        assert baseline['default']['2x3x4']['bdd_coder'] > 0
+
+        process = self.run_benchmark('--tolerance', '100')
+
+        assert process.returncode == 0
+        assert process.stdout.decode().splitlines()[-1] == 'No regressions'
+
+    def test_regression(self):
+        with open(self.baseline_path, 'w') as json_file:
+            json.dump({'default': {'2x3x4': {'ratio': 0.00001}}}, json_file)
+
+        process = self.run_benchmark()
+
+        assert process.returncode == 1
+        assert 'bdd_coder/pytest time ratio' in process.stdout.decode()
+
+    def test_committed_baseline(self):
+        with open('benchmarks/collection.json') as json_file:
+            baseline = json.load(json_file)
+
+        assert set(baseline) == {'default', 'dispatch'}
+        assert [result['tests'] for result in baseline['default'].values()] == [100, 500, 2000]
+
+
+class StepsBenchmarkTests(unittest.TestCase):
+    def setUp(self):
+        os.makedirs('tmp')
+
+    def tearDown(self):
+        shutil.rmtree('tmp')
+
+    def test_overheads(self):
+        for args in ([], ['--dispatch']):
+            subprocess.check_output(['python', 'benchmarks/steps.py', '--step-counts', '2',
+                                     '--depths', '0', '1', '--scenarios', '3',
+                                     '--output', 'tmp/steps.json', *args])
+
+            with open('tmp/steps.json') as json_file:
+                results = json.load(json_file)
+
+            assert [(r['steps'], r['depth']) for r in results] == [(2, 0), (4, 1)]
+            assert all(r['bdd_us'] > r['plain_us'] > 0 for r in results)
+            assert all(abs(r['step_overhead_us'] - r['scenario_overhead_us']/r['steps']) <= 0.1
+                       for r in results)
+
+    def test_fail_first(self):
+        subprocess.check_output(['python', 'benchmarks/steps.py', '--step-counts', '3',
+                                 '--depths', '1', '--scenarios', '3', '--fail-first',
+                                 '--output', 'tmp/steps.json'])
+
+        with open('tmp/steps.json') as json_file:
+            results = json.load(json_file)
+
+        assert [(r['steps'], r['depth']) for r in results] == [(6, 1)]
+        assert all(r['bdd_us'] > r['plain_us'] > 0 for r in results)
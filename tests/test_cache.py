@@ -0,0 +1,154 @@
+import os
+import shutil
+import subprocess
+import unittest
+
+from bdd_coder.cache import StepCache
+from bdd_coder import exceptions
+
+CACHE_MISSES_SOURCE = '''from bdd_coder.cache import StepCache
+from bdd_coder import decorators
+from bdd_coder import tester
+
+
+class Board:
+    """Has the default repr"""
+
+
+class BddTester(tester.BddTester):
+    gherkin = decorators.Gherkin(validate=False, logs_path='tmp/bdd_runs.log',
+                                 step_cache=StepCache('tmp/cache'))
+
+
+class TestMisses(BddTester):
+    @BddTester.gherkin([Board()])
+    def test_unstable_key(self):
+        """
+        Given a `drawing` of $board
+        """
+
+    @BddTester.gherkin.cacheable
+    def a_drawing_of_board(self, board):
+        return str(board),
+
+    @BddTester.gherkin()
+    def test_unpicklable_result(self):
+        """
+        Given a `counter`
+        """
+
+    @BddTester.gherkin.cacheable
+    def a_counter(self):
+        return (lambda: 0),
+'''
+
+
+class StepCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.cache = StepCache('tmp/cache', max_bytes=300)
+
+    def tearDown(self):
+        shutil.rmtree('tmp', ignore_errors=True)
+
+    def test_get_set(self):
+        self.assertRaises(KeyError, self.cache.get, 'a')
+        assert self.cache.set('a', ('value', [1, 2]))
+        assert self.cache.get('a') == ('value', [1, 2])
+        assert not self.cache.set('b', (lambda: 0,))
+        self.assertRaises(KeyError, self.cache.get, 'b')
+
+    def test_unreadable(self):
+        os.makedirs('tmp/cache')
+
+        with open(self.cache.get_file_path('a'), 'w') as pickle_file:
+            pickle_file.write('not a pickle')
+
+        self.assertRaises(KeyError, self.cache.get, 'a')
+        assert not os.path.exists(self.cache.get_file_path('a'))
+
+    def test_lru_eviction(self):
+        for key in 'abc':
+            self.cache.set(key, 'x'*80)
+            os.utime(self.cache.get_file_path(key), (0, 'abc'.index(key)))
+
+        self.cache.get('a')
+        self.cache.set('d', 'x'*80)
+
+        assert sorted(os.path.basename(p)[0] for p in self.cache.iter_file_paths()) == ['a', 'c', 'd']
+
+    def test_keys(self):
+        def step(self, n):
+            return n,
+
+        def other_step(self, n):
+            return -n,
+
+        key = StepCache.make_key(step, [], 1)
+
+        assert key == StepCache.make_key(step, [], 1)
+        assert key != StepCache.make_key(step, [], 2)
+        assert key != StepCache.make_key(other_step, [], 1)
+        self.assertRaises(exceptions.UnstableCacheKeyError, StepCache.make_key, step, [], object())
+
+    def test_clear(self):
+        self.cache.set('a', 1)
+        self.cache.clear()
+
+        assert not os.path.exists('tmp/cache')
+
+
+class CacheableStepsTests(unittest.TestCase):
+    calls_path = 'tmp/calls.txt'
+    cache_path = 'example/cached_tests/.bdd-step-cache'
+
+    def setUp(self):
+        os.makedirs('tmp')
+
+    def tearDown(self):
+        shutil.rmtree('tmp')
+        shutil.rmtree(self.cache_path, ignore_errors=True)
+
+        for name in filter(lambda n: n.startswith('bdd_runs.'), os.listdir('example/cached_tests')):
+            os.remove(os.path.join('example/cached_tests', name))
+
+    def run_pytest(self, *args):
+        subprocess.check_output(['pytest', '-p', 'no:cacheprovider', 'example/cached_tests', *args],
+                                env={**os.environ, 'BDD_CALLS_PATH': self.calls_path})
+
+        with open(self.calls_path) as calls_file:
+            return calls_file.read().split()
+
+    def test_cached_across_sessions(self):
+        assert self.run_pytest() == ['6', '8']
+        assert len(os.listdir(self.cache_path)) == 2
+        assert self.run_pytest() == ['6', '8']
+
+        with open('example/cached_tests/bdd_runs.log') as log_file:
+            assert log_file.read().count('TestNewGame.a_seeded_database_with_n_boards (cached)') == 4
+
+        assert self.run_pytest('--bdd-cache-clear') == ['6', '8', '6', '8']
+
+
+class CacheMissesTests(unittest.TestCase):
+    def setUp(self):
+        os.makedirs('tmp')
+
+        with open('tmp/test_cache_misses.py', 'w') as py_file:
+            py_file.write(CACHE_MISSES_SOURCE)
+
+    def tearDown(self):
+        shutil.rmtree('tmp')
+
+    def test_logged(self):
+        process = subprocess.run(['pytest', '-p', 'no:cacheprovider', 'tmp/test_cache_misses.py'],
+                                 stdout=subprocess.PIPE)
+
+        with open('tmp/bdd_runs.log') as log_file:
+            log = log_file.read()
+
+        assert process.returncode == 0, process.stdout.decode()
+        assert not os.path.exists('tmp/cache')
+        assert '├─Step cache miss: Step cache key part <test_cache_misses.Board object at 0x' in log
+        assert ('is not stable across sessions, having a memory address in its repr - define '
+                '__repr__ to cache TestMisses.a_drawing_of_board\n') in log
+        assert '├─Step cache miss: TestMisses.a_counter result could not be pickled\n' in log
@@ -46,11 +46,12 @@ class BlueprintTester(unittest.TestCase):
 
 class CoderTests(BlueprintTester):
     def test_pytest_output(self):
-        lines = self.coder_output.splitlines()
-        output = '\n'.join([lines[0], 'platform linux -- Python [L1-4]'] + lines[5:12])
+        lines = [line for line in self.coder_output.splitlines()
+                 if not line.startswith(('cachedir:', 'rootdir:', 'configfile:', 'plugins:'))]
+        output = '\n'.join([lines[0], 'platform linux -- Python [L1-4]'] + lines[2:9])
 
         assert output == PYTEST_OUTPUT
-        assert lines[17] == "E       fixture 'guess_count' not found"
+        assert lines[14] == "E       fixture 'guess_count' not found"
 
     def test_pass_flake8(self):
         try:
@@ -0,0 +1,68 @@
+import os
+import shutil
+import subprocess
+import unittest
+
+
+class ConcurrentStepsTests(unittest.TestCase):
+    tests_dir = 'tmp/concurrent_tests'
+    logs_path = 'tmp/concurrent_tests/bdd_runs.log'
+
+    def setUp(self):
+        shutil.copytree('example/concurrent_tests', self.tests_dir,
+                        ignore=shutil.ignore_patterns('bdd_runs*'))
+        self.replace('base.py', 'example/concurrent_tests', self.tests_dir)
+
+    def tearDown(self):
+        shutil.rmtree('tmp', ignore_errors=True)
+
+    def replace(self, name, old, new):
+        path = os.path.join(self.tests_dir, name)
+
+        with open(path) as py_file:
+            source = py_file.read()
+
+        with open(path, 'w') as py_file:
+            py_file.write(source.replace(old, new))
+
+    def run_pytest(self):
+        process = subprocess.run(['pytest', '-p', 'no:cacheprovider', self.tests_dir],
+                                 stdout=subprocess.PIPE)
+
+        with open(self.logs_path) as log_file:
+            step_lines = [line.split(' ', 2)[2] for line in log_file.read().splitlines()
+                          if line.startswith(('├─', '└─'))]
+
+        return process, step_lines
+
+    def assert_passed(self):
+        process, step_lines = self.run_pytest()
+
+        assert process.returncode == 0, process.stdout.decode()
+        assert step_lines == [
+            '✔ SeededServices.the_users_service_is_seeded_with_players',
+            '✔ SeededServices.the_codes_service_is_seeded ',
+            '✔ SeededServices.the_scores_service_is_seeded ',
+            '✅ SeededServices.seeded_services',
+            '✔ TestNewGame.i_request_a_new_game ',
+            '✔ TestNewGame.the_game_has_a_code_and_no_scores ',
+            '✅ TestNewGame.test_new_game']
+
+    def test_concurrent_steps(self):
+        self.assert_passed()
+
+    def test_concurrent_steps_dispatched(self):
+        self.replace('base.py', 'Gherkin(', 'Gherkin(dispatch=True, ')
+        self.assert_passed()
+
+    def test_failure_as_sequential(self):
+        self.replace('test_stories.py', "return ['RGBY', 'YBGR'],", "raise AssertionError('No codes')")
+        process, step_lines = self.run_pytest()
+
+        assert process.returncode == 1
+        assert "AssertionError: No codes" in process.stdout.decode()
+        assert step_lines == [
+            '✔ SeededServices.the_users_service_is_seeded_with_players',
+            '✖ SeededServices.the_codes_service_is_seeded ↦ Traceback (most recent call last):',
+            '❌ SeededServices.seeded_services',
+            '❌ TestNewGame.test_new_game']
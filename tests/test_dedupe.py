@@ -0,0 +1,70 @@
+import os
+import shutil
+import subprocess
+import unittest
+
+
+class InheritedTestsTests(unittest.TestCase):
+    tests_dir = 'tmp/inherited_tests'
+
+    def tearDown(self):
+        shutil.rmtree('tmp', ignore_errors=True)
+
+        for name in filter(lambda n: n.startswith('bdd_runs.'), os.listdir('example/inherited_tests')):
+            os.remove(os.path.join('example/inherited_tests', name))
+
+    @staticmethod
+    def run_pytest(tests_dir, *args):
+        output = subprocess.check_output(['pytest', '-v', '-p', 'no:cacheprovider', tests_dir, *args])
+
+        return output.decode().splitlines()
+
+    @staticmethod
+    def get_passed(lines):
+        return [line.split('::', 1)[1].split(' ')[0] for line in lines if 'PASSED' in line]
+
+    def assert_deduped(self, lines):
+        assert self.get_passed(lines) == [
+            'TestEvenBoards::test_odd_boards[7]', 'TestEvenBoards::test_odd_boards[9]',
+            'TestEvenBoards::test_even_boards[8]', 'TestClearBoard::test_start_board[8]']
+        assert lines.count('  NewGame.test_odd_boards: TestClearBoard') == 1
+        assert lines.count('  TestEvenBoards.test_even_boards: TestClearBoard') == 1
+        assert '4 passed, 3 deselected' in lines[-1]
+
+    def test_not_deduped(self):
+        lines = self.run_pytest('example/inherited_tests')
+
+        assert len(self.get_passed(lines)) == 7
+        assert 'TestClearBoard::test_odd_boards[7]' in self.get_passed(lines)
+
+    def test_deduped_by_option(self):
+        self.assert_deduped(self.run_pytest('example/inherited_tests', '--bdd-dedupe-tests'))
+
+    def test_deduped_by_gherkin(self):
+        shutil.copytree('example/inherited_tests', self.tests_dir)
+        base_path = os.path.join(self.tests_dir, 'base.py')
+
+        with open(base_path) as base_file:
+            source = base_file.read()
+
+        with open(base_path, 'w') as base_file:
+            base_file.write(source.replace('Gherkin(', 'Gherkin(dedupe_tests=True, '))
+
+        self.assert_deduped(self.run_pytest(self.tests_dir))
+
+    def test_whole_hierarchy_validated(self):
+        shutil.copytree('example/inherited_tests', self.tests_dir)
+        stories_path = os.path.join(self.tests_dir, 'test_stories.py')
+
+        with open(stories_path) as stories_file:
+            source = stories_file.read()
+
+        with open(stories_path, 'w') as stories_file:
+            stories_file.write(source.replace('        Given created game\n        When I request a clear',
+                                              '        When I request a clear'))
+
+        process = subprocess.run(['pytest', '-p', 'no:cacheprovider', self.tests_dir,
+                                  '--bdd-dedupe-tests'], stdout=subprocess.PIPE)
+
+        assert process.returncode == 1
+        assert "bases {'EvenBoards'} declared in ClearBoard do not match" in process.stdout.decode()
@@ -0,0 +1,51 @@
+import os
+import shutil
+import subprocess
+import unittest
+
+
+class DispatchTests(unittest.TestCase):
+    tests_dir = 'tmp/dispatch_tests'
+
+    def setUp(self):
+        shutil.copytree('example/new_advanced_tests', self.tests_dir)
+        base_path = os.path.join(self.tests_dir, 'base.py')
+
+        with open(base_path) as base_file:
+            source = base_file.read()
+
+        with open(base_path, 'w') as base_file:
+            base_file.write(source.replace('Gherkin(', 'Gherkin(dispatch=True, '))
+
+    def tearDown(self):
+        shutil.rmtree('tmp')
+
+        for name in filter(lambda n: n.startswith('bdd_runs.'),
+                           os.listdir('example/new_advanced_tests')):
+            os.remove(os.path.join('example/new_advanced_tests', name))
+
+    @staticmethod
+    def run_pytest(tests_dir, *args):
+        process = subprocess.run(['pytest', '-v', '-p', 'no:cacheprovider', tests_dir, *args],
+                                 stdout=subprocess.PIPE)
+
+        return [line.split('::', 1)[1] for line in process.stdout.decode().splitlines()
+                if line.startswith(tests_dir) and '::' in line]
+
+    def test_same_tests(self):
+        assert self.run_pytest(self.tests_dir, '--collect-only') == self.run_pytest(
+            'example/new_advanced_tests', '--collect-only')
+
+    def test_same_outcomes(self):
+        outcomes = self.run_pytest(self.tests_dir)
+
+        assert [line.split('%')[0] for line in outcomes] == [
+            line.split('%')[0] for line in self.run_pytest('example/new_advanced_tests')]
+        assert any('PASSED' in line for line in outcomes)
+
+    def test_step_fixtures_not_registered(self):
+        output = subprocess.check_output(['pytest', '-p', 'no:cacheprovider', '--fixtures-per-test',
+                                          self.tests_dir]).decode()
+
+        assert 'i_request_a_new_game' not in output
+        assert 'test_test_scenario' in output
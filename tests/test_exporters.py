@@ -0,0 +1,55 @@
+import json
+import os
+import subprocess
+import unittest
+
+from bdd_coder import exporters
+
+
+class ChromeTraceTests(unittest.TestCase):
+    trace_path = 'tmp-trace.json'
+
+    def tearDown(self):
+        for path in (self.trace_path, 'tmp-trace.gw3.json', 'tmp-merged.json'):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def run_pytest(self, **env):
+        subprocess.run(['pytest', 'example/advanced_tests'], stdout=subprocess.PIPE,
+                       env=dict(os.environ, BDD_CHROME_TRACE=self.trace_path, **env))
+
+    def load_events(self, path):
+        with open(path) as trace_file:
+            return json.load(trace_file)['traceEvents']
+
+    def test_spans(self):
+        self.run_pytest()
+        metadata, *events = self.load_events(self.trace_path)
+        spans = {(e['name'], e['args']['test_id']): e for e in events}
+        scenario = spans[('TestClearBoard.test_start_board', 'test_start_board[Cat-6-Funny-11]')]
+        doc_scenario = spans[('NewGame.even_boards', 'test_start_board[Cat-6-Funny-11]')]
+        step = spans[('NewGame.i_request_a_new_game_with_n_boards',
+                      'test_start_board[Cat-6-Funny-11]')]
+
+        assert metadata['args'] == {'name': 'main'}
+        assert len(events) == 27
+        assert {e['cat'] for e in events} == {'scenario', 'step'}
+        assert scenario['args'] == {'test_id': 'test_start_board[Cat-6-Funny-11]',
+                                    'outcome': 'passed', 'params': {
+                                        'n': '6', 'kind': "'Funny'", 'guess_count': '11',
+                                        'animal': "'Cat'"}}
+        assert step['args']['params'] == {'n': '6'}
+        assert scenario['ts'] <= doc_scenario['ts'] <= step['ts']
+        assert step['ts'] + step['dur'] <= doc_scenario['ts'] + doc_scenario['dur'] <= (
+            scenario['ts'] + scenario['dur'])
+        assert spans[('NewGame.test_odd_boards', 'test_odd_boards[even-9]')][
+            'args']['outcome'] == 'failed'
+
+    def test_worker_lanes(self):
+        self.run_pytest(PYTEST_XDIST_WORKER='gw3')
+        self.run_pytest()
+        exporters.merge_chrome_traces([self.trace_path, 'tmp-trace.gw3.json'], 'tmp-merged.json')
+        events = self.load_events('tmp-merged.json')
+
+        assert sorted(e['args']['name'] for e in events if e['ph'] == 'M') == ['gw3', 'main']
+        assert len({e['pid'] for e in events}) == 2
@@ -57,3 +57,33 @@ class StepSpecTests(unittest.TestCase):
             exceptions.FeaturesSpecError,
             r'^Repeated parameter names in \(\+\) param_and_param \[param, param\] ↦ \(\)$',
             features.StepSpec, 'Given $param and $param', 0)
+
+    def test_examples_line(self):
+        lines = ['Given $n boards', '  Examples: boards.csv', 'Then a game']
+
+        assert [s.name for s in features.StepSpec.generate_steps(lines)] == ['n_boards', 'a_game']
+        assert features.find_examples_path(lines) == 'boards.csv'
+        assert features.find_examples_path(lines[:1]) is None
+
+
+class FeatureClassSpecTests(unittest.TestCase):
+    scenarios = [dict(title='Even boards', doc_lines=['Given a populated `database`'])]
+
+    def test_step_scopes(self):
+        spec = features.FeatureClassSpec('NewGame', self.scenarios,
+                                         step_scopes={'a_populated_database': 'session'})
+
+        assert spec.step_scopes == {'a_populated_database': 'session'}
+
+    def test_wrong_step_scope(self):
+        self.assertRaisesRegex(
+            exceptions.FeaturesSpecError, r"^Wrong step scopes in NewGame: \{'a_populated_database': "
+            r"'package'\}, should be one of function, class, module, session$",
+            features.FeatureClassSpec, 'NewGame', self.scenarios,
+            step_scopes={'a_populated_database': 'package'})
+
+    def test_unknown_scoped_step(self):
+        self.assertRaisesRegex(
+            exceptions.FeaturesSpecError, r'^Scopes of unknown steps in NewGame: a_clean_database$',
+            features.FeatureClassSpec, 'NewGame', self.scenarios,
+            step_scopes={'a_clean_database': 'module'})
@@ -0,0 +1,63 @@
+import os
+import shutil
+import subprocess
+import unittest
+
+
+class AffectedSelectionTests(unittest.TestCase):
+    tests_dir = 'tmp/affected_tests'
+
+    def setUp(self):
+        shutil.copytree('example/advanced_tests', self.tests_dir)
+
+    def tearDown(self):
+        shutil.rmtree('tmp')
+
+        for name in filter(lambda n: n.startswith('bdd_runs.'), os.listdir('example/advanced_tests')):
+            os.remove(os.path.join('example/advanced_tests', name))
+
+    def run_pytest(self, *args):
+        process = subprocess.run(['pytest', '-v', '-o', 'cache_dir=tmp/cache', self.tests_dir, *args],
+                                 stdout=subprocess.PIPE)
+
+        return sorted({line.split('::', 1)[1].split()[0] for line in process.stdout.decode().splitlines()
+                       if line.startswith(self.tests_dir) and '::' in line})
+
+    def edit_stories(self, old, new):
+        path = os.path.join(self.tests_dir, 'test_stories.py')
+
+        with open(path) as stories_file:
+            source = stories_file.read()
+
+        with open(path, 'w') as stories_file:
+            stories_file.write(source.replace(old, new))
+
+    def test_affected(self):
+        failing = ['TestClearBoard::test_odd_boards[even-9]',  # The last one fails on teardown
+                   'TestClearBoard::test_start_colored_board[1-Green-6-Funny-11]']
+
+        assert len(self.run_pytest()) == 5
+        assert self.run_pytest('--bdd-affected') == failing
+
+        self.edit_stories('        print(animal)\n', '        print(animal, animal)\n')
+
+        assert self.run_pytest('--bdd-affected') == sorted(failing + [
+            'TestClearBoard::test_start_board[Cat-6-Funny-11]',
+            'TestClearBoard::test_start_board[Goat-8-Boring-9]'])
+        assert self.run_pytest('--bdd-affected') == failing
+
+    def test_xdist(self):
+        self.run_pytest('-n', '2')  # Each worker tears the class down after its last test
+
+        assert self.run_pytest('--bdd-affected') == ['TestClearBoard::test_odd_boards[even-9]']
+
+    def test_doc_scenario_chain(self):
+        self.run_pytest()
+        self.edit_stories('guess_count):\n        pass\n', 'guess_count):\n        return\n')
+
+        assert self.run_pytest('--bdd-affected') == [
+            'TestClearBoard::test_odd_boards[even-9]',
+            'TestClearBoard::test_start_board[Cat-6-Funny-11]',
+            'TestClearBoard::test_start_board[Goat-8-Boring-9]',
+            'TestClearBoard::test_start_colored_board[0-Red-8-Boring-9]',
+            'TestClearBoard::test_start_colored_board[1-Green-6-Funny-11]']
@@ -0,0 +1,246 @@
+import os
+import shutil
+import subprocess
+import unittest
+
+FORK_HOOKS_SOURCE = '''import os
+
+from bdd_coder.cache import StepCache
+from bdd_coder import decorators
+from bdd_coder import tester
+
+
+def record_call(name):
+    with open(os.environ['BDD_CALLS_PATH'], 'a') as calls_file:
+        calls_file.write(f'{name}\\n')
+
+
+class BddTester(tester.BddTester):
+    gherkin = decorators.Gherkin(validate=False, logs_path='tmp/bdd_runs.log',
+                                 step_cache=StepCache('tmp/cache'))
+
+
+class TestSetUp(BddTester):
+    @classmethod
+    def setup_class(cls):
+        super().setup_class()
+        record_call('setup_class')
+        cls.seeded = True
+
+    @classmethod
+    def teardown_class(cls):
+        record_call('teardown_class')
+        super().teardown_class()
+
+    @BddTester.gherkin([6], [8])
+    def test_boards(self):
+        """
+        Given a seeded database
+        When I add $n boards
+        """
+
+    def a_seeded_database(self):
+        record_call(f'a_seeded_database {self.seeded}')
+
+    def i_add_n_boards(self, n):
+        record_call(f'i_add_n_boards {n}')
+
+
+class TestCrash(BddTester):
+    @BddTester.gherkin([0], [3])
+    def test_exit(self):
+        """
+        Given a seeded database
+        When the process exits with $code
+        """
+
+    def a_seeded_database(self):
+        record_call('a_seeded_database')
+
+    def the_process_exits_with_code(self, code):
+        if code:
+            os._exit(code)
+
+
+class TestScoped(BddTester):
+    @BddTester.gherkin([1], [2])
+    def test_boards(self):
+        """
+        Given a module `database`
+        And a cached `seed`
+        When I add $n boards
+        """
+
+    @BddTester.gherkin.scoped('module')
+    def a_module_database(self):
+        record_call('a_module_database')
+
+        return 'database',
+
+    @BddTester.gherkin.cacheable
+    def a_cached_seed(self):
+        record_call('a_cached_seed')
+
+        return 'seed',
+
+    def i_add_n_boards(self, n):
+        record_call(f'i_add_n_boards {n}')
+        assert (self.get_output('database'), self.get_output('seed')) == ('database', 'seed')
+
+
+class TestScopedAgain(TestScoped):
+    pass
+
+
+class TestConcurrent(BddTester):
+    @BddTester.gherkin([1], [2])
+    def test_boards(self):
+        """
+        Given a seeded database
+        And a seeded game
+        When I add $n boards
+        """
+
+    @BddTester.gherkin.concurrent
+    def a_seeded_database(self):
+        record_call('a_seeded_database')
+
+    @BddTester.gherkin.concurrent
+    def a_seeded_game(self):
+        record_call('a_seeded_game')
+
+    def i_add_n_boards(self, n):
+        pass
+'''
+
+SETUP_METHOD_SOURCE = '''from bdd_coder import decorators
+from bdd_coder import tester
+
+
+class BddTester(tester.BddTester):
+    gherkin = decorators.Gherkin(validate=False, logs_path='tmp/bdd_runs.log')
+
+
+class TestSetUp(BddTester):
+    def setup_method(self):
+        self.seeded = True
+
+    @BddTester.gherkin()
+    def test_seeded(self):
+        """
+        Given a seeded database
+        """
+
+    def a_seeded_database(self):
+        assert self.seeded
+'''
+
+
+@unittest.skipUnless(hasattr(os, 'fork'), 'os.fork required')
+class ForkRunnerTests(unittest.TestCase):
+    calls_path = 'tmp/calls.txt'
+
+    def setUp(self):
+        os.makedirs('tmp')
+
+    def tearDown(self):
+        shutil.rmtree('tmp')
+
+        for tests_dir in ('example/forked_tests', 'example/advanced_tests'):
+            for name in filter(lambda n: n.startswith('bdd_runs.'), os.listdir(tests_dir)):
+                os.remove(os.path.join(tests_dir, name))
+
+    def run_pytest(self, tests_dir, *args):
+        process = subprocess.run(['pytest', '-v', '-p', 'no:cacheprovider', tests_dir, *args],
+                                 stdout=subprocess.PIPE,
+                                 env={**os.environ, 'BDD_CALLS_PATH': self.calls_path})
+
+        return process.returncode, process.stdout.decode()
+
+    def write_tests(self, source):
+        with open('tmp/test_forked.py', 'w') as py_file:
+            py_file.write(source)
+
+    def get_calls(self):
+        with open(self.calls_path) as calls_file:
+            return calls_file.read().splitlines()
+
+    def test_prefix_steps_run_once(self):
+        exit_code, output = self.run_pytest('example/forked_tests', '--bdd-fork')
+
+        assert exit_code == 0, output
+        assert '3 passed' in output
+        assert '4 prefix step runs, instead of 8' in output
+        assert self.get_calls() == ['a_seeded_database', 'a_new_game_in_the_database',
+                                    'i_add_boards 6', 'i_add_boards 8']
+
+        with open('example/forked_tests/bdd_runs.log') as log_file:
+            log_text = log_file.read()
+
+        assert log_text.count('TestNewGame.a_seeded_database (forked)') == 3
+        assert log_text.count('TestNewGame.i_add_boards (forked)') == 2
+        assert log_text.count('TestNewGame.the_game_has_the_boards (forked)') == 0
+        assert log_text.count('4✅') == 1
+
+    def test_unforked_runs(self):
+        exit_code, output = self.run_pytest('example/forked_tests')
+
+        assert exit_code == 0, output
+        assert self.get_calls().count('a_seeded_database') == 3
+
+    def test_same_outcomes(self):
+        def get_outcomes(output):
+            return sorted(line.split(' [')[0] for line in output.splitlines()
+                          if line.startswith('example/') and ('PASSED' in line or 'FAILED' in line))
+
+        exit_code, output = self.run_pytest('example/advanced_tests', '--bdd-fork')
+        _, unforked_output = self.run_pytest('example/advanced_tests')
+
+        assert exit_code == 1
+        assert get_outcomes(output) == get_outcomes(unforked_output)
+        assert any('FAILED' in line for line in get_outcomes(output))
+        assert 'These scenarios did not run: pending_scenario' in output
+
+    def test_class_setup_before_prefixes(self):
+        self.write_tests(FORK_HOOKS_SOURCE)
+        exit_code, output = self.run_pytest('tmp/test_forked.py', '--bdd-fork', '-k', 'TestSetUp')
+
+        assert exit_code == 0, output
+        assert '2 passed' in output
+        assert self.get_calls() == ['setup_class', 'a_seeded_database True', 'i_add_n_boards 6',
+                                    'i_add_n_boards 8', 'teardown_class']
+
+    def test_nested_fork_exit_code(self):
+        self.write_tests(FORK_HOOKS_SOURCE)
+        exit_code, output = self.run_pytest('tmp/test_forked.py', '--bdd-fork', '-k', 'TestCrash')
+
+        assert exit_code == 1, output
+        assert '1 failed, 1 passed' in output
+        assert 'Forked process exited with code 3' in output
+        assert self.get_calls() == ['a_seeded_database']
+
+    def test_setup_method_rejected(self):
+        self.write_tests(SETUP_METHOD_SOURCE)
+        exit_code, output = self.run_pytest('tmp/test_forked.py', '--bdd-fork')
+
+        assert exit_code == 4
+        assert self.run_pytest('tmp/test_forked.py')[0] == 0
+
+    def test_scoped_and_cached_prefix_steps(self):
+        self.write_tests(FORK_HOOKS_SOURCE)
+        exit_code, output = self.run_pytest('tmp/test_forked.py', '--bdd-fork', '-k', 'TestScoped')
+
+        assert exit_code == 0, output
+        assert '4 passed' in output
+        assert self.get_calls() == ['a_module_database', 'a_cached_seed', 'i_add_n_boards 1',
+                                    'i_add_n_boards 2', 'i_add_n_boards 1', 'i_add_n_boards 2']
+        assert os.listdir('tmp/cache')
+
+    def test_concurrent_steps_end_prefixes(self):
+        self.write_tests(FORK_HOOKS_SOURCE)
+        exit_code, output = self.run_pytest('tmp/test_forked.py', '--bdd-fork', '-k', 'TestConcurrent')
+
+        assert exit_code == 0, output
+        assert '2 passed' in output
+        assert '0 prefix step runs, instead of 0' in output
+        assert self.get_calls().count('a_seeded_game') == 2
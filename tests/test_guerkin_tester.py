@@ -1,7 +1,37 @@
 import os
+import shutil
 import subprocess
 import unittest
 
+FAILURE_TESTS_SOURCE = '''from bdd_coder import decorators
+from bdd_coder import tester
+
+
+class BddTester(tester.BddTester):
+    gherkin = decorators.Gherkin(validate=False, logs_path='tmp/bdd_runs.log')
+
+
+class TestFailure(BddTester):
+    """Failure"""
+
+    @BddTester.gherkin()
+    def test_failure(self):
+        """
+        Given a failing step
+        When a next step
+        Then a last step
+        """
+
+    def a_failing_step(self):
+        assert False, 'Forced error'
+
+    def a_next_step(self):
+        pass
+
+    def a_last_step(self):
+        pass
+'''
+
 
 class GherkinTesterTests(unittest.TestCase):
     pytest_outputs_dir = 'tests'
@@ -37,6 +67,16 @@ class GherkinTesterTests(unittest.TestCase):
     def test_parameter_collection(self):
         self.assert_pytest_failure_output('advanced_tests')
 
+    def test_slowest_steps_logged(self):
+        output = self.assert_pytest_fails('advanced_tests').exception.output.decode()
+        table = output.split('Slowest steps:', 1)[1].splitlines()[1:8]
+
+        assert table[0].split() == ['count', 'total', 'ms', 'p50', 'ms', 'p95', 'ms', 'max', 'ms',
+                                    'step']
+        assert {'5 NewGame.i_request_a_new_game_with_n_boards',
+                '1 NewGame.i_get_a_400_response_saying_it_must_be'} <= {
+            ' '.join(row.split()[::5]) for row in table[1:]}
+
     def test_redeclared_parameter_exception(self):
         output = self.assert_collection_error('wrong_tests/test_stories_redeclared_param.py')
 
@@ -47,6 +87,68 @@ class GherkinTesterTests(unittest.TestCase):
 
         assert 'RedeclaredParametersError: Redeclared parameter(s) n' in output
 
+    def test_wrong_param_domains_exception(self):
+        output = self.assert_collection_error('wrong_tests/test_stories_wrong_param_domains.py')
+
+        assert ('Parameter domains n, kind of scenario test_even_boards do not match the '
+                'parameters declared in doc: n, kind, guess_count' in output)
+
+    def test_param_strategies(self):
+        output = subprocess.check_output(['pytest', '-q', '--collect-only', 'example/params_tests'])
+        ids = [line.split('::')[-1] for line in output.decode().splitlines() if '::' in line]
+
+        assert ids == [f'test_start_board[{animal}-{row}]' for animal in ('Goat', 'Cat') for row in (
+            '6-Boring-9', '6-Funny-11', '6-Boring-13', '8-Boring-11', '8-Funny-9', '8-Funny-13')] + [
+            'test_start_colored_board[Red-8-Funny-9]', 'test_start_colored_board[Green-8-Funny-9]',
+            'test_start_colored_board[Blue-6-Boring-9]']
+
+    def test_param_sources(self):
+        output = subprocess.check_output(['pytest', '-v', 'example/sources_tests'])
+        ids = [line.split('::')[-1].split()[0] for line in output.decode().splitlines()
+               if 'PASSED' in line]
+
+        assert ids == [f'test_start_board[animals-{i}]' for i in range(3)] + [
+            f'test_start_colored_board[colors-{i}]' for i in range(2)]
+
+    def test_scoped_steps(self):
+        if os.path.exists('example/scoped_tests/bdd_runs.log'):
+            os.remove('example/scoped_tests/bdd_runs.log')
+
+        subprocess.check_output(['pytest', '-p', 'no:cacheprovider', 'example/scoped_tests'])
+
+        with open('example/scoped_tests/bdd_runs.log') as log_file:
+            lines = [line.split(' ', 2)[-1].rstrip() for line in log_file if line.startswith('├─')]
+
+        assert lines.count('✔ NewGame.a_populated_database') == 1
+        assert lines.count('✔ NewGame.a_populated_database (shared)') == 2
+        assert lines.count('✔ NewGame.i_request_a_new_game_with_n_boards') == 2
+
+    def test_steps_after_failure_not_set_up(self):
+        os.makedirs('tmp')
+        self.addCleanup(shutil.rmtree, 'tmp')
+
+        with open('tmp/test_failure.py', 'w') as py_file:
+            py_file.write(FAILURE_TESTS_SOURCE)
+
+        process = subprocess.run(['pytest', '-p', 'no:cacheprovider', '--setup-show',
+                                  'tmp/test_failure.py'], stdout=subprocess.PIPE)
+        output = process.stdout.decode()
+
+        assert 'AssertionError: Forced error' in output
+        assert 'SETUP    F a_failing_step' in output
+        assert 'SETUP    F a_next_step' not in output
+        assert 'SETUP    F a_last_step' not in output
+        assert '1 failed in' in output
+
+    def test_wrong_step_scope(self):
+        from bdd_coder import decorators
+        from bdd_coder import exceptions
+
+        self.assertRaisesRegex(
+            exceptions.WrongStepScopeError,
+            r'^Wrong step scope package: should be one of function, class, module, session$',
+            decorators.Gherkin.scoped, 'package')
+
     def test_wrong_param_values_exception(self):
         output = self.assert_collection_error('wrong_tests/test_stories_wrong_param_values.py')
 
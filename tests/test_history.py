@@ -0,0 +1,122 @@
+import os
+import shutil
+import subprocess
+import unittest
+import unittest.mock
+
+from bdd_coder import history
+from bdd_coder.text_utils import OK, FAIL
+
+HISTORY_BASE_SOURCE = '''from bdd_coder import decorators
+from bdd_coder import tester
+
+
+class BddTester(tester.BddTester):
+    gherkin = decorators.Gherkin(validate=False, logs_path='tmp/bdd_runs.log')
+'''
+
+HISTORY_TESTS_SOURCE = '''import bdd_base
+
+
+def teardown_module():
+    bdd_base.BddTester.gherkin.log()
+
+
+class Test{upper_name}(bdd_base.BddTester):
+    @bdd_base.BddTester.gherkin()
+    def test_{name}(self):
+        """
+        Given step {name}
+        """
+
+    def step_{name}(self):
+        pass
+'''
+
+
+def make_record(symbol, duration, n=1):
+    return {'test_id': f'test_x[{n}]', 'qualname': 'A.test_x', 'symbol': symbol,
+            'duration': duration, 'kwargs': {'n': repr(n)}, 'runs': [
+                {'qualname': 'A.step_one', 'symbol': OK, 'duration': duration/4,
+                 'kwargs': {'n': repr(n)}},
+                {'qualname': 'A.doc_scenario', 'test_id': f'test_x[{n}]', 'symbol': symbol,
+                 'duration': duration/2, 'kwargs': {}, 'runs': [
+                     {'qualname': 'A.step_two', 'symbol': symbol, 'duration': duration/2,
+                      'kwargs': {}}]}]}
+
+
+class RunHistoryTests(unittest.TestCase):
+    path = 'tmp-history.sqlite3'
+
+    def setUp(self):
+        self.history = history.RunHistory(self.path)
+
+        for commit_id, symbols, duration in (('c1', (OK, OK), 1.0), ('c1', (FAIL, OK), 2.0),
+                                             ('c2', (OK, OK), 4.0)):
+            self.history.record([make_record(symbol, duration, n)
+                                 for n, symbol in enumerate(symbols)], commit_id)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_rows(self):
+        assert self.history.query('SELECT kind, COUNT(*) FROM runs GROUP BY kind') == [
+            ('scenario', 6), ('step', 12), ('test', 6)]
+        assert self.history.query('SELECT DISTINCT commit_id, worker FROM sessions') == [
+            ('c1', 'main'), ('c2', 'main')]
+
+    def test_slowest(self):
+        assert self.history.get_slowest_scenarios() == [
+            ('A.test_x', 6, 7/3, 4.0), ('A.doc_scenario', 6, 7/6, 2.0)]
+        assert [row[0] for row in self.history.get_slowest_steps()] == ['A.step_two', 'A.step_one']
+
+    def test_trends(self):
+        assert self.history.get_trends() == {'A.test_x': [('c1', 1.5), ('c2', 4.0)]}
+
+    def test_flaky(self):
+        assert self.history.get_flaky() == [('A.test_x', '{"n": "0"}', 2, 3)]
+
+    def test_command(self):
+        process = subprocess.run(['bdd-history', self.path, '--limit', '1'],
+                                 stdout=subprocess.PIPE)
+        output = process.stdout.decode()
+
+        assert process.returncode == 0
+        assert '         6   2333.333   4000.000  A.test_x\n' in output
+        assert 'A.doc_scenario' not in output
+        assert '    A.test_x: c1 1500.000 ms → c2 4000.000 ms\n' in output
+        assert output.endswith('    2 flips in 3 runs  A.test_x {"n": "0"}\n')
+
+    def test_path_from_env(self):
+        for value, path in (('', ''), ('0', ''), ('1', '.bdd-history.sqlite3'), ('h.db', 'h.db')):
+            with unittest.mock.patch.dict(os.environ, {'BDD_HISTORY': value}):
+                assert history.RunHistory.path_from_env() == path
+
+    def test_gherkin_log(self):
+        subprocess.run(['pytest', 'example/advanced_tests'], stdout=subprocess.PIPE,
+                       env=dict(os.environ, BDD_HISTORY=self.path, BDD_COMMIT_ID='c3'))
+
+        assert self.history.query(
+            "SELECT outcome, COUNT(*) FROM runs JOIN sessions ON sessions.id = session_id "
+            "WHERE commit_id = 'c3' AND kind = 'test' GROUP BY outcome") == [
+                ('failed', 1), ('passed', 4)]
+
+    def test_once_per_session(self):
+        os.makedirs('tmp')
+        self.addCleanup(shutil.rmtree, 'tmp')
+
+        with open('tmp/bdd_base.py', 'w') as py_file:
+            py_file.write(HISTORY_BASE_SOURCE)
+
+        for name in ('a', 'b'):
+            with open(f'tmp/test_{name}.py', 'w') as py_file:
+                py_file.write(HISTORY_TESTS_SOURCE.format(name=name, upper_name=name.upper()))
+
+        subprocess.run(['pytest', '-p', 'no:cacheprovider', 'tmp'], stdout=subprocess.PIPE,
+                       env=dict(os.environ, BDD_HISTORY=self.path, BDD_COMMIT_ID='c4'))
+
+        assert self.history.query("SELECT COUNT(*) FROM sessions WHERE commit_id = 'c4'") == [(1,)]
+        assert self.history.query(
+            "SELECT qualname FROM runs JOIN sessions ON sessions.id = session_id "
+            "WHERE commit_id = 'c4' AND kind = 'test' ORDER BY qualname") == [
+                ('TestA.test_a',), ('TestB.test_b',)]
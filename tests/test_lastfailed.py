@@ -0,0 +1,103 @@
+import json
+import os
+import shutil
+import subprocess
+import unittest
+import unittest.mock
+
+from bdd_coder.decorators import Scenario
+from bdd_coder.lastfailed import case_key
+
+
+class LastFailedTests(unittest.TestCase):
+    tests_dir = 'tmp/last_failed_tests'
+
+    def setUp(self):
+        shutil.copytree('example/advanced_tests', self.tests_dir)
+
+    def tearDown(self):
+        shutil.rmtree('tmp')
+
+        for name in filter(lambda n: n.startswith('bdd_runs.'), os.listdir('example/advanced_tests')):
+            os.remove(os.path.join('example/advanced_tests', name))
+
+    def run_pytest(self, *args):
+        process = subprocess.run(['pytest', '-v', '-o', 'cache_dir=tmp/cache', self.tests_dir, *args],
+                                 stdout=subprocess.PIPE)
+
+        return sorted({line.split('::', 1)[1].split()[0] for line in process.stdout.decode().splitlines()
+                       if line.startswith(self.tests_dir) and '::' in line})
+
+    def edit_stories(self, old, new):
+        path = os.path.join(self.tests_dir, 'test_stories.py')
+
+        with open(path) as stories_file:
+            source = stories_file.read()
+
+        with open(path, 'w') as stories_file:
+            stories_file.write(source.replace(old, new))
+
+    def read_cases(self):
+        with open('tmp/cache/v/bdd_coder/lastfailed') as cases_file:
+            return [json.loads(case) for case in json.load(cases_file)]
+
+    def test_doc_scenario_failures(self):
+        self.edit_stories('guess_count):\n        pass\n',
+                          "guess_count):\n        assert kind != 'Funny'\n")
+
+        assert len(self.run_pytest()) == 5
+        assert self.read_cases() == [
+            ['NewGame.even_boards', {'guess_count': '11', 'kind': "'Funny'", 'n': '6'}],
+            ['NewGame.test_odd_boards', {'n': '9'}],
+            ['TestClearBoard.test_start_board', {
+                'animal': "'Cat'", 'guess_count': '11', 'kind': "'Funny'", 'n': '6'}],
+            ['TestClearBoard.test_start_colored_board', {
+                'color': "'Green'", 'guess_count': '11', 'kind': "'Funny'", 'n': '6',
+                'nth': '1'}]]
+
+        self.edit_stories("[1, 'Green']", "[7, 'Green']")  # Reaching the failed doc case
+
+        assert self.run_pytest('--bdd-last-failed') == [
+            'TestClearBoard::test_odd_boards[even-9]',
+            'TestClearBoard::test_start_board[Cat-6-Funny-11]',
+            'TestClearBoard::test_start_colored_board[7-Green-6-Funny-11]']
+
+        self.edit_stories("        assert kind != 'Funny'\n", '        pass\n')
+
+        assert len(self.run_pytest('--bdd-last-failed')) == 3
+        assert self.read_cases() == [['NewGame.test_odd_boards', {'n': '9'}]]
+        assert self.run_pytest('--bdd-last-failed') == ['TestClearBoard::test_odd_boards[even-9]']
+
+    def test_xdist(self):
+        self.edit_stories('guess_count):\n        pass\n',
+                          "guess_count):\n        assert kind != 'Funny'\n")
+        self.run_pytest('-n', '2')
+
+        assert [case[0] for case in self.read_cases()] == [
+            'NewGame.even_boards', 'NewGame.test_odd_boards', 'TestClearBoard.test_start_board',
+            'TestClearBoard.test_start_colored_board']
+
+        self.edit_stories("        assert kind != 'Funny'\n", '        pass\n')
+        self.run_pytest('-n', '2', '--bdd-last-failed')
+
+        assert self.read_cases() == [['NewGame.test_odd_boards', {'n': '9'}]]
+
+
+class CaseKeyTests(unittest.TestCase):
+    def tearDown(self):
+        for tests_dir in ('example/advanced_tests', 'example/params_tests'):
+            for name in filter(lambda n: n.startswith('bdd_runs.'), os.listdir(tests_dir)):
+                os.remove(os.path.join(tests_dir, name))
+
+    def test_refined_param_names(self):
+        from example.advanced_tests import base as advanced_base, test_stories  # noqa: F401
+        from example.params_tests import base as params_base, test_stories as params_stories  # noqa: F401
+
+        scenarios = [*advanced_base.BddTester.gherkin, *params_base.BddTester.gherkin]
+
+        for scenario in scenarios:
+            assert scenario.refined_param_names == scenario.refine()[1], scenario.qualname
+
+        with unittest.mock.patch.object(Scenario, 'refine', side_effect=AssertionError):
+            assert [json.loads(case_key(scenario, {'n': 6}))[1] for scenario in scenarios if
+                    scenario.qualname == 'NewGame.test_odd_boards'] == [{'n': '6'}]
@@ -0,0 +1,60 @@
+import tracemalloc
+import unittest
+import unittest.mock as mock
+
+from bdd_coder import memory
+
+
+class FormatAmountTests(unittest.TestCase):
+    def test_bytes(self):
+        assert [memory.format_amount(n, 'B') for n in (12, -2048, 3*1024**3)] == [
+            '+12.0 B', '-2.0 KiB', '+3.0 GiB']
+
+    def test_objects(self):
+        assert memory.format_amount(-7, 'objects') == '-7 objects'
+
+
+class MemoryTrackerTests(unittest.TestCase):
+    def setUp(self):
+        self.scenario_run = mock.Mock(memory_growth=None)
+
+    def tearDown(self):
+        tracemalloc.stop()
+
+    def track(self, tracker):
+        tracker.start(self.scenario_run)
+        self.leak = [[bytearray(1024)] for _ in range(2000)]
+        tracker.finish(self.scenario_run)
+
+        return self.scenario_run.memory_growth
+
+    def test_tracemalloc(self):
+        growth = self.track(memory.MemoryTracker(top_sites=1, budget=10**6))
+
+        assert growth.delta > 2000*1024
+        assert len(growth.sites) == 1
+        assert growth.sites[0][0].startswith(__file__)
+        assert growth.unit == 'B'
+        assert str(growth).startswith('+2.2 MiB, ')
+
+    def test_gc(self):
+        tracker = memory.MemoryTracker('gc', budget=10000)
+        growth = self.track(tracker)
+
+        assert 1000 < growth.delta < 10000
+        assert (growth.unit, growth.sites) == ('objects', [])
+        assert tracker.exceeds_budget(self.scenario_run) is False
+
+    def test_rss_over_budget(self):
+        tracker = memory.MemoryTracker('rss', budget=-1)
+        self.track(tracker)
+
+        assert tracker.exceeds_budget(self.scenario_run) is True
+
+    def test_unfinished_run(self):
+        memory.MemoryTracker('gc').finish(self.scenario_run)
+
+        assert self.scenario_run.memory_growth is None
+
+    def test_wrong_mode(self):
+        self.assertRaises(ValueError, memory.MemoryTracker, 'heapy')
@@ -0,0 +1,121 @@
+import itertools
+import os
+import shutil
+import tracemalloc
+import unittest
+
+from bdd_coder import exceptions
+from bdd_coder import params
+
+
+def get_pairs(rows):
+    return {(i, row[i], j, row[j]) for row in rows
+            for i, j in itertools.combinations(range(len(row)), 2)}
+
+
+class StrategiesTests(unittest.TestCase):
+    def setUp(self):
+        self.domains = dict(a=[1, 2, 3], b='xyz', c=[True, False], d=range(3))
+        self.names = ['a', 'b', 'c', 'd']
+
+    def make_rows(self, strategy):
+        return strategy.make_rows(strategy.get_factors(self.names))
+
+    def test_cartesian(self):
+        rows = self.make_rows(params.Cartesian(**self.domains))
+
+        assert len(rows) == 54
+        assert rows[:2] == [[1, 'x', True, 0], [1, 'x', True, 1]]
+
+    def test_pairwise(self):
+        rows = self.make_rows(params.Pairwise(**self.domains))
+        all_rows = self.make_rows(params.Cartesian(**self.domains))
+
+        assert get_pairs(rows) == get_pairs(all_rows)
+        assert len(rows) <= 12
+        assert rows == self.make_rows(params.Pairwise(**self.domains))
+
+    def test_pairwise_compound_factor(self):
+        strategy = params.Pairwise(a=[1, 2])
+        rows = strategy.make_rows(strategy.get_factors(['a']) + [
+            (('b', 'c'), [('x', True), ('y', False)])])
+
+        assert rows == [[1, 'x', True], [1, 'y', False], [2, 'x', True], [2, 'y', False]]
+
+    def test_random_sample(self):
+        rows = self.make_rows(params.RandomSample(5, seed=3, **self.domains))
+        all_rows = self.make_rows(params.Cartesian(**self.domains))
+
+        assert len(rows) == 5
+        assert all(row in all_rows for row in rows)
+        assert sorted(map(all_rows.index, rows)) == list(map(all_rows.index, rows))
+        assert rows == self.make_rows(params.RandomSample(5, seed=3, **self.domains))
+        assert rows != self.make_rows(params.RandomSample(5, seed=4, **self.domains))
+
+    def test_random_sample_all(self):
+        assert self.make_rows(params.RandomSample(100, **self.domains)) == self.make_rows(
+            params.Cartesian(**self.domains))
+
+    def test_repr(self):
+        assert repr(params.RandomSample(2, a=[1])) == '<RandomSample: k=2, seed=0, a=[1]>'
+
+
+class SourcesTests(unittest.TestCase):
+    def setUp(self):
+        os.makedirs('tmp', exist_ok=True)
+
+    def tearDown(self):
+        shutil.rmtree('tmp')
+
+    def write(self, name, text):
+        with open(os.path.join('tmp', name), 'w') as source_file:
+            source_file.write(text)
+
+    def test_csv_source(self):
+        self.write('boards.csv', "n,kind,extra\n6,Boring,x\n8,'Funny',[1]\n")
+        rows = params.CsvSource('boards.csv').get_rows(['kind', 'n'], 'tmp')
+
+        assert list(rows) == [['Boring', 6], ['Funny', 8]]
+        assert list(rows) == list(rows)
+        assert len(rows) == 2 and ['Funny', 8] in rows
+        assert [p.id for p in rows.iter_params()] == ['boards-0', 'boards-1']
+
+    def test_jsonl_source(self):
+        self.write('boards.jsonl', '{"n": 6, "kind": null}\n\n{"n": 8, "kind": [1]}\n')
+
+        assert list(params.ParamSource.from_path('boards.jsonl').get_rows(['n', 'kind'], 'tmp')) == [
+            [6, None], [8, [1]]]
+
+    def test_missing_param(self):
+        self.write('boards.jsonl', '{"n": 6, "kind": "Boring"}\n{"n": 8}\n')
+        rows = params.JsonLinesSource('boards.jsonl').get_rows(['n', 'kind'], 'tmp')
+
+        self.assertRaisesRegex(exceptions.ParamSourceError,
+                               r'^Wrong parameter source tmp/boards.jsonl: record 2 lacks kind$',
+                               list, rows)
+
+    def test_unknown_file_type(self):
+        self.assertRaisesRegex(exceptions.ParamSourceError, r'boards.txt: unknown file type',
+                               params.ParamSource.from_path, 'boards.txt')
+
+    def test_zip_rows(self):
+        self.write('boards.csv', 'n\n6\n8\n')
+        rows = params.zip_rows([['Goat'], ['Cat'], ['Hen']], params.CsvSource(
+            'boards.csv').get_rows(['n'], 'tmp'))
+
+        assert isinstance(rows, params.Rows) and rows.name == 'boards'
+        assert list(rows) == [['Goat', 6], ['Cat', 8]]
+        assert params.zip_rows([[1]], [[2]]) == ([1, 2],)
+
+    def test_streaming(self):
+        self.write('boards.csv', 'n,kind\n' + ''.join(f'{n},{"Boring"*10}\n' for n in range(50000)))
+        rows = params.CsvSource('boards.csv').get_rows(['n', 'kind'], 'tmp')
+        tracemalloc.start()
+
+        try:
+            assert sum(row[0] for row in rows) == sum(range(50000))
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        assert peak < os.path.getsize('tmp/boards.csv')/10
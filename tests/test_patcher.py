@@ -30,3 +30,62 @@ class AdvancedPatcherTests(unittest.TestCase):
         base_tester.validate_bases(features_spec)
         self.patch('example/new_advanced_specs')
         text_utils.assert_test_files_match('example/new_advanced_tests', 'example/tmp')
+
+
+class ScopedPatcherTests(unittest.TestCase):
+    specs_dir = 'example/tmp_specs'
+    tmp_dir = 'example/tmp_scoped'  # Not imported by other tests
+
+    def setUp(self):
+        base_tester, _ = coders.get_base_tester('example.scoped_tests.test_stories')
+        base_tester.features_spec(self.specs_dir)
+        coders.PackageCoder(specs_path=self.specs_dir, tests_path=self.tmp_dir).create_tester_package()
+
+        with open(f'{self.tmp_dir}/test_stories.py') as py_file:
+            self.source = py_file.read()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+        shutil.rmtree(self.specs_dir)
+
+    def patch(self):
+        coders.PackagePatcher(
+            test_module='example.tmp_scoped.test_stories', specs_path=self.specs_dir).patch()
+
+        with open(f'{self.tmp_dir}/test_stories.py') as py_file:
+            return py_file.read()
+
+    def test_no_changes(self):
+        assert "    @base.BddTester.gherkin.scoped('module')\n" in self.source
+        assert self.patch() == self.source
+
+    def test_scenario_added(self):
+        with open(f'{self.specs_dir}/new-game.yml') as yml_file:
+            yml = yml_file.read()
+
+        with open(f'{self.specs_dir}/new-game.yml', 'w') as yml_file:
+            yml_file.write(yml.replace('Step scopes:', '  Odd boards:\n'
+                                       '  - Given a populated `database`\n'
+                                       '  - Then I get a 400 response\n'
+                                       'Step scopes:'))
+
+        assert self.patch() == self.source.replace(
+            '''        When I request a new `game` with $n boards
+        """
+
+''', '''        When I request a new `game` with $n boards
+        """
+
+    @base.BddTester.gherkin()
+    def test_odd_boards(self):
+        """
+        Given a populated `database`
+        Then I get a 400 response
+        """
+
+''').replace('''        return 'game',
+''', '''        return 'game',
+
+    def i_get_a_400_response(self):
+        pass
+''')
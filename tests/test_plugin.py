@@ -0,0 +1,111 @@
+import json
+import os
+import shutil
+import subprocess
+import unittest
+
+
+class XdistTests(unittest.TestCase):
+    logs_dir = 'example/advanced_tests'
+
+    def setUp(self):
+        self.remove_logs()
+
+    def tearDown(self):
+        self.remove_logs()
+
+    def remove_logs(self):
+        for name in filter(lambda n: n.startswith('bdd_runs.'), os.listdir(self.logs_dir)):
+            os.remove(os.path.join(self.logs_dir, name))
+
+    def read_log(self, name):
+        with open(os.path.join(self.logs_dir, name)) as log_file:
+            return log_file.read()
+
+    def run_pytest(self):
+        process = subprocess.run(['pytest', '-n', '2', self.logs_dir],
+                                 stdout=subprocess.PIPE)
+
+        return process.returncode, process.stdout.decode()
+
+    def test_merged_summary(self):
+        exit_code, output = self.run_pytest()
+        merged_log = self.read_log('bdd_runs.log')
+
+        assert exit_code == 1, output
+        assert '1 failed, 4 passed' in output
+        assert f'{self.logs_dir}/bdd_runs.log:  3✅  1❌  1❓' in output
+        assert 'These scenarios did not run: pending_scenario' in output
+        assert sorted(n for n in os.listdir(self.logs_dir) if n.startswith('bdd_runs.')) == [
+            'bdd_runs.log']
+        assert merged_log.index(f'{"="*26} gw0\n') < merged_log.index(f'{"="*26} gw1\n')
+        assert merged_log.count('Slowest steps:') == 1
+        assert merged_log.index('\n  3✅  1❌  1❓\n') > merged_log.index(f'{"="*26} gw1\n')
+
+    def test_sessions_appended(self):
+        self.run_pytest()
+        first_log = self.read_log('bdd_runs.log')
+        self.run_pytest()
+        merged_log = self.read_log('bdd_runs.log')
+
+        assert merged_log.startswith(first_log)
+        assert merged_log.count(f'{"="*26} gw0\n') == merged_log.count(f'{"="*26} gw1\n') == 2
+        assert merged_log.count('\n  3✅  1❌  1❓\n') == merged_log.count('Slowest steps:') == 2
+        assert len(merged_log.splitlines()) == 2*len(first_log.splitlines())
+
+
+class ShardTests(unittest.TestCase):
+    durations = {'NewGame.test_odd_boards::test_odd_boards[even-9]': 100.0,
+                 'TestClearBoard.test_start_board::test_start_board[Goat-8-Boring-9]': 1.0}
+
+    def setUp(self):
+        os.makedirs('tmp/cache/v/bdd_coder')
+
+    def tearDown(self):
+        shutil.rmtree('tmp')
+
+    def collect(self, *args, cache=False):
+        process = subprocess.run([
+            'pytest', *(('-o', 'cache_dir=tmp/cache') if cache else ('-p', 'no:cacheprovider')),
+            '--collect-only', '-q', 'example/advanced_tests', *args], stdout=subprocess.PIPE)
+
+        return [line for line in process.stdout.decode().splitlines() if '::' in line]
+
+    def write_durations(self, path):
+        with open(path, 'w') as durations_file:
+            json.dump(self.durations, durations_file)
+
+    def test_balanced_shards(self):
+        all_ids = self.collect()
+        shards = [self.collect(f'--bdd-shard={i}/2') for i in (1, 2)]
+
+        assert sorted(shards[0] + shards[1]) == sorted(all_ids)
+        assert [len(shard) for shard in shards] == [3, 2]
+        assert shards[1] == [i for i in all_ids if i in shards[1]]
+        assert self.collect('--bdd-shard=1/2') == shards[0]
+
+    def test_durations_file(self):
+        self.write_durations('tmp/durations.json')
+        shards = [self.collect(f'--bdd-shard={i}/2', '--bdd-durations=tmp/durations.json')
+                  for i in (1, 2)]
+
+        assert [len(shard) for shard in shards] == [1, 4]
+        assert shards[0][0].endswith('TestClearBoard::test_odd_boards[even-9]')
+        assert sorted(shards[0] + shards[1]) == sorted(self.collect())
+
+    def test_shards_ignore_the_cache(self):
+        self.write_durations('tmp/cache/v/bdd_coder/durations')
+        shards = [self.collect(f'--bdd-shard={i}/2', cache=True) for i in (1, 2)]
+
+        assert shards == [self.collect(f'--bdd-shard={i}/2') for i in (1, 2)]
+        assert shards == [self.collect(f'--bdd-shard={i}/2', '--bdd-durations=tmp/missing.json')
+                          for i in (1, 2)]
+        assert self.collect('--bdd-longest-first', cache=True)[0].endswith(
+            'TestClearBoard::test_odd_boards[even-9]')
+
+    def test_longest_first(self):
+        ids = self.collect('--bdd-longest-first')
+
+        assert sorted(ids) == sorted(self.collect())
+        assert ids[0].endswith('TestClearBoard::test_start_board[Cat-6-Funny-11]')
+        assert ids[-1].endswith('TestClearBoard::test_odd_boards[even-9]')
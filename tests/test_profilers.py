@@ -0,0 +1,105 @@
+import os
+import pstats
+import shutil
+import signal
+import subprocess
+import unittest
+import unittest.mock as mock
+
+from bdd_coder import profilers
+
+
+class StepProfilerFromEnvTests(unittest.TestCase):
+    def test_disabled(self):
+        with mock.patch.dict(os.environ, {'BDD_PROFILE': '0'}):
+            assert profilers.StepProfiler.from_env() is None
+
+    def test_filters(self):
+        with mock.patch.dict(os.environ, {'BDD_PROFILE': '1', 'BDD_PROFILE_PER': 'scenario',
+                                          'BDD_PROFILE_STEPS': 'i_*, *odd '}):
+            profiler = profilers.StepProfiler.from_env()
+
+        assert (profiler.profile_dir, profiler.per, profiler.steps, profiler.scenarios) == (
+            '.bdd-profiles', 'scenario', ('i_*', '*odd'), ())
+
+    def test_wrong_per(self):
+        self.assertRaises(ValueError, profilers.StepProfiler, per='module')
+
+
+class StepProfilerRunTests(unittest.TestCase):
+    profile_dir = 'tmp-profiles'
+
+    def tearDown(self):
+        shutil.rmtree(self.profile_dir)
+
+    def run_pytest(self, tests_dir='example/advanced_tests', **env):
+        subprocess.run(['pytest', tests_dir], stdout=subprocess.PIPE,
+                       env=dict(os.environ, BDD_PROFILE=self.profile_dir, **env))
+
+        return sorted(os.listdir(self.profile_dir))
+
+    def test_per_step(self):
+        assert self.run_pytest(BDD_PROFILE_STEPS='the_*', BDD_PROFILE_SCENARIOS='*start_board') == [
+            'TestClearBoard.the_first_board_is_added_with_the_animal-example_advanced_tests_'
+            'test_stories.py_TestClearBoard_test_start_board_Cat-6-Funny-11-3.pstats',
+            'TestClearBoard.the_first_board_is_added_with_the_animal-example_advanced_tests_'
+            'test_stories.py_TestClearBoard_test_start_board_Goat-8-Boring-9-3.pstats']
+
+    def test_per_scenario(self):
+        file_names = self.run_pytest(BDD_PROFILE_PER='scenario', BDD_PROFILE_SCENARIOS='*odd*')
+        stats = pstats.Stats(os.path.join(self.profile_dir, file_names[0]))
+
+        assert file_names == ['NewGame.test_odd_boards-example_advanced_tests_test_stories.py_'
+                              'TestClearBoard_test_odd_boards_even-9.pstats']
+        assert {name for _, _, name in stats.stats} >= {
+            'i_request_a_new_game_with_n_boards', 'i_get_a_400_response_saying_it_must_be'}
+
+    def test_inherited_scenarios(self):
+        file_names = self.run_pytest('example/inherited_tests', BDD_PROFILE_PER='scenario')
+
+        assert len(file_names) == 7
+        assert [name for name in file_names if '_test_odd_boards_7' in name] == [
+            'NewGame.test_odd_boards-example_inherited_tests_test_stories.py_TestClearBoard_'
+            'test_odd_boards_7.pstats',
+            'NewGame.test_odd_boards-example_inherited_tests_test_stories.py_TestEvenBoards_'
+            'test_odd_boards_7.pstats']
+
+
+class SamplingProfilerTests(unittest.TestCase):
+    samples_dir = 'tmp-samples'
+
+    def setUp(self):
+        scenario = mock.Mock(qualname='NewGame.test_odd_boards')
+        self.scenario_run = mock.Mock(scenario=scenario, test_id='test_odd_boards[9]', parent_run=None,
+                                      node_id='test_stories.py::TestClearBoard::test_odd_boards[9]')
+        self.step_run = mock.Mock(scenario_run=self.scenario_run)
+        self.step_run.step.method_qualname = 'NewGame.i_request_a_new_game'
+        self.sampler = profilers.SamplingProfiler(self.samples_dir, interval=0.001)
+
+    def tearDown(self):
+        shutil.rmtree(self.samples_dir)
+
+    @staticmethod
+    def burn_cpu():
+        return sum(i*i for i in range(2000000))
+
+    def test_collapsed_stacks(self):
+        self.sampler.start(self.scenario_run)
+        self.burn_cpu()
+
+        with self.sampler.sampling(self.step_run, step_frame=None):
+            self.burn_cpu()
+
+        self.sampler.stop()
+
+        with open(os.path.join(self.samples_dir,
+                               'NewGame.test_odd_boards-test_stories.py_TestClearBoard_'
+                               'test_odd_boards_9.collapsed')) as stacks:
+            lines = stacks.read().splitlines()
+
+        stacks = {line.rsplit(' ', 1)[0].split(';')[1] for line in lines}
+
+        assert stacks == {'(pytest)', 'NewGame.i_request_a_new_game'}
+        assert all(line.startswith('NewGame.test_odd_boards;') for line in lines)
+        assert all(int(line.rsplit(' ', 1)[1]) > 0 for line in lines)
+        assert signal.getitimer(signal.ITIMER_PROF) == (0.0, 0.0)
@@ -0,0 +1,123 @@
+import json
+import os
+import shutil
+import subprocess
+import unittest
+
+SLOW_TESTS_SOURCE = '''import time
+
+from bdd_coder import decorators
+from bdd_coder import tester
+
+
+class BddTester(tester.BddTester):
+    gherkin = decorators.Gherkin(validate=False, logs_path='tmp/runner_tests/slow.log')
+
+
+class TestSlow(BddTester):
+    @BddTester.gherkin()
+    def test_slow(self):
+        """
+        Given a slow step
+        """
+
+    def a_slow_step(self):
+        time.sleep(2)
+'''
+
+FAST_TESTS_SOURCE = '''from bdd_coder import decorators
+from bdd_coder import tester
+
+
+class BddTester(tester.BddTester):
+    gherkin = decorators.Gherkin(validate=False, logs_path='tmp/runner_tests/fast.log')
+''' + ''.join(f'''
+
+class TestFast{i}(BddTester):
+    @BddTester.gherkin()
+    def test_fast(self):
+        """
+        Given a fast step
+        """
+
+    def a_fast_step(self):
+        pass
+''' for i in range(6))
+
+
+class WorkStealingRunnerTests(unittest.TestCase):
+    logs_dir = 'example/advanced_tests'
+
+    def setUp(self):
+        self.remove_logs()
+
+    def tearDown(self):
+        self.remove_logs()
+
+    def remove_logs(self):
+        for name in filter(lambda n: n.startswith('bdd_runs.'), os.listdir(self.logs_dir)):
+            os.remove(os.path.join(self.logs_dir, name))
+
+    def test_aggregated_run_log(self):
+        process = subprocess.run(['bdd-run', '--workers', '2', self.logs_dir],
+                                 stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        output = process.stdout.decode()
+
+        with open(os.path.join(self.logs_dir, 'bdd_runs.log')) as log_file:
+            log = log_file.read()
+
+        with open('.pytest_cache/v/bdd_coder/durations') as durations_file:
+            durations = json.load(durations_file)
+
+        assert process.returncode == 3, output
+        assert process.stderr.decode() == 'TestsFailedError: Tests finished with exit code 1\n'
+        assert output.startswith('2 workers on example/advanced_tests - 1 test groups\n')
+        assert output.endswith('1 failed, 4 passed in ' + output.rsplit(' in ', 1)[1])
+        assert f'{self.logs_dir}/bdd_runs.log:  3✅  1❌  1❓\n' in output
+        assert 'These scenarios did not run: pending_scenario\n' in output
+        assert 'TestClearBoard::test_odd_boards[even-9] FAILED\n' in output
+        assert '] └─' in log and '] ├─' in log
+        assert log.endswith('\n') and '\n  3✅  1❌  1❓\n' in log
+        assert log.count('3✅  1❌  1❓') == 1
+        assert 'NewGame.test_odd_boards::test_odd_boards[even-9]' in durations
+
+
+class WorkStealingTests(unittest.TestCase):
+    tests_dir = 'tmp/runner_tests'
+
+    def setUp(self):
+        os.makedirs(self.tests_dir)
+
+        for name, source in (('__init__', ''), ('test_slow', SLOW_TESTS_SOURCE),
+                             ('test_fast', FAST_TESTS_SOURCE)):
+            with open(os.path.join(self.tests_dir, f'{name}.py'), 'w') as py_file:
+                py_file.write(source)
+
+    def tearDown(self):
+        shutil.rmtree('tmp', ignore_errors=True)
+
+    def run_groups(self):
+        process = subprocess.run(['bdd-run', '--workers', '2', self.tests_dir], stdout=subprocess.PIPE)
+        output = process.stdout.decode()
+
+        assert process.returncode == 0, output
+        assert output.startswith(f'2 workers on {self.tests_dir} - 7 test groups\n')
+
+        return {line.split()[1].split('::')[1]: line.split()[0] for line in output.splitlines()
+                if line.endswith(' PASSED')}
+
+    def test_groups_stolen_by_idle_workers(self):
+        self.run_groups()  # Records the durations
+        workers = self.run_groups()
+        slow_worker = workers.pop('TestSlow')
+
+        assert sorted(workers) == [f'TestFast{i}' for i in range(6)]
+        assert list(workers.values()).count(slow_worker) == 1  # Taken before running the slow one
+        assert sorted(set(os.listdir(self.tests_dir)) - {'__pycache__'}) == [
+            '__init__.py', 'fast.log', 'slow.log', 'test_fast.py', 'test_slow.py']
+
+        with open(os.path.join(self.tests_dir, 'fast.log')) as log_file:
+            assert log_file.read().count('✅ TestFast') == 12
+
+        with open(os.path.join(self.tests_dir, 'slow.log')) as log_file:
+            assert log_file.read().count('✅ TestSlow.test_slow') == 2
@@ -0,0 +1,98 @@
+import argparse
+import json
+import os
+import shutil
+import unittest
+import unittest.mock as mock
+
+import pytest
+
+from bdd_coder import scheduling
+
+
+def make_item(nodeid, step_count=1, qualname=None):
+    scenario = mock.Mock(qualname=qualname, refine=lambda: ([None]*step_count, [], ()))
+
+    item = mock.Mock(nodeid=nodeid, cls=object if nodeid.count('::') > 1 else None,
+                     function=mock.Mock(scenario=scenario) if qualname else None)
+    item.name = nodeid.rsplit('::', 1)[1]
+
+    return item
+
+
+class CostEstimatorTests(unittest.TestCase):
+    def setUp(self):
+        self.items = [make_item('t.py::TestA::test_x[1]', 2, 'A.test_x'),
+                      make_item('t.py::TestA::test_x[2]', 2, 'A.test_x'),
+                      make_item('t.py::TestB::test_y', 4, 'B.test_y'),
+                      make_item('t.py::TestB::test_z', 6, 'B.test_z'),
+                      make_item('u.py::test_plain')]
+
+    def test_groups(self):
+        assert {k: [i.nodeid for i in v] for k, v in scheduling.group_items(self.items).items()} == {
+            't.py::TestA': ['t.py::TestA::test_x[1]', 't.py::TestA::test_x[2]'],
+            't.py::TestB': ['t.py::TestB::test_y', 't.py::TestB::test_z'],
+            'u.py': ['u.py::test_plain']}
+
+    def test_step_counts_without_durations(self):
+        assert scheduling.CostEstimator({}).sort_groups(self.items) == [
+            ('t.py::TestB', 10.0), ('t.py::TestA', 4.0), ('u.py', 1.0)]
+
+    def test_recorded_durations(self):
+        estimator = scheduling.CostEstimator({'A.test_x::test_x[1]': 3.0,
+                                              'A.test_x::test_x[3]': 5.0,
+                                              'B.test_y::test_y': 0.4})
+
+        assert estimator.estimate(self.items) == pytest.approx({
+            't.py::TestA::test_x[1]': 3.0, 't.py::TestA::test_x[2]': 4.0,
+            't.py::TestB::test_y': 0.4, 't.py::TestB::test_z': 6*7.4/8,
+            'u.py::test_plain': 7.4/8})
+        assert [key for key, cost in estimator.sort_groups(self.items)] == [
+            't.py::TestA', 't.py::TestB', 'u.py']
+
+    def test_update_durations(self):
+        cache = mock.Mock(get=mock.Mock(return_value={'A.test_x::test_x[1]': 3.0}))
+        scheduling.update_durations(cache, [mock.Mock(records=[
+            {'qualname': 'A.test_x', 'test_id': 'test_x[1]', 'duration': 1.5},
+            {'qualname': 'B.test_y', 'test_id': 'test_y', 'duration': None}])])
+
+        cache.set.assert_called_once_with(scheduling.DURATIONS_KEY, {'A.test_x::test_x[1]': 1.5})
+
+    def test_durations_file(self):
+        os.makedirs('tmp')
+        self.addCleanup(shutil.rmtree, 'tmp')
+        path = 'tmp/durations.json'
+        assert scheduling.load_durations(mock.Mock(get=mock.Mock(return_value={'a': 1.0})), path) == {}
+
+        with open(path, 'w') as durations_file:
+            json.dump({'A.test_x::test_x[1]': 3.0, 'A.test_x::test_x[2]': 2.0}, durations_file)
+
+        scheduling.update_durations(None, [mock.Mock(records=[
+            {'qualname': 'A.test_x', 'test_id': 'test_x[1]', 'duration': 1.5}])], path)
+
+        assert scheduling.load_durations(None, path) == {
+            'A.test_x::test_x[1]': 1.5, 'A.test_x::test_x[2]': 2.0}
+
+    def test_shards(self):
+        shards = scheduling.CostEstimator({}).shard(self.items, 2)
+
+        assert [[i.nodeid for i in shard] for shard in shards] == [
+            ['t.py::TestA::test_x[2]', 't.py::TestB::test_z'],
+            ['t.py::TestA::test_x[1]', 't.py::TestB::test_y', 'u.py::test_plain']]
+
+    def test_shards_longest_first(self):
+        shards = scheduling.CostEstimator({'B.test_y::test_y': 30.0}).shard(
+            self.items, 3, longest_first=True)
+
+        assert [[i.nodeid for i in shard] for shard in shards] == [
+            ['t.py::TestB::test_z'], ['t.py::TestB::test_y', 'u.py::test_plain'],
+            ['t.py::TestA::test_x[1]', 't.py::TestA::test_x[2]']]
+
+
+class ParseShardTests(unittest.TestCase):
+    def test_valid(self):
+        assert scheduling.parse_shard('2/3') == (2, 3)
+
+    def test_invalid(self):
+        for value in ('0/3', '4/3', '1', 'a/b'):
+            self.assertRaises(argparse.ArgumentTypeError, scheduling.parse_shard, value)
@@ -1,4 +1,6 @@
+import os
 import unittest
+import unittest.mock as mock
 
 from bdd_coder import stock
 
@@ -17,3 +19,30 @@ class SetPairTests(unittest.TestCase):
             "l ⪤ r: {1} | {2, 3} | {'A', 1.41}",
             "l ⊂ r: ø | {'K', 2} | {1, 8}",
             'l ⊃ r: {5} | {(2,), 3} | ø')
+
+
+class DurationStatsTests(unittest.TestCase):
+    def test_percentiles(self):
+        stats = stock.DurationStats([0.5, 0.1, 0.4, 0.2, 0.3])
+
+        assert (stats.count, stats.p50, stats.p95, stats.max) == (5, 0.3, 0.5, 0.5)
+        assert round(stats.total, 6) == 1.5
+
+    def test_empty(self):
+        stats = stock.DurationStats([])
+
+        assert (stats.count, stats.total, stats.p50, stats.max) == (0, 0, 0.0, 0.0)
+
+
+class WorkerPathTests(unittest.TestCase):
+    def test_worker(self):
+        with mock.patch.dict(os.environ, {'PYTEST_XDIST_WORKER': 'gw12'}):
+            assert stock.worker_path('logs/trace.json') == 'logs/trace.gw12.json'
+
+    def test_no_worker(self):
+        with mock.patch.dict(os.environ, clear=True):
+            assert stock.worker_path('logs/trace.json') == 'logs/trace.json'
+
+    def test_given_worker(self):
+        with mock.patch.dict(os.environ, clear=True):
+            assert stock.worker_path('bdd_runs.log', 'gw1') == 'bdd_runs.gw1.log'
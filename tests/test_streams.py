@@ -0,0 +1,160 @@
+import os
+import pickle
+import shutil
+import subprocess
+import unittest
+
+from bdd_coder.streams import OutputStream, stream_outputs, tee_outputs
+
+REUSED_STREAMS_SOURCE = '''from bdd_coder.cache import StepCache
+from bdd_coder import decorators
+from bdd_coder import tester
+
+
+class BddTester(tester.BddTester):
+    gherkin = decorators.Gherkin(validate=False, logs_path='tmp/bdd_runs.log',
+                                 step_cache=StepCache('tmp/cache'))
+
+
+class TestTotals(BddTester):
+    @BddTester.gherkin()
+    def test_total(self):
+        """
+        Given the shared `rows`
+        And the cached `scores`
+        Then the totals are right
+        """
+
+    @BddTester.gherkin()
+    def test_same_total(self):
+        """
+        Given the shared `rows`
+        And the cached `scores`
+        Then the totals are right
+        """
+
+    @BddTester.gherkin.scoped('class')
+    def the_shared_rows(self):
+        yield from range(10)
+
+    @BddTester.gherkin.cacheable
+    def the_cached_scores(self):
+        return (str(i) for i in range(5)),
+
+    def the_totals_are_right(self):
+        assert sum(self.get_output('rows')) == 45
+        assert list(self.get_output('scores')) == ['0', '1', '2', '3', '4']
+'''
+
+
+def count_rows(count, taken):
+    for i in range(count):
+        taken.append(i)
+        yield i
+
+
+class OutputStreamTests(unittest.TestCase):
+    def test_items_taken_lazily(self):
+        taken = []
+        stream = OutputStream(count_rows(10**6, taken))
+
+        assert taken == [0, 1, 2, 3]
+        assert [next(stream) for _ in range(6)] == [0, 1, 2, 3, 4, 5]
+        assert taken == [0, 1, 2, 3, 4, 5]
+
+    def test_bounded_preview(self):
+        stream = OutputStream(('x'*100, {'rows': list(range(100))}, 3, 4))
+
+        assert repr(stream) == (f"<OutputStream: ['{'x'*17}...{'x'*18}', "
+                                "{'rows': [0, 1, 2, 3, 4, 5, ...]}, 3, ...]>")
+        assert list(stream) == ['x'*100, {'rows': list(range(100))}, 3, 4]
+
+    def test_short_preview(self):
+        assert str(OutputStream(iter([1, 2]))) == '[1, 2]'
+        assert str(OutputStream(iter([]))) == '[]'
+
+    def test_stream_outputs(self):
+        rows = (i for i in range(5))
+        generator_result = stream_outputs(rows)
+        tuple_result = stream_outputs((1, (i for i in range(5)), [2]))
+
+        assert len(generator_result) == 1 and list(generator_result[0]) == [0, 1, 2, 3, 4]
+        assert tuple_result[0] == 1 and tuple_result[2] == [2]
+        assert list(tuple_result[1]) == [0, 1, 2, 3, 4]
+        assert stream_outputs([1, 2]) == [1, 2]
+        assert stream_outputs(None) is None
+
+    def test_other_iterators_kept(self):
+        values = (map(str, range(5)), iter([1, 2]), zip('ab', 'cd'), range(3))
+        result = stream_outputs(values)
+        iterator = iter('abc')
+
+        assert all(value is kept for value, kept in zip(result, values))
+        assert list(result[0]) == ['0', '1', '2', '3', '4']
+        assert stream_outputs(iterator) is iterator and next(iterator) == 'a'
+
+    def test_tee(self):
+        stream = OutputStream(i for i in range(6))
+        next(stream)
+        copies = tee_outputs((stream, 1))
+
+        assert list(copies[0]) == [1, 2, 3, 4, 5]
+        assert copies[1] == 1
+        assert str(copies[0]) == str(stream) == '[0, 1, 2, ...]'
+        assert list(stream) == [1, 2, 3, 4, 5]
+
+    def test_pickled(self):
+        stream = OutputStream(i for i in range(6))
+        next(stream)
+        loaded = pickle.loads(pickle.dumps(stream))
+
+        assert str(loaded) == '[1, 2, 3, ...]'
+        assert list(loaded) == list(stream) == [1, 2, 3, 4, 5]
+
+    def test_streamed_steps(self):
+        process = subprocess.run(['pytest', '-p', 'no:cacheprovider', 'example/streamed_tests'],
+                                 stdout=subprocess.PIPE)
+
+        with open('example/streamed_tests/bdd_runs.log') as log_file:
+            log = log_file.read()
+
+        os.remove('example/streamed_tests/bdd_runs.log')
+
+        assert process.returncode == 0, process.stdout.decode()
+        assert "↦ <OutputStream: ['player-0,0', 'player-1,1', 'player-2,2', ...]>\n" in log
+        assert '↦ <OutputStream: [0, 1, 2, ...]>\n' in log
+
+
+class ReusedStreamsTests(unittest.TestCase):
+    def setUp(self):
+        os.makedirs('tmp')
+
+        with open('tmp/test_reused_streams.py', 'w') as py_file:
+            py_file.write(REUSED_STREAMS_SOURCE)
+
+    def tearDown(self):
+        shutil.rmtree('tmp')
+
+    def run_pytest(self):
+        process = subprocess.run(['pytest', '-p', 'no:cacheprovider', 'tmp/test_reused_streams.py'],
+                                 stdout=subprocess.PIPE)
+
+        assert process.returncode == 0, process.stdout.decode()
+
+        with open('tmp/bdd_runs.log') as log_file:
+            return [line.split(' ', 2)[2].rstrip() for line in log_file if line.startswith('├─')]
+
+    def test_shared_and_cached(self):
+        first_lines = self.run_pytest()
+
+        assert first_lines == [
+            '✔ TestTotals.the_shared_rows', '✔ TestTotals.the_cached_scores',
+            '✔ TestTotals.the_totals_are_right',
+            '✔ TestTotals.the_shared_rows (shared)', '✔ TestTotals.the_cached_scores (cached)',
+            '✔ TestTotals.the_totals_are_right']
+
+        assert self.run_pytest()[len(first_lines):] == [
+            '✔ TestTotals.the_shared_rows', '✔ TestTotals.the_cached_scores (cached)',
+            '✔ TestTotals.the_totals_are_right',
+            '✔ TestTotals.the_shared_rows (shared)', '✔ TestTotals.the_cached_scores (cached)',
+            '✔ TestTotals.the_totals_are_right']
@@ -0,0 +1,119 @@
+import os
+import shutil
+import subprocess
+import unittest
+
+THREADS_TESTS_SOURCE = '''import threading
+import time
+import unittest.mock as mock
+
+from concurrent.futures import ThreadPoolExecutor
+
+from bdd_coder import decorators
+from bdd_coder import tester
+from bdd_coder.text_utils import OK
+
+THREAD_COUNT, RUN_COUNT = 16, 400
+SHARED_CALLS = []
+STARTING = threading.Barrier(THREAD_COUNT, timeout=10)
+
+
+class BddTester(tester.BddTester):
+    gherkin = decorators.Gherkin(validate=False, logs_path='tmp/bdd_runs.log')
+
+
+class Counter(BddTester):
+    @BddTester.gherkin([0])
+    def test_count(self):
+        """
+        Given a `counter` from $n
+        When I count up to the next `count`
+        Then the count follows the counter
+        """
+
+    def a_counter_from_n(self, n):
+        return n,
+
+    def i_count_up_to_the_next_count(self):
+        time.sleep(0.0001)
+
+        return self.get_output('counter') + 1,
+
+    def the_count_follows_the_counter(self):
+        assert self.get_output('count') == self.current_run.kwargs['n'] + 1
+
+
+class OtherCounter(Counter):
+    """Has the same test ids"""
+
+
+class SharedCounter(BddTester):
+    @BddTester.gherkin()
+    def test_count(self):
+        """
+        Given a shared `counter`
+        Then the counter starts from zero
+        """
+
+    @BddTester.gherkin.scoped('class')
+    def a_shared_counter(self):
+        SHARED_CALLS.append(threading.get_ident())
+        time.sleep(0.01)
+
+        return 0,
+
+    def the_counter_starts_from_zero(self):
+        assert self.get_output('counter') == 0
+
+
+def run_scenario(tester_class, n):
+    if n < THREAD_COUNT:
+        STARTING.wait()
+
+    bdd_tester = tester_class()
+    bdd_tester.start_run(mock.Mock(node=mock.Mock(
+        nodeid=f'test_threads.py::{tester_class.__name__}::test_count[{n}]',
+        name=f'test_count[{n}]'), function=tester_class.test_count))
+
+    for step in tester_class.test_count.scenario.steps:
+        step.run(bdd_tester, **{name: n for name in step.arg_names})
+
+    return bdd_tester.current_run
+
+
+def test_threads():
+    with ThreadPoolExecutor(max_workers=THREAD_COUNT) as executor:
+        runs = list(executor.map(run_scenario, [Counter, OtherCounter]*(RUN_COUNT//2), range(RUN_COUNT)))
+
+    assert [run.symbol for run in runs] == [OK]*RUN_COUNT
+    assert [run.kwargs for run in runs] == [{'n': n} for n in range(RUN_COUNT)]
+    assert len(BddTester.gherkin.test_runs) == RUN_COUNT
+    assert len(BddTester.gherkin.get_records()) == RUN_COUNT
+
+
+def test_scoped_step_threads():
+    with ThreadPoolExecutor(max_workers=THREAD_COUNT) as executor:
+        runs = list(executor.map(run_scenario, [SharedCounter]*THREAD_COUNT, range(THREAD_COUNT)))
+
+    assert [run.symbol for run in runs] == [OK]*THREAD_COUNT
+    assert sum(step_run.reused == 'shared' for run in runs
+               for step_run in run.iter_step_runs()) == THREAD_COUNT - 1
+    assert len(SHARED_CALLS) == 1
+'''
+
+
+class ThreadSafetyTests(unittest.TestCase):
+    def setUp(self):
+        os.makedirs('tmp')
+
+        with open('tmp/test_threads.py', 'w') as py_file:
+            py_file.write(THREADS_TESTS_SOURCE)
+
+    def tearDown(self):
+        shutil.rmtree('tmp', ignore_errors=True)
+
+    def test_scenarios_run_on_many_threads(self):
+        process = subprocess.run(['pytest', '-p', 'no:cacheprovider', 'tmp/test_threads.py'],
+                                 stdout=subprocess.PIPE)
+
+        assert process.returncode == 0, process.stdout.decode()
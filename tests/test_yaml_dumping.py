@@ -29,3 +29,22 @@ class YamlDumpTests(unittest.TestCase):
 
         self.assert_equal_yamls(
             'tmp/clear-board.yml', 'example/specs/clear-board.yml')
+
+    def test_step_scopes_round_trip(self):
+        from example.scoped_tests import test_stories as scoped_stories
+        from bdd_coder import coders
+
+        assert scoped_stories.NewGame.as_yaml()['Step scopes'] == {
+            'a_populated_database': 'module', 'i_request_a_new_game_with_n_boards': 'class'}
+        assert 'Step scopes' not in scoped_stories.TestClearBoard.as_yaml()
+
+        scoped_stories.base.BddTester.dump_yaml_specs('tmp/specs')
+        coders.PackageCoder('tmp/specs', 'tmp/generated').create_tester_package()
+
+        with open('tmp/generated/test_stories.py') as py_file:
+            source = py_file.read()
+
+        assert ("    @base.BddTester.gherkin.scoped('module')\n"
+                "    def a_populated_database(self):\n") in source
+        assert ("    @base.BddTester.gherkin.scoped('class')\n"
+                "    def i_request_a_new_game_with_n_boards(self, n):\n") in source